@@ -0,0 +1,85 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the cost of sanitizing the descriptions of a page of blip.tv
+entries with the lxml cleaner alone and with :func:`clean_description_html`,
+first with nothing cached yet (only plain text is short-circuited) and then
+on a page whose descriptions have been seen before, as when a feed is
+refreshed.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_clean_description.py
+
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.utils import http
+from vidscraper.utils.fastfeed import parse_blip_feed
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'blip', 'feed.rss')
+
+
+def cleaner(descriptions):
+    for description in descriptions:
+        if description:
+            http.DESCRIPTION_CLEANER.clean_html(description)
+
+
+def clean_description_html(descriptions):
+    http._cleaned.clear()
+    for description in descriptions:
+        http.clean_description_html(description)
+
+
+def clean_description_html_cached(descriptions):
+    for description in descriptions:
+        http.clean_description_html(description)
+
+
+def main(repeat=5, number=20):
+    version, feed, entries = parse_blip_feed(open(DATA).read())
+    descriptions = [entry.get('blip_puredescription') for entry in entries]
+    plain = sum(1 for description in descriptions
+                if description and http._clean_plain_text(description))
+    print '%d descriptions, %d plain text' % (len(descriptions), plain)
+    for func in (cleaner, clean_description_html,
+                 clean_description_html_cached):
+        best = min(timeit.repeat(lambda: func(descriptions), repeat=repeat,
+                                 number=number))
+        print '%-30s %8.1f usec/entry' % (
+            func.__name__, best / (number * len(descriptions)) * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the per-title cost of converting entities with BeautifulStoneSoup
+and with :func:`vidscraper.utils.html.convert_entities`, on the entry titles
+of all the feed fixtures. ``convert_entities`` is timed both with every
+title new to it (memo cleared) and with the titles repeated, as they are when
+the same feed is parsed again.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_convert_entities.py
+
+"""
+
+import glob
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from BeautifulSoup import BeautifulStoneSoup
+import feedparser
+
+from vidscraper.utils import html
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data')
+
+
+def beautifulstonesoup(titles):
+    for title in titles:
+        unicode(BeautifulStoneSoup(
+            title, convertEntities=BeautifulStoneSoup.HTML_ENTITIES))
+
+
+def convert_entities(titles):
+    for title in titles:
+        html._converted.clear()
+        html.convert_entities(title)
+
+
+def convert_entities_repeated(titles):
+    for title in titles:
+        html.convert_entities(title)
+
+
+def main(repeat=5, number=20):
+    titles = []
+    for path in sorted(glob.glob(os.path.join(DATA, '*', '*.atom')) +
+                       glob.glob(os.path.join(DATA, '*', '*.rss'))):
+        titles.extend(entry['title'] for entry in
+                      feedparser.parse(open(path).read()).entries)
+    print '%d titles' % len(titles)
+    for func in (beautifulstonesoup, convert_entities,
+                 convert_entities_repeated):
+        best = min(timeit.repeat(lambda: func(titles), repeat=repeat,
+                                 number=number))
+        print '%-26s %8.2f usec/title' % (
+            func.__name__, best / (number * len(titles)) * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares feedparser with the fast parsers in :mod:`vidscraper.utils.fastfeed`
+on the youtube and blip feeds in the test data. Each run parses the document
+and passes every entry through the suite's ``parse_feed_entry``.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_feed_parsers.py
+
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import feedparser
+
+from vidscraper.suites.blip import BlipSuite
+from vidscraper.suites.youtube import YouTubeSuite
+from vidscraper.utils import fastfeed
+
+
+DATA_DIR = os.path.join(ROOT, 'vidscraper', 'tests', 'data')
+
+FIXTURES = (
+    (YouTubeSuite(), ('youtube', 'feed.atom')),
+    (YouTubeSuite(), ('youtube', 'search.atom')),
+    (BlipSuite(), ('blip', 'feed.rss')),
+)
+
+
+def with_feedparser(suite, text):
+    for entry in feedparser.parse(text).entries:
+        suite.parse_feed_entry(entry)
+
+
+def with_fastfeed(suite, text):
+    for entry in fastfeed.parse(text, suite.feed_parser).entries:
+        suite.parse_feed_entry(entry)
+
+
+def main(repeat=3, number=10):
+    for suite, path in FIXTURES:
+        text = open(os.path.join(DATA_DIR, *path)).read()
+        count = len(feedparser.parse(text).entries)
+        print '%s (%d entries, %.1f KB)' % ('/'.join(path), count,
+                                            len(text) / 1024.0)
+        for func in (with_feedparser, with_fastfeed):
+            best = min(timeit.repeat(lambda: func(suite, text),
+                                     repeat=repeat, number=number))
+            print '    %-16s %8.1f ms/feed %10.0f entries/sec' % (
+                func.__name__, best / number * 1000, count * number / best)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares parsing a large blip.tv feed all at once with
+:func:`~vidscraper.utils.fastfeed.parse` against streaming it with
+:func:`~vidscraper.utils.fastfeed.iterparse`, as ``VideoFeed(stream=True)``
+does. Each entry is also run through ``BlipSuite.parse_feed_entry``. The feeds
+are synthetic, made by repeating the items of the blip fixture, and are read
+from a temporary file.
+
+Each measurement runs in a fresh process so that the reported peak memory
+(the growth of the maximum resident set size while parsing) is not skewed by
+earlier runs.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_feed_streaming.py
+
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites.blip import BlipSuite
+from vidscraper.utils import fastfeed
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'blip', 'feed.rss')
+
+
+def synthetic(text, count):
+    start = text.index('<item')
+    end = text.rindex('</item>') + len('</item>')
+    items = text[start:end].split('</item>')[:-1]
+    body = ''.join(items[i % len(items)] + '</item>' for i in xrange(count))
+    return text[:start] + body + text[end:]
+
+
+def parse(path):
+    return fastfeed.parse(open(path, 'rb').read(), fastfeed.parse_blip_feed)
+
+
+def iterparse(path):
+    return fastfeed.iterparse(open(path, 'rb'), fastfeed.parse_blip_feed)
+
+
+def measure(func, path, queue):
+    suite = BlipSuite()
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    count = 0
+    for entry in func(path).entries:
+        suite.parse_feed_entry(entry)
+        count += 1
+    elapsed = time.time() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((count, elapsed, after - before))
+
+
+def main():
+    text = open(DATA).read()
+    for count in (1000, 5000, 20000):
+        fd, path = tempfile.mkstemp(suffix='.rss')
+        try:
+            os.write(fd, synthetic(text, count))
+            os.close(fd)
+            print '%d items (%.1f MB)' % (
+                count, os.path.getsize(path) / 1024.0 / 1024.0)
+            for func in (parse, iterparse):
+                queue = multiprocessing.Queue()
+                process = multiprocessing.Process(target=measure,
+                                                  args=(func, path, queue))
+                process.start()
+                entries, elapsed, memory = queue.get()
+                process.join()
+                assert entries == count
+                # ru_maxrss is reported in kilobytes on Linux.
+                print '    %-10s %10.2f s %10d KB peak' % (
+                    func.__name__, elapsed, memory)
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
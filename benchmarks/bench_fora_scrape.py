@@ -0,0 +1,84 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the throughput of the streaming lxml scraper for fora.tv pages with
+the BeautifulSoup/SoupStrainer scraper it replaced.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_fora_scrape.py
+
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from BeautifulSoup import BeautifulSoup, SoupStrainer
+
+from vidscraper.suites.fora import ForaSuite
+
+
+DATA_DIR = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'fora')
+
+CONTENT_IDS = set(['program_title_text'])
+CONTENT_CLASSES = set(['partner_header', 'information_left', 'description'])
+CONTENT_RELS = set(['image_src', 'video_src', 'canonical'])
+
+
+def _strain_filter(name, attrs):
+    return any((attr[0] == 'id' and attr[1] in CONTENT_IDS or
+        attr[0] == 'class' and attr[1] in CONTENT_CLASSES or
+        attr[0] == 'rel' and attr[1] in CONTENT_RELS
+        for attr in attrs))
+
+
+def soupstrainer(page):
+    # Only the parsing is timed; the extraction itself is negligible.
+    list(BeautifulSoup(page, parseOnlyThese=SoupStrainer(_strain_filter)))
+
+
+def streaming(page, suite=ForaSuite()):
+    suite.parse_scrape_response(page)
+
+
+def main(repeat=5, number=20):
+    for name in ('scrape.html', 'scrape2.html'):
+        page = open(os.path.join(DATA_DIR, name)).read()
+        print '%s (%d bytes)' % (name, len(page))
+        for func in (soupstrainer, streaming):
+            best = min(timeit.repeat(lambda: func(page), repeat=repeat,
+                                     number=number))
+            print '    %-15s %8.1f pages/sec %8.2f MB/sec' % (
+                func.__name__, number / best,
+                number * len(page) / best / 1e6)
+
+
+if __name__ == '__main__':
+    main()
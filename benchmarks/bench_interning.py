@@ -0,0 +1,116 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures how much memory interning saves over a long crawl. A synthetic
+blip.tv feed, made by repeating the items of the blip fixture, is streamed
+and every entry is run through ``BlipSuite.parse_feed_entry`` and kept, once
+with a pool shared by the whole crawl (as ``VideoFeed`` does) and once with a
+pool per entry, which is the same as not interning at all.
+
+Reported are the bytes held by the distinct strings in the interned fields
+of the kept entries, and the growth of the maximum resident set size. Each
+measurement runs in a fresh process so that earlier runs don't skew it.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_interning.py
+
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites.blip import BlipSuite
+from vidscraper.utils import fastfeed
+from vidscraper.utils.interning import StringPool
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'blip', 'feed.rss')
+FIELDS = frozenset(['link', 'title', 'user', 'user_url', 'tags'])
+
+
+def synthetic(text, count):
+    start = text.index('<item')
+    end = text.rindex('</item>') + len('</item>')
+    items = text[start:end].split('</item>')[:-1]
+    body = ''.join(items[i % len(items)] + '</item>' for i in xrange(count))
+    return text[:start] + body + text[end:]
+
+
+def string_bytes(kept):
+    seen = {}
+    for data in kept:
+        for value in [data['user'], data['user_url']] + data['tags']:
+            seen[id(value)] = sys.getsizeof(value)
+    return sum(seen.itervalues())
+
+
+def measure(shared, path, queue):
+    suite = BlipSuite()
+    pool = StringPool() if shared else None
+    kept = []
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    feed = fastfeed.iterparse(open(path, 'rb'), fastfeed.parse_blip_feed)
+    for entry in feed.entries:
+        kept.append(suite.parse_feed_entry(entry, fields=FIELDS, pool=pool))
+    elapsed = time.time() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((len(kept), elapsed, string_bytes(kept), after - before))
+
+
+def main():
+    text = open(DATA).read()
+    for count in (5000, 20000, 50000):
+        fd, path = tempfile.mkstemp(suffix='.rss')
+        try:
+            os.write(fd, synthetic(text, count))
+            os.close(fd)
+            print '%d items' % count
+            for shared, label in ((False, 'per entry'), (True, 'shared')):
+                queue = multiprocessing.Queue()
+                process = multiprocessing.Process(target=measure,
+                                                  args=(shared, path, queue))
+                process.start()
+                entries, elapsed, strings, memory = queue.get()
+                process.join()
+                assert entries == count
+                # ru_maxrss is reported in kilobytes on Linux.
+                print '    %-10s %8.2f s %10.1f KB strings %8d KB peak' % (
+                    label, elapsed, strings / 1024.0, memory)
+        finally:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
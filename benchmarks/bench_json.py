@@ -0,0 +1,94 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the json backends :func:`vidscraper.compat.json_loads` can use on
+the Vimeo fixtures, and then compares decoding a large synthetic Vimeo v2
+feed (the fixture's videos repeated) in full against streaming it with
+:func:`vidscraper.utils.jsonstream.load_streaming`: the time until the first
+video is available and the time to read them all.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_json.py
+
+"""
+
+from StringIO import StringIO
+import os
+import sys
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper import compat
+from vidscraper.utils.jsonstream import load_streaming
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'vimeo')
+
+
+def backends(repeat=5, number=50):
+    for name in ('feed.json', 'search.json'):
+        text = open(os.path.join(DATA, name)).read()
+        print '%s (%.1f KB)' % (name, len(text) / 1024.0)
+        for backend, make_loads in compat.JSON_BACKENDS:
+            try:
+                compat.set_json_backend(backend)
+            except ImportError:
+                print '    %-12s not installed' % backend
+                continue
+            best = min(timeit.repeat(lambda: compat.json_loads(text),
+                                     repeat=repeat, number=number))
+            print '    %-12s %8.1f usec' % (backend, best / number * 1e6)
+    compat.set_json_backend()
+
+
+def streaming(copies=500):
+    text = open(os.path.join(DATA, 'feed.json')).read().strip()
+    text = '[%s]' % ','.join([text[1:-1]] * copies)
+    print 'synthetic feed (%.1f MB)' % (len(text) / 1024.0 / 1024.0)
+
+    start = time.time()
+    entries = compat.json_loads(text)
+    first = time.time() - start
+    count = len(entries)
+    print '    %-12s first %8.1f ms, all %8.1f ms (%d videos)' % (
+        'json_loads', first * 1000, (time.time() - start) * 1000, count)
+
+    start = time.time()
+    entries = load_streaming(StringIO(text))
+    entries.next()
+    first = time.time() - start
+    count = 1 + sum(1 for entry in entries)
+    print '    %-12s first %8.1f ms, all %8.1f ms (%d videos)' % (
+        'streaming', first * 1000, (time.time() - start) * 1000, count)
+
+
+if __name__ == '__main__':
+    backends()
+    streaming()
@@ -0,0 +1,113 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the size of, and time taken to pickle and unpickle, a
+:class:`~vidscraper.suites.base.Video` and a loaded
+:class:`~vidscraper.suites.base.VideoFeed` against what their pickles used
+to hold: the whole suite instance, and (for the feed) its first response.
+The old pickles are emulated by pickling those attributes in a dictionary.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_pickle.py
+
+"""
+
+import cPickle
+import datetime
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites import Video, VideoFeed, registry
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'blip', 'feed.rss')
+
+
+def old_video_state(video):
+    state = {'url': video.url, '_suite': video.suite,
+             'fields': list(video.fields), 'api_keys': video.api_keys,
+             'cache': video.cache, '_loaded': video.is_loaded(),
+             'cache_age': video.cache_age, 'stale': video.stale}
+    for field in video._all_fields:
+        state[field] = getattr(video, field)
+    return state
+
+
+def old_feed_state(feed):
+    return feed.__dict__.copy()
+
+
+def make_video():
+    suite = registry.suite_for_name('YouTubeSuite')
+    url = u'http://www.youtube.com/watch?v=J_DV9b0x7v4'
+    video = Video(url, suite)
+    video.link = url
+    video.title = u'Video'
+    video.description = u'A description of the video.'
+    video.publish_datetime = datetime.datetime(2011, 10, 19, 16, 48, 31)
+    video.tags = [u'vidscraper', u'benchmark']
+    video.user = u'someone'
+    video.user_url = u'http://www.youtube.com/user/someone'
+    video.index = 1
+    return video
+
+
+def make_feed():
+    suite = registry.suite_for_name('BlipSuite')
+    feed = VideoFeed('http://blip.tv/djangocon', suite)
+    feed.handle_first_response(suite.get_feed_response(feed,
+                                                       open(DATA).read()))
+    return feed
+
+
+def measure(name, obj, number):
+    pickled = cPickle.dumps(obj, 2)
+    dumps = min(timeit.repeat(lambda: cPickle.dumps(obj, 2), repeat=3,
+                              number=number)) / number
+    loads = min(timeit.repeat(lambda: cPickle.loads(pickled), repeat=3,
+                              number=number)) / number
+    print '    %-4s %8d bytes %10.1f usec dumps %10.1f usec loads' % (
+        name, len(pickled), dumps * 1e6, loads * 1e6)
+
+
+def main():
+    video = make_video()
+    print 'Video'
+    measure('old', old_video_state(video), 10000)
+    measure('new', video, 10000)
+    feed = make_feed()
+    print 'VideoFeed (blip feed fixture, loaded)'
+    measure('old', old_feed_state(feed), 20)
+    measure('new', feed, 1000)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures the throughput of serializing 100,000
+:class:`~vidscraper.suites.base.Video` instances with
+:mod:`vidscraper.utils.serialize`, as JSON Lines and (if it is installed)
+msgpack, and of reading them back, against pickling the same videos with
+:mod:`cPickle`. The videos have the fields a YouTube feed entry fills in.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_serialize.py
+
+"""
+
+import cPickle
+import datetime
+import os
+from StringIO import StringIO
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites import Video, registry
+from vidscraper.utils import serialize
+
+
+COUNT = 100000
+
+
+def make_videos():
+    suite = registry.suite_for_name('YouTubeSuite')
+    published = datetime.datetime(2011, 10, 19, 16, 48, 31)
+    videos = []
+    for i in xrange(COUNT):
+        url = u'http://www.youtube.com/watch?v=%011d' % i
+        video = Video(url, suite)
+        video.link = url
+        video.guid = u'http://gdata.youtube.com/feeds/api/videos/%011d' % i
+        video.title = u'Video number %d' % i
+        video.description = u'A description of video number %d.' % i
+        video.thumbnail_url = u'http://i.ytimg.com/vi/%011d/hqdefault.jpg' % i
+        video.publish_datetime = published + datetime.timedelta(minutes=i)
+        video.tags = [u'vidscraper', u'benchmark']
+        video.user = u'someone'
+        video.user_url = u'http://www.youtube.com/user/someone'
+        video.index = i + 1
+        videos.append(video)
+    return videos
+
+
+def dump_pickle(videos, fileobj):
+    pickler = cPickle.Pickler(fileobj, 2)
+    for video in videos:
+        pickler.dump(video)
+
+
+def iter_pickle(fileobj):
+    unpickler = cPickle.Unpickler(fileobj)
+    for i in xrange(COUNT):
+        yield unpickler.load()
+
+
+def main(repeat=3):
+    videos = make_videos()
+    codecs = [('pickle', dump_pickle, iter_pickle),
+              ('jsonl', serialize.dump_jsonl, serialize.iter_jsonl)]
+    if serialize.msgpack is not None:
+        codecs.append(('msgpack', serialize.dump_msgpack,
+                       serialize.iter_msgpack))
+    print '%d videos' % COUNT
+    for name, dump, load in codecs:
+        output = StringIO()
+        dump(videos, output)
+        data = output.getvalue()
+        dumped = min(timeit.repeat(lambda: dump(videos, StringIO()),
+                                   repeat=repeat, number=1))
+        loaded = min(timeit.repeat(
+            lambda: sum(1 for video in load(StringIO(data))),
+            repeat=repeat, number=1))
+        print '    %-8s %8.0f videos/s dump %8.0f videos/s load %6d bytes' \
+              '/video' % (name, COUNT / dumped, COUNT / loaded,
+                          len(data) / COUNT)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the per-entry cost of parsing provider timestamps the old way
+(:func:`datetime.datetime.strptime` and :mod:`feedparser`'s ``_parse_date``)
+with :mod:`vidscraper.utils.timestamps`, over a synthetic feed of 100,000
+entries, one timestamp per minute, in each of the formats the suites see.
+Every timestamp is new to the memo, so this is the worst case for it.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_timestamps.py
+
+"""
+
+import datetime
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from feedparser import _parse_date
+
+from vidscraper.utils import timestamps
+
+
+ENTRIES = 100000
+START = datetime.datetime(2011, 10, 19, 16, 48, 31)
+FORMATS = (
+    # (name, strftime format, strptime format or None for feedparser)
+    ('vimeo/ustream', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M:%S'),
+    ('blip', '%Y-%m-%dT%H:%M:%SZ', '%Y-%m-%dT%H:%M:%SZ'),
+    ('atom', '%Y-%m-%dT%H:%M:%S.000Z', None),
+    ('rss', '%a, %d %b %Y %H:%M:%S +0000', None),
+)
+
+
+def old(texts, format):
+    if format is None:
+        for text in texts:
+            _parse_date(text)
+    else:
+        strptime = datetime.datetime.strptime
+        for text in texts:
+            strptime(text, format)
+
+
+def new(texts, format):
+    timestamps._parsed.clear()
+    if format is None:
+        for text in texts:
+            (timestamps.parse_w3dtf(text) or timestamps.parse_rfc822(text) or
+             _parse_date(text))
+    else:
+        parse_datetime = timestamps.parse_datetime
+        for text in texts:
+            parse_datetime(text, format)
+
+
+def main(repeat=3, number=1):
+    minute = datetime.timedelta(minutes=1)
+    for name, output, format in FORMATS:
+        texts = [(START + i * minute).strftime(output)
+                 for i in xrange(ENTRIES)]
+        for func in (old, new):
+            best = min(timeit.repeat(lambda: func(texts, format),
+                                     repeat=repeat, number=number))
+            print '%-14s %-4s %6.2f usec/entry' % (
+                name, func.__name__, best / (number * len(texts)) * 1e6)
+
+
+if __name__ == '__main__':
+    main()
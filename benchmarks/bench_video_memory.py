@@ -0,0 +1,125 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Measures the memory and time taken to create and fill in 1,000,000
+:class:`~vidscraper.suites.base.Video` instances, as a long crawl does,
+against a copy of the ``__dict__``-based ``Video`` it replaced. Each video
+has the default (all) fields and gets the link, guid, title, index and
+publish date a feed entry gives it, then its ``missing_fields`` are checked.
+
+Each measurement runs in a fresh process so that the reported memory (the
+growth of the maximum resident set size) is not skewed by earlier runs.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_video_memory.py
+
+"""
+
+import datetime
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites import BaseSuite, Video
+
+
+COUNT = 1000000
+
+
+class ExampleSuite(BaseSuite):
+    video_regex = r'^http://example.com/'
+
+
+class DictVideo(object):
+    """The layout of ``Video`` before it had ``__slots__``."""
+    _all_fields = Video._all_fields
+    link = guid = index = title = description = publish_datetime = None
+    file_url = file_url_mimetype = file_url_length = file_url_expires = None
+    flash_enclosure_url = embed_code = thumbnail_url = user = None
+    user_url = tags = is_embeddable = None
+    url = fields = cache_age = None
+    stale = False
+
+    def __init__(self, url, suite=None, fields=None, api_keys=None,
+                 cache=None):
+        suite.handles_video_url(url)
+        if fields is None:
+            self.fields = list(self._all_fields)
+        else:
+            self.fields = [f for f in fields if f in self._all_fields]
+        self.url = url
+        self._suite = suite
+        self.api_keys = api_keys if api_keys is not None else {}
+        self.cache = cache
+        self._loaded = False
+
+    @property
+    def missing_fields(self):
+        return [f for f in self.fields if getattr(self, f) is None]
+
+
+def measure(cls, queue):
+    suite = ExampleSuite()
+    published = datetime.datetime(2011, 10, 19, 16, 48, 31)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    videos = []
+    for i in xrange(COUNT):
+        url = 'http://example.com/%d' % i
+        video = cls(url, suite)
+        video.link = url
+        video.guid = url
+        video.title = u'Video'
+        video.index = i
+        video.publish_datetime = published
+        video.missing_fields
+        videos.append(video)
+    elapsed = time.time() - start
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, after - before))
+
+
+def main():
+    print '%d videos' % COUNT
+    for cls in (DictVideo, Video):
+        queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=measure, args=(cls, queue))
+        process.start()
+        elapsed, memory = queue.get()
+        process.join()
+        # ru_maxrss is reported in kilobytes on Linux.
+        print '    %-10s %8.2f s %10d KB (%d bytes/video)' % (
+            cls.__name__, elapsed, memory, memory * 1024 / COUNT)
+
+
+if __name__ == '__main__':
+    main()
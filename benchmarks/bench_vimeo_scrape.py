@@ -0,0 +1,106 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the single-pass iterparse extractor used by
+``VimeoSuite.parse_scrape_response`` with the minidom extractor it replaced,
+on the moogaloop fixture and on synthetic documents padded with extra
+``<stream_clips>`` entries.
+
+Each measurement runs in a fresh process so that the reported peak memory
+(the growth of the maximum resident set size while parsing) is not skewed by
+earlier runs.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_vimeo_scrape.py
+
+"""
+
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from xml.dom import minidom
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites.vimeo import SCRAPE_KEYS, _parse_scrape_xml
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'vimeo',
+                    'scrape.xml')
+
+CLIP = ('<video><caption>Clip %d</caption><thumbnail>'
+        'http://b.vimeocdn.com/ts/455/416/45541667_100.jpg</thumbnail>'
+        '<url>http://vimeo.com/%d</url><nodeId>%d</nodeId></video>\n')
+
+
+def minidom_parse(response_text):
+    doc = minidom.parseString(response_text)
+    return dict((key, doc.getElementsByTagName(key).item(0).firstChild.data)
+                for key in SCRAPE_KEYS)
+
+
+def iterparse(response_text):
+    return _parse_scrape_xml(response_text)
+
+
+def synthetic(text, clips):
+    padding = ''.join(CLIP % (i, i, i) for i in xrange(clips))
+    return text.replace('<stream_clips>', '<stream_clips>' + padding, 1)
+
+
+def measure(func, text, number, queue):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.time()
+    for i in xrange(number):
+        func(text)
+    elapsed = (time.time() - start) / number
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((elapsed, after - before))
+
+
+def main():
+    text = open(DATA).read()
+    for clips, number in ((0, 1000), (1000, 20), (10000, 5), (50000, 1)):
+        doc = synthetic(text, clips)
+        print '%d extra clips (%.1f KB)' % (clips, len(doc) / 1024.0)
+        for func in (minidom_parse, iterparse):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(target=measure,
+                                              args=(func, doc, number, queue))
+            process.start()
+            elapsed, memory = queue.get()
+            process.join()
+            # ru_maxrss is reported in kilobytes on Linux.
+            print '    %-15s %10.2f ms %10d KB peak' % (
+                func.__name__, elapsed * 1000, memory)
+
+
+if __name__ == '__main__':
+    main()
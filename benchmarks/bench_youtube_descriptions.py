@@ -0,0 +1,74 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares the per-entry cost of extracting the description from youtube's
+html rss summaries with BeautifulSoup and with the targeted span parser.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_youtube_descriptions.py
+
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from BeautifulSoup import BeautifulSoup
+import feedparser
+
+from vidscraper.suites.youtube import _get_span_description
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'youtube',
+                    'feed.atom')
+
+
+def beautifulsoup(summaries):
+    for summary in summaries:
+        unicode(BeautifulSoup(summary).findAll('span')[0].string)
+
+
+def span_parser(summaries):
+    for summary in summaries:
+        _get_span_description(summary)
+
+
+def main(repeat=5, number=20):
+    summaries = [entry['summary'] for entry in
+                 feedparser.parse(open(DATA).read()).entries]
+    for func in (beautifulsoup, span_parser):
+        best = min(timeit.repeat(lambda: func(summaries), repeat=repeat,
+                                 number=number))
+        print '%-15s %8.1f usec/entry' % (
+            func.__name__, best / (number * len(summaries)) * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Compares ``YouTubeSuite.parse_scrape_response`` with the approach it replaced,
+which ran ``urlparse.parse_qs`` over the whole ``get_video_info`` response and
+decoded every stream in ``url_encoded_fmt_stream_map``, on the fixture
+responses. The new parser is timed with the default preferences and with a
+low-bandwidth ``max_quality``.
+
+Run from the root of the repository::
+
+    python benchmarks/bench_youtube_formats.py
+
+"""
+
+import os
+import sys
+import time
+import timeit
+import urllib
+import urlparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from vidscraper.suites.youtube import YouTubeSuite
+from vidscraper.utils.feedparser import struct_time_to_datetime
+
+
+DATA = os.path.join(ROOT, 'vidscraper', 'tests', 'data', 'youtube')
+
+
+def parse_qs_everything(suite, response_text):
+    params = urlparse.parse_qs(response_text)
+    if params['status'] != ['ok']:
+        return {}
+    data = {
+        'title': params['title'][0].decode('utf8'),
+        'user': params['author'][0].decode('utf8'),
+        'thumbnail_url': params['thumbnail_url'][0],
+        'tags': params['keywords'][0].decode('utf8').split(','),
+        }
+    fmt_list = [int(x.split('/')[0])
+                for x in params['fmt_list'][0].split(',')]
+    fmt_url_map = params["url_encoded_fmt_stream_map"][0].split(",")
+    fmt_url_map = [urllib.unquote_plus(x[4:]).split(';')[0]
+                   for x in fmt_url_map]
+    fmt_url_map = dict(zip(fmt_list, fmt_url_map))
+    for fmt, mimetype in suite.preferred_fmt_types:
+        if fmt in fmt_url_map and fmt_url_map[fmt].startswith('http'):
+            data['file_url'] = file_url = fmt_url_map[fmt]
+            data['file_url_mimetype'] = mimetype
+            parsed_url = urlparse.urlparse(file_url)
+            file_url_qs = urlparse.parse_qs(parsed_url.query)
+            data['file_url_expires'] = struct_time_to_datetime(
+                time.gmtime(int(file_url_qs['expire'][0])))
+    return data
+
+
+def parse_scrape_response(suite, response_text):
+    return suite.parse_scrape_response(response_text)
+
+
+def main(repeat=5, number=2000):
+    low_bandwidth = YouTubeSuite(max_quality=240)
+    for name in ('scrape.txt', 'scrape2.txt'):
+        response_text = open(os.path.join(DATA, name)).read()
+        print '%s (%d bytes)' % (name, len(response_text))
+        for label, func, suite in (
+                ('parse_qs, all streams', parse_qs_everything, YouTubeSuite()),
+                ('lazy', parse_scrape_response, YouTubeSuite()),
+                ('lazy, max_quality=240', parse_scrape_response,
+                 low_bandwidth)):
+            best = min(timeit.repeat(lambda: func(suite, response_text),
+                                     repeat=repeat, number=number))
+            print '    %-25s %8.1f usec' % (label, best / number * 1e6)
+
+
+if __name__ == '__main__':
+    main()
@@ -49,10 +49,11 @@ def handles_feed_url(url):
     return any((suite.handles_feed_url(url) for suite in registry.suites))
 
 
-def auto_scrape(url, fields=None, api_keys=None):
+def auto_scrape(url, fields=None, api_keys=None, cache=None):
     """
     Automatically determines which suite to use and scrapes ``url`` with that
-    suite.
+    suite. If a ``cache`` is given, it will be used to avoid refetching data
+    for the video; see :class:`.Video`.
 
     :returns: :class:`.Video` instance.
 
@@ -60,13 +61,14 @@ def auto_scrape(url, fields=None, api_keys=None):
         scraped.
 
     """
-    video = Video(url, fields=fields, api_keys=api_keys)
+    video = Video(url, fields=fields, api_keys=api_keys, cache=cache)
     video.load()
     return video
 
 
 def auto_feed(url, fields=None, crawl=False, max_results=None, api_keys=None,
-              last_modified=None, etag=None):
+              last_modified=None, etag=None, cache=None, entries_only=False,
+              stream=False):
     """
     Automatically determines which suite to use and scrapes ``feed_url`` with
     that suite. This will return a :class:`VideoFeed` instance instantiated
@@ -74,7 +76,11 @@ def auto_feed(url, fields=None, crawl=False, max_results=None, api_keys=None,
     will yield :class:`.Video` instances which have been initialized with
     the given ``fields`` and ``api_keys``. If ``crawl`` is ``True`` (not the
     default) then :mod:`vidscraper` will return results from multiple pages of
-    the feed, if the suite supports it.
+    the feed, if the suite supports it. If a ``cache`` is given, it will be
+    filled with the data for each entry in the feed. If ``entries_only`` is
+    ``True``, the feed's own metadata will not be loaded. If ``stream`` is
+    ``True``, entries are parsed as the feed is read, so that large feeds
+    don't need to be held in memory.
 
     .. note:: Crawling will only initiate a new HTTP request after it has
               exhausted the results on the current page.
@@ -88,11 +94,12 @@ def auto_feed(url, fields=None, crawl=False, max_results=None, api_keys=None,
     """
     return VideoFeed(url, fields=fields, crawl=crawl, max_results=max_results,
                        api_keys=api_keys, last_modified=last_modified,
-                       etag=etag)
+                       etag=etag, cache=cache, entries_only=entries_only,
+                       stream=stream)
 
 
 def auto_search(query, fields=None, order_by=None, crawl=False,
-                max_results=None, api_keys=None):
+                max_results=None, api_keys=None, cache=None, stream=False):
     """
     Returns a dictionary mapping each registered suite to a
     :class:`.VideoSearch` instance which has been instantiated for that suite
@@ -102,7 +109,7 @@ def auto_search(query, fields=None, order_by=None, crawl=False,
     suites = {}
     for suite in registry.suites:
         search = VideoSearch(query, suite, fields, order_by, crawl,
-                               max_results, api_keys)
+                               max_results, api_keys, cache, stream)
         try:
             search.get_first_url()
         except NotImplementedError:
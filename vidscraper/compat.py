@@ -30,3 +30,65 @@ except ImportError:
         import simplejson as json
     except ImportError:
         raise ImportError("simplejson or native json must be installed.")
+
+
+def _simplejson_loads(simplejson):
+    def loads(s):
+        # simplejson decodes ascii strings in bytestrings to ``str``; given
+        # unicode, it returns unicode throughout, as the json module does.
+        if isinstance(s, str):
+            s = s.decode('utf-8')
+        return simplejson.loads(s)
+    return loads
+
+
+#: The json decoders which :func:`json_loads` can use, fastest first, as
+#: pairs of a module name and a function which returns a ``loads`` function
+#: for that module.
+JSON_BACKENDS = (
+    ('ujson', lambda ujson: ujson.loads),
+    ('simplejson', _simplejson_loads),
+    ('json', lambda json: json.loads),
+)
+
+#: The name of the module :func:`json_loads` is currently using.
+json_backend = None
+_json_loads = None
+
+
+def set_json_backend(name=None):
+    """
+    Makes :func:`json_loads` use the module called ``name`` from
+    :data:`JSON_BACKENDS`, or the fastest one which is installed if ``name``
+    is ``None``.
+
+    :raises ImportError: if the module isn't installed.
+    :raises ValueError: if ``name`` isn't a known backend.
+
+    """
+    global json_backend, _json_loads
+    for backend, make_loads in JSON_BACKENDS:
+        if name is not None and backend != name:
+            continue
+        try:
+            module = __import__(backend)
+        except ImportError:
+            if name is not None:
+                raise
+            continue
+        json_backend = backend
+        _json_loads = make_loads(module)
+        return
+    raise ValueError("Unknown json backend: %r" % name)
+
+
+def json_loads(s):
+    """
+    Decodes the json document ``s`` with the current backend (see
+    :func:`set_json_backend`). Strings are always decoded to unicode.
+
+    """
+    return _json_loads(s)
+
+
+set_json_backend()
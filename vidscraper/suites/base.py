@@ -23,18 +23,30 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import array
+import csv
+import datetime
+import inspect
+from itertools import compress, izip
 import re
+from StringIO import StringIO
 import urllib
 import urllib2
 
 import feedparser
 
-from vidscraper.compat import json
+from vidscraper.compat import json, json_loads
 from vidscraper.errors import CantIdentifyUrl
 from vidscraper.utils.feedparser import (struct_time_to_datetime,
                                          get_item_thumbnail_url)
+from vidscraper.utils import fastfeed
+from vidscraper.utils.cache import CacheEntry
+from vidscraper.utils.http import fetch_url, get_response_cache, open_url
+from vidscraper.utils.interning import StringPool
+from vidscraper.utils.memo import BoundedMemo
 from vidscraper.utils.search import (search_string_from_terms,
                                      terms_from_search_string)
+from vidscraper.utils.timestamps import parse_isoformat
 
 RegexpPattern = type(re.compile(''))
 
@@ -107,12 +119,138 @@ class SuiteRegistry(object):
             return self._fallback
         raise CantIdentifyUrl
 
+    def suite_for_name(self, name):
+        """
+        Returns the registered (or fallback) suite whose class is called
+        ``name``, or raises :exc:`ValueError` if there is no such suite.
+
+        """
+        for suite in self._suites + [self._fallback]:
+            if suite is not None and type(suite).__name__ == name:
+                return suite
+        raise ValueError("No registered suite called %r" % (name,))
+
 
 #: An instance of :class:`.SuiteRegistry` which is used by :mod:`vidscraper` to
 #: track registered suites.
 registry = SuiteRegistry()
 
 
+class _FieldSet(tuple):
+    """
+    The fields requested for a :class:`Video`, along with a bitmask of them.
+    Videos which request the same fields share a single instance; see
+    :func:`_get_field_set`.
+
+    """
+    def __new__(cls, fields):
+        field_set = tuple.__new__(cls, fields)
+        field_set.mask = 0
+        for field in field_set:
+            field_set.mask |= _FIELD_BITS[field]
+        return field_set
+
+    def __reduce__(self):
+        return _get_field_set, (tuple(self),)
+
+
+# The interned field sets, by the fields they were requested with. Field
+# sets for all of the fields are handed out by _get_field_set(None) and
+# aren't kept here.
+_FIELD_SETS_MAX = 1024
+_field_sets = BoundedMemo(_FIELD_SETS_MAX)
+
+
+def _get_field_set(fields):
+    """
+    Returns the shared :class:`_FieldSet` for ``fields``, ignoring any which
+    aren't :class:`Video` fields, or for all fields if ``fields`` is
+    ``None``.
+
+    """
+    if fields is None:
+        return _ALL_FIELD_SET
+    key = tuple(fields)
+    if key == _ALL_FIELDS:
+        return _ALL_FIELD_SET
+    try:
+        return _field_sets[key]
+    except KeyError:
+        pass
+    return _field_sets.remember(
+        key, _FieldSet([f for f in key if f in _FIELD_BITS]))
+
+
+def _get_suite_state(suite):
+    """
+    Returns what should be pickled for ``suite``: its name, if it is the
+    registered instance of its class, so that it is rebound to the
+    registered suite when unpickled; otherwise the suite itself.
+
+    """
+    name = type(suite).__name__
+    try:
+        if registry.suite_for_name(name) is suite:
+            return name
+    except ValueError:
+        pass
+    return suite
+
+
+def _suite_from_state(state):
+    """Reverses :func:`_get_suite_state`."""
+    if isinstance(state, basestring):
+        return registry.suite_for_name(state)
+    return state
+
+
+class _Field(object):
+    """
+    A data descriptor for a :class:`Video` field. The value is kept in a
+    private slot, and the video's bitmask of missing fields is updated as
+    the value is set.
+
+    """
+    def __init__(self, name):
+        self.name = name
+        self.bit = _FIELD_BITS[name]
+        # Filled in with the private slot's descriptor once Video exists.
+        self.slot = None
+
+    def __get__(self, video, cls=None):
+        if video is None:
+            return self
+        try:
+            return self.slot.__get__(video, cls)
+        except AttributeError:
+            return None
+
+    def __set__(self, video, value):
+        self.slot.__set__(video, value)
+        bit = self.bit
+        if video._fields.mask & bit:
+            if value is None:
+                video._missing |= bit
+            else:
+                video._missing &= ~bit
+
+
+_ALL_FIELDS = (
+    'title', 'description', 'publish_datetime', 'file_url',
+    'file_url_mimetype', 'file_url_length', 'file_url_expires',
+    'flash_enclosure_url', 'is_embeddable', 'embed_code',
+    'thumbnail_url', 'user', 'user_url', 'tags', 'link', 'guid',
+    'index'
+)
+_FIELD_BITS = dict((field, 1 << i) for i, field in enumerate(_ALL_FIELDS))
+_ALL_FIELD_SET = _FieldSet(_ALL_FIELDS)
+# The fields, with the names of the slots their values are kept in.
+_FIELD_SLOTS = tuple((field, '_' + field) for field in _ALL_FIELDS)
+_SLOT_NAMES = dict(_FIELD_SLOTS)
+# The fields whose values are datetimes.
+_DATETIME_FIELDS = frozenset(['publish_datetime', 'file_url_expires'])
+
+
 class Video(object):
     """
     This is the class which should be used to represent videos which are
@@ -125,83 +263,234 @@ class Video(object):
                   based on the ``url``.
     :param fields: A list of fields which should be fetched for the video. This
                   may be used to optimize the fetching process.
+    :param api_keys: A dictionary of any API keys which may be required by the
+                     suite.
+    :param cache: A :class:`~vidscraper.utils.cache.BaseCache` instance which
+                  will be checked before, and updated after, fetching data for
+                  the video.
+
+    Videos keep their field values in ``__slots__``, so that large numbers
+    of them stay small; other attributes may still be set on them. Until
+    :attr:`fields` is read, a video shares its fields with all videos which
+    request the same ones, and :attr:`missing_fields` is kept up to date as
+    fields are set.
+
+    Videos pickle compactly, so that they can be handed to other processes:
+    a registered suite is pickled by name and rebound to the registered
+    instance when the video is unpickled, and the :attr:`cache` is dropped.
 
     """
     # FIELDS
-    _all_fields = (
-        'title', 'description', 'publish_datetime', 'file_url',
-        'file_url_mimetype', 'file_url_length', 'file_url_expires',
-        'flash_enclosure_url', 'is_embeddable', 'embed_code',
-        'thumbnail_url', 'user', 'user_url', 'tags', 'link', 'guid',
-        'index'
-    )
+    _all_fields = _ALL_FIELDS
+
+    __slots__ = (('url', '_fields', '_field_list', '_missing', '_suite',
+                  'api_keys', 'cache', '_loaded', 'cache_age', 'stale',
+                  '__dict__', '__weakref__') +
+                 tuple('_' + field for field in _ALL_FIELDS))
+
     #: The canonical link to the video. This may not be the same as the url
     #: used to initialize the video.
-    link = None
+    link = _Field('link')
     #: A (supposedly) global identifier for the video
-    guid = None
+    guid = _Field('guid')
     #: Where the video was in the feed/search
-    index = None
+    index = _Field('index')
     #: The video's title.
-    title = None
+    title = _Field('title')
     #: A text or html description of the video.
-    description = None
+    description = _Field('description')
     #: A python datetime indicating when the video was published.
-    publish_datetime = None
+    publish_datetime = _Field('publish_datetime')
     #: The url to the actual video file.
-    file_url = None
+    file_url = _Field('file_url')
     #: The MIME type for the actual video file
-    file_url_mimetype = None
+    file_url_mimetype = _Field('file_url_mimetype')
     #: The length of the actual video file
-    file_url_length = None
+    file_url_length = _Field('file_url_length')
     #: a datetime.datetime() representing when we think the file URL is no
     #: longer valid
-    file_url_expires = None
+    file_url_expires = _Field('file_url_expires')
     #: "Crappy enclosure link that doesn't actually point to a url.. the kind
     #: crappy flash video sites give out when they don't actually want their
     #: enclosures to point to video files."
-    flash_enclosure_url = None
+    flash_enclosure_url = _Field('flash_enclosure_url')
     #: The actual embed code which can be used for displaying the video in a
     #: browser.
-    embed_code = None
+    embed_code = _Field('embed_code')
     #: The url for a thumbnail of the video.
-    thumbnail_url = None
+    thumbnail_url = _Field('thumbnail_url')
     #: The username associated with the video.
-    user = None
+    user = _Field('user')
     #: The url associated with the video's user.
-    user_url = None
+    user_url = _Field('user_url')
     #: A list of tag names associated with the video.
-    tags = None
+    tags = _Field('tags')
 
     # These were pretty suite-specific and should perhaps be treated as such?
     #: Whether the video is embeddable? (Youtube)
-    is_embeddable = None
+    is_embeddable = _Field('is_embeddable')
 
     # OTHER ATTRS
-    #: The url for this video to scrape based on.
-    url = None
-    #: An iterable of fields to be fetched for this video. Other fields will
-    #: not populated during scraping.
-    fields = None
-
-    def __init__(self, url, suite=None, fields=None, api_keys=None):
+    # These are slots, set in __init__:
+    # - url: The url for this video to scrape based on.
+    # - cache_age: If the video's data was served from a cache, a
+    #   :class:`datetime.timedelta` representing the age of the cached data.
+    #   Otherwise ``None``.
+    # - stale: ``True`` if the video's data was served from an expired cache
+    #   entry.
+
+    def __init__(self, url, suite=None, fields=None, api_keys=None,
+                 cache=None):
         if suite is None:
             suite = registry.suite_for_video_url(url)
         elif not suite.handles_video_url(url):
             raise CantIdentifyUrl
-        if fields is None:
-            self.fields = list(self._all_fields)
-        else:
-            self.fields = [f for f in fields if f in self._all_fields]
+        field_set = _get_field_set(fields)
+        self._fields = field_set
+        self._field_list = None
+        # No field has a value yet, so all of the requested ones are
+        # missing.
+        self._missing = field_set.mask
         self.url = url
         self._suite = suite
         self.api_keys = api_keys if api_keys is not None else {}
+        self.cache = cache
+        self.cache_age = None
+        self.stale = False
 
         # This private attribute is set to ``True`` when data is loaded into
         # the video by a scrape suite. It is *not* set when data is pre-loaded
         # from a feed or a search.
         self._loaded = False
 
+    def __getstate__(self):
+        # A tuple rather than a dictionary, with the field values in a fixed
+        # order, keeps pickles small. The suite is pickled by name if it is
+        # registered, and the cache - which can't cross processes - is left
+        # out.
+        fields = self._sync_fields()
+        return (self.url, _get_suite_state(self._suite),
+                tuple(fields) if fields is not _ALL_FIELD_SET else None,
+                self.api_keys or None, self._loaded, self.cache_age,
+                self.stale,
+                tuple([getattr(self, slot, None)
+                       for field, slot in _FIELD_SLOTS]),
+                self.__dict__ or None)
+
+    def __setstate__(self, state):
+        (self.url, suite, fields, api_keys, self._loaded, self.cache_age,
+         self.stale, values, attrs) = state
+        self._suite = _suite_from_state(suite)
+        self.api_keys = api_keys if api_keys is not None else {}
+        self.cache = None
+        if attrs:
+            self.__dict__.update(attrs)
+        field_set = _get_field_set(fields)
+        self._fields = field_set
+        self._field_list = None
+        missing = field_set.mask
+        for (field, slot), value in izip(_FIELD_SLOTS, values):
+            if value is not None:
+                setattr(self, slot, value)
+                missing &= ~_FIELD_BITS[field]
+        self._missing = missing
+
+    def to_dict(self):
+        """
+        Returns a dictionary of the video's url, suite, fields and values,
+        made only of types which json can encode, which
+        :meth:`from_dict` will turn back into a video. Fields without a
+        value are left out, and so are the requested fields if they are
+        all of them. Dates are given as ISO 8601 strings, in UTC.
+
+        """
+        data = {'url': self.url, 'suite': type(self._suite).__name__}
+        fields = self._sync_fields()
+        if fields is not _ALL_FIELD_SET:
+            data['fields'] = list(fields)
+        for field, slot in _FIELD_SLOTS:
+            value = getattr(self, slot, None)
+            if value is None:
+                continue
+            if field in _DATETIME_FIELDS:
+                if value.tzinfo is not None:
+                    value = value.replace(tzinfo=None) - value.utcoffset()
+                value = value.isoformat()
+            elif field == 'tags':
+                value = list(value)
+            data[field] = value
+        return data
+
+    @classmethod
+    def from_dict(cls, data, suite=None, api_keys=None, cache=None):
+        """
+        Returns a video made from a dictionary returned by :meth:`to_dict`.
+        If no ``suite`` is given, the registered suite named in the
+        dictionary is used, or else one is selected based on the url.
+        ``api_keys`` and ``cache`` are as for :class:`Video`.
+
+        """
+        url = data['url']
+        if suite is None:
+            name = data.get('suite')
+            if name is not None:
+                try:
+                    suite = registry.suite_for_name(name)
+                except ValueError:
+                    # Not registered here; Video picks one for the url.
+                    pass
+        video = cls(url, suite, fields=data.get('fields'), api_keys=api_keys,
+                    cache=cache)
+        # Fill the slots directly, working out the missing fields in one go
+        # rather than as each field is set.
+        missing = video._missing
+        for field, value in data.iteritems():
+            slot = _SLOT_NAMES.get(field)
+            if slot is None or value is None:
+                continue
+            if field in _DATETIME_FIELDS:
+                value = parse_isoformat(value)
+            setattr(video, slot, value)
+            missing &= ~_FIELD_BITS[field]
+        video._missing = missing
+        return video
+
+    @property
+    def fields(self):
+        """
+        A list of the fields which should be fetched for this video. Other
+        fields will not populated during scraping.
+
+        """
+        # The list is only made when it is asked for, since it can be
+        # changed in place; until then the shared field set does.
+        if self._field_list is None:
+            self._field_list = list(self._fields)
+        return self._field_list
+
+    @fields.setter
+    def fields(self, fields):
+        self._field_list = None
+        self._set_field_set(_get_field_set(fields))
+
+    def _set_field_set(self, field_set):
+        self._fields = field_set
+        self._missing = 0
+        for field in field_set:
+            if getattr(self, field) is None:
+                self._missing |= _FIELD_BITS[field]
+
+    def _sync_fields(self):
+        """
+        Returns the video's field set, first catching up with any changes
+        made to the list returned by :attr:`fields`.
+
+        """
+        field_list = self._field_list
+        if field_list is not None and tuple(field_list) != self._fields:
+            self._set_field_set(_get_field_set(field_list))
+        return self._fields
+
     @property
     def missing_fields(self):
         """
@@ -209,7 +498,11 @@ class Video(object):
         been filled with data.
 
         """
-        return [f for f in self.fields if getattr(self, f) is None]
+        fields = self._sync_fields()
+        missing = self._missing
+        if not missing:
+            return []
+        return [f for f in fields if missing & _FIELD_BITS[f]]
 
     @property
     def suite(self):
@@ -226,14 +519,226 @@ class Video(object):
         return self._loaded
 
 
+for _field in _ALL_FIELDS:
+    Video.__dict__[_field].slot = Video.__dict__['_' + _field]
+del _field
+
+
+class VideoBatch(object):
+    """
+    A page of results from a :class:`VideoFeed` or :class:`VideoSearch`,
+    stored by field instead of as a :class:`Video` per result; see
+    :meth:`BaseVideoIterator.iter_batches`. Each field is a column in
+    :attr:`columns`: ``index`` is an :class:`array.array` of ints,
+    ``publish_datetime`` an :class:`array.array` of UTC timestamps (NaN
+    where there is no date) and the others are lists. Strings which tend to
+    repeat from video to video, like ``user``, are interned.
+
+    :param fields: The fields to store, as for :class:`Video`. ``link`` is
+                   always stored.
+    :param pool: A :class:`~vidscraper.utils.interning.StringPool` to
+                 intern strings in, which may be shared between batches.
+
+    """
+    #: The fields whose strings are interned.
+    interned_fields = frozenset(['user', 'user_url', 'file_url_mimetype',
+                                 'tags'])
+    #: The page of results which the batch holds, if it came from a feed or
+    #: search.
+    page = None
+
+    def __init__(self, fields=None, pool=None):
+        fields = _get_field_set(fields)
+        if 'link' not in fields:
+            fields = _get_field_set(('link',) + fields)
+        self.fields = fields
+        self.pool = pool if pool is not None else StringPool()
+        #: The columns, by field.
+        self.columns = {}
+        for field in fields:
+            if field == 'index':
+                self.columns[field] = array.array('l')
+            elif field == 'publish_datetime':
+                self.columns[field] = array.array('d')
+            else:
+                self.columns[field] = []
+
+    def __len__(self):
+        return len(self.columns['link'])
+
+    def _intern(self, value):
+        if isinstance(value, basestring):
+            return self.pool.intern(value)
+        if isinstance(value, list):
+            return self.pool.intern_list(value)
+        return value
+
+    def append(self, data):
+        """
+        Adds a row to the batch from a ``data`` dictionary, as returned by
+        :meth:`BaseSuite.parse_feed_entry`.
+
+        """
+        for field, column in self.columns.iteritems():
+            value = data.get(field)
+            if field == 'index':
+                value = -1 if value is None else value
+            elif field == 'publish_datetime':
+                value = (_NAN if value is None else
+                         _timestamp_from_datetime(value))
+            elif field in self.interned_fields:
+                value = self._intern(value)
+            column.append(value)
+
+    def column(self, field):
+        """
+        Returns a list of the values of ``field``, with dates as
+        :class:`datetime.datetime` instances and missing values as ``None``.
+
+        """
+        column = self.columns[field]
+        if field == 'index':
+            return [None if value == -1 else value for value in column]
+        if field == 'publish_datetime':
+            return [_datetime_from_timestamp(value) for value in column]
+        return list(column)
+
+    def rows(self):
+        """Yields a dictionary of the values for each row of the batch."""
+        fields = self.fields
+        for values in izip(*[self.column(field) for field in fields]):
+            yield dict(izip(fields, values))
+
+    def published_between(self, start=None, end=None):
+        """
+        Returns a new :class:`VideoBatch` holding the rows which were
+        published at or after ``start`` and before ``end``. Either may be
+        ``None`` for no limit; rows without a date are always left out.
+
+        """
+        if 'publish_datetime' not in self.columns:
+            raise ValueError('batch has no publish_datetime column')
+        lower = (_timestamp_from_datetime(start) if start is not None
+                 else float('-inf'))
+        upper = (_timestamp_from_datetime(end) if end is not None
+                 else float('inf'))
+        # NaN compares false, so undated rows are never selected.
+        selectors = [lower <= value < upper
+                     for value in self.columns['publish_datetime']]
+        batch = VideoBatch(self.fields, pool=self.pool)
+        batch.page = self.page
+        for field, column in self.columns.iteritems():
+            selected = compress(column, selectors)
+            if isinstance(column, array.array):
+                batch.columns[field] = array.array(column.typecode, selected)
+            else:
+                batch.columns[field] = list(selected)
+        return batch
+
+    def _export_rows(self):
+        # The rows, with dates as ISO 8601 strings.
+        for row in self.rows():
+            value = row.get('publish_datetime')
+            if value is not None:
+                row['publish_datetime'] = value.isoformat()
+            yield row
+
+    def to_csv(self, fileobj):
+        """
+        Writes the batch to ``fileobj`` as UTF-8 CSV, with a header row of
+        field names. Tags are written as a JSON list, since tags may
+        themselves contain commas, and missing values are left empty.
+
+        """
+        writer = csv.writer(fileobj)
+        writer.writerow(self.fields)
+        for row in self._export_rows():
+            values = []
+            for field in self.fields:
+                value = row[field]
+                if value is None:
+                    value = ''
+                elif field == 'tags':
+                    value = json.dumps(value)
+                if isinstance(value, unicode):
+                    value = value.encode('utf-8')
+                values.append(value)
+            writer.writerow(values)
+
+    def to_jsonl(self, fileobj):
+        """
+        Writes the batch to ``fileobj`` as JSON Lines: one JSON object per
+        row, mapping field names to values.
+
+        """
+        for row in self._export_rows():
+            fileobj.write(json.dumps(row))
+            fileobj.write('\n')
+
+
+_NAN = float('nan')
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+def _timestamp_from_datetime(value):
+    # Naive datetimes are taken to be UTC, as the suites' are.
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) + delta.microseconds / 1e6
+
+
+def _datetime_from_timestamp(value):
+    if value != value:
+        return None
+    return _EPOCH + datetime.timedelta(seconds=value)
+
+
 class BaseVideoIterator(object):
     """
     Generic base class for url-based iterators which rely on suites to yield
     :class:`Video` instances. :class:`VideoFeed` and
     :class:`VideoSearch` both subclass :class:`BaseVideoIterator`.
+
+    Like :class:`Video`, iterators pickle their suite by name if it is
+    registered and drop their cache. They also drop any response they have
+    fetched, keeping only the metadata taken from it.
     """
     _first_response = None
     _max_results = None
+    fields = None
+    # The fields which items are parsed for, or None for all of them. Set
+    # from :attr:`fields` when iteration starts.
+    _entry_fields = None
+    # The StringPool which items are parsed with, so that values which
+    # repeat from item to item are shared. Each iteration has its own.
+    _pool = None
+    # The number of the page currently being fetched or iterated over.
+    _page = 1
+    cache = None
+    # If True, the first response's items can only be iterated over once, so
+    # it is refetched for every iteration after the first.
+    stream = False
+    # Attributes which only matter while the iterator is in use, and which
+    # are left out when it is pickled.
+    _transient_attrs = ('_first_response', '_page', '_entry_fields',
+                        '_pool')
+
+    def __getstate__(self):
+        # Pickles hold the iterator's parameters and the metadata from its
+        # first response, but not the response itself, which is fetched
+        # again if the iterator is iterated over. As for Video, the suite is
+        # pickled by name if it is registered, and the cache is left out.
+        state = self.__dict__.copy()
+        for name in self._transient_attrs:
+            state.pop(name, None)
+        state['suite'] = _get_suite_state(self.suite)
+        state['cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        state['suite'] = _suite_from_state(state['suite'])
+        self.__dict__.update(state)
 
     @property
     def max_results(self):
@@ -269,34 +774,97 @@ class BaseVideoIterator(object):
         if self._first_response:
             return self._first_response
         url = self.get_first_url()
+        self._page = 1
         response = self.get_url_response(url)
         self.handle_first_response(response)
         return response
 
     def _data_from_item(self, item):
         """
-        Returns a :class:`Video` given some data from a feed.
+        Returns a :class:`Video` given some data from a feed. If the iterator
+        has a cache, the data is also stored there, so that loading the video
+        later won't need to refetch it.
         """
         data = self.get_item_data(item)
         video = self.suite.get_video(data['link'],
                                      fields=self.fields,
-                                     api_keys=self.api_keys)
+                                     api_keys=self.api_keys,
+                                     cache=self.cache)
         self.suite.apply_video_data(video, data)
+        if self.cache is not None:
+            self.suite.cache_video_data(self.cache, data['link'], data)
         return video
 
     def __iter__(self):
+        try:
+            for page, index, item in self._iter_items():
+                video = self._data_from_item(item)
+                video.index = index
+                yield video
+        except NotImplementedError:
+            pass
+        raise StopIteration
+
+    def iter_batches(self):
+        """
+        Iterates over the results a page at a time, yielding a
+        :class:`VideoBatch` for each page instead of a :class:`Video` for
+        each item. The batches share the iteration's pool of interned
+        strings.
+
+        """
+        batch = None
+        try:
+            for page, index, item in self._iter_items():
+                if batch is not None and page != batch.page:
+                    yield batch
+                    batch = None
+                if batch is None:
+                    batch = VideoBatch(self.fields, pool=self._pool)
+                    batch.page = page
+                data = self.get_item_data(item)
+                # The index is the item's place in this iteration rather
+                # than data about the video, so it isn't cached.
+                if self.cache is not None:
+                    self.suite.cache_video_data(self.cache, data['link'],
+                                                data)
+                data['index'] = index
+                batch.append(data)
+        except NotImplementedError:
+            pass
+        if batch is not None:
+            yield batch
+
+    def _iter_items(self):
+        """
+        Yields the page number, index and item for each item in the
+        responses, fetching pages as they are needed and stopping at
+        :attr:`max_results`.
+
+        """
         try:
             response = self.load()
+            if self.stream:
+                self._first_response = None
+            if self.fields is None:
+                self._entry_fields = None
+            else:
+                # Videos are created from their links, so that is always
+                # parsed.
+                self._entry_fields = frozenset(self.fields) | frozenset(
+                    ['link'])
+            self._pool = StringPool()
+            self._page = 1
             item_count = 1
             # decrease the index as we count down through the entries.  doesn't
             # quite work for feeds where we don't know the /total/ number of
             # items; then it'll just index the video within the one feed
             while self._max_results is None or item_count < self._max_results:
                 items = self.get_response_items(response)
+                page_count = 0
                 for item in items:
-                    video = self._data_from_item(item)
-                    video.index = item_count
-                    yield video
+                    page_count += 1
+                    yield self._page, item_count, item
                     if self._max_results is not None:
                         if item_count >= self._max_results:
                             raise StopIteration
@@ -307,10 +875,11 @@ class BaseVideoIterator(object):
                 # - the current page was not empty
                 # - a url can be calculated for the next page.
                 url = None
-                if self.crawl and items:
+                if self.crawl and page_count:
                     url = self.get_next_url(response)
                 if url is None:
                     break
+                self._page += 1
                 response = self.get_url_response(url)
         except NotImplementedError:
             pass
@@ -328,7 +897,8 @@ class VideoFeed(BaseVideoIterator):
     :param suite: The suite to use for the scraping. If none is provided, one
                   will be selected based on the url.
     :param fields: Passed on to the :class:`Video` instances which are
-                   created by this feed.
+                   created by this feed. Only these fields (and ``link``) are
+                   parsed from its entries.
     :param crawl: If ``True``, then the scrape will continue onto subsequent
                   pages of the feed if that is supported by the suite. The
                   request for the next page will only be executed once the
@@ -343,6 +913,19 @@ class VideoFeed(BaseVideoIterator):
     :param etag: An etag which may be sent to the service provider to try to
                  short-circuit fetching a feed whose contents are already
                  known.
+    :param cache: A :class:`~vidscraper.utils.cache.BaseCache` which will be
+                  filled with the data for each entry in the feed, and passed
+                  on to the :class:`Video` instances created by this feed.
+    :param entries_only: If ``True``, the feed's own metadata (title,
+                         description, &c) is not loaded, which saves a request
+                         for suites which fetch it separately. Default:
+                         ``False``.
+    :param stream: If ``True``, and the suite supports it, entries are parsed
+                   as the feed is read and discarded once they have been
+                   yielded, so that memory use stays flat however large the
+                   feed is. Feed metadata which comes after the first entry
+                   is ignored, and every iteration refetches the feed.
+                   Default: ``False``.
 
     Additionally, :class:`VideoFeed` populates the following attributes after
     fetching its first response. Attributes which are not supported by the
@@ -380,7 +963,7 @@ class VideoFeed(BaseVideoIterator):
 
     def __init__(self, url, suite=None, fields=None, crawl=False,
                  max_results=None, api_keys=None, last_modified=None,
-                 etag=None):
+                 etag=None, cache=None, entries_only=False, stream=False):
         self.original_url = url
         if suite is None:
             suite = registry.suite_for_feed_url(url)
@@ -394,6 +977,9 @@ class VideoFeed(BaseVideoIterator):
         self.api_keys = api_keys if api_keys is not None else {}
         self.last_modified = last_modified
         self.etag = etag
+        self.cache = cache
+        self.entries_only = entries_only
+        self.stream = stream
 
         self.entry_count = None
         self.description = None
@@ -416,6 +1002,8 @@ class VideoFeed(BaseVideoIterator):
 
     def handle_first_response(self, response):
         super(VideoFeed, self).handle_first_response(response)
+        if self.entries_only:
+            return
         response = self.suite.get_feed_info_response(self, response)
         self.title = self.suite.get_feed_title(self, response)
         self.entry_count = self.suite.get_feed_entry_count(self, response)
@@ -430,7 +1018,9 @@ class VideoFeed(BaseVideoIterator):
         return self.suite.get_feed_entries(self, response)
 
     def get_item_data(self, item):
-        return self.suite.parse_feed_entry(item)
+        method = self.suite.parse_feed_entry
+        return method(item, **_get_parse_kwargs(method, self._entry_fields,
+                                                self._pool))
 
     def get_next_url(self, response):
         return self.suite.get_next_feed_page_url(self, response)
@@ -445,7 +1035,8 @@ class VideoSearch(BaseVideoIterator):
     :param query: The raw string for the search.
     :param suite: Suite to use for this search.
     :param fields: Passed on to the :class:`Video` instances which are
-                   created by this search.
+                   created by this search. Only these fields (and ``link``) are
+                   parsed from its entries.
     :param order_by: The ordering to apply to the search results. If a suite
                      does not support the given ordering, it will return an
                      empty list. Possible values: ``relevant``, ``latest``,
@@ -460,6 +1051,13 @@ class VideoSearch(BaseVideoIterator):
                         Default: ``None`` (as many as possible).
     :param api_keys: A dictionary of any API keys which may be required for the
                      suite used by this search.
+    :param cache: A :class:`~vidscraper.utils.cache.BaseCache` which will be
+                  filled with the data for each search result, and passed on
+                  to the :class:`Video` instances created by this search.
+    :param stream: If ``True``, and the suite supports it, results are
+                   decoded one at a time as they are read rather than all at
+                   once. Streamed responses aren't cached. Default:
+                   ``False``.
 
     Additionally, VideoSearch supports the following attributes:
 
@@ -471,14 +1069,24 @@ class VideoSearch(BaseVideoIterator):
         The amount of time required by the remote service to execute the query,
         if supported by the suite. Otherwise, ``None``.
 
+    If the search has a ``cache``, responses for the first
+    :attr:`cache_pages` pages of results are cached for
+    :attr:`cache_timeout` seconds, keyed by the normalized query, so that
+    repeating a search doesn't refetch them.
+
     """
+    #: The number of leading pages of results which are cached.
+    cache_pages = 2
+    #: The number of seconds for which pages of results are cached.
+    cache_timeout = 5 * 60
 
     @property
     def max_results(self):
         return self._max_results
 
     def __init__(self, query, suite, fields=None, order_by=None,
-                 crawl=False, max_results=None, api_keys=None):
+                 crawl=False, max_results=None, api_keys=None, cache=None,
+                 stream=False):
         self.include_terms, self.exclude_terms = terms_from_search_string(
             query)
         self.query = search_string_from_terms(self.include_terms,
@@ -490,6 +1098,8 @@ class VideoSearch(BaseVideoIterator):
         self.crawl = crawl
         self._max_results = max_results
         self.api_keys = api_keys if api_keys is not None else {}
+        self.cache = cache
+        self.stream = stream
 
         self.total_results = None
         self.time = None
@@ -497,8 +1107,32 @@ class VideoSearch(BaseVideoIterator):
     def get_first_url(self):
         return self.suite.get_search_url(self)
 
+    def get_cache_key(self, page):
+        """
+        Returns the key under which the response for the given ``page`` of
+        this search is cached. Searches with the same include and exclude
+        terms share keys regardless of the order the terms were given in.
+
+        """
+        return u'%s:search:%s:%s:%s:%i' % (
+            type(self.suite).__name__, u' '.join(sorted(self.include_terms)),
+            u' '.join(sorted(self.exclude_terms)), self.order_by, page)
+
     def get_url_response(self, url):
-        return self.suite.get_search_response(self, url)
+        if (self.cache is None or self.stream or
+                self._page > self.cache_pages):
+            return self.suite.get_search_response(self, url)
+        key = self.get_cache_key(self._page)
+        response = self.cache.get(key)
+        if response is None:
+            response = self.suite.get_search_response(self, url)
+            cached = response
+            if isinstance(response, dict) and 'bozo_exception' in response:
+                # feedparser's parse exceptions can't be pickled.
+                cached = type(response)(response)
+                del cached['bozo_exception']
+            self.cache.set(key, cached, timeout=self.cache_timeout)
+        return response
 
     def handle_first_response(self, response):
         super(VideoSearch, self).handle_first_response(response)
@@ -510,12 +1144,61 @@ class VideoSearch(BaseVideoIterator):
         return self.suite.get_search_results(self, response)
 
     def get_item_data(self, item):
-        return self.suite.parse_search_result(self, item)
+        method = self.suite.parse_search_result
+        return method(self, item, **_get_parse_kwargs(
+            method, self._entry_fields, self._pool))
 
     def get_next_url(self, response):
         return self.suite.get_next_search_page_url(self, response)
 
 
+# Maps the item parsing functions of suites to the optional keyword arguments
+# (``fields`` and ``pool``) which they accept. Suites written before those
+# arguments were added accept neither.
+_parse_keywords = {}
+
+
+def _get_parse_kwargs(method, fields, pool):
+    """
+    Returns the keyword arguments to call a suite's item parsing ``method``
+    (``parse_feed_entry`` or ``parse_search_result``) with: ``fields`` if it
+    isn't ``None``, and ``pool``, each only if ``method`` accepts it.
+
+    """
+    func = getattr(method, 'im_func', method)
+    try:
+        accepted = _parse_keywords[func]
+    except KeyError:
+        try:
+            args, varargs, varkw, defaults = inspect.getargspec(func)
+        except TypeError:
+            args, varkw = (), None
+        if varkw is not None:
+            accepted = frozenset(['fields', 'pool'])
+        else:
+            accepted = frozenset(args) & frozenset(['fields', 'pool'])
+        _parse_keywords[func] = accepted
+    kwargs = {}
+    if fields is not None and 'fields' in accepted:
+        kwargs['fields'] = fields
+    if pool is not None and 'pool' in accepted:
+        kwargs['pool'] = pool
+    return kwargs
+
+
+def _closing(entries, fileobj):
+    """
+    Yields the streamed ``entries``, closing ``fileobj`` once they have run
+    out or the generator is closed.
+
+    """
+    try:
+        for entry in entries:
+            yield entry
+    finally:
+        fileobj.close()
+
+
 class BaseSuite(object):
     """
     This is a base class for suites, demonstrating the API which is expected
@@ -534,6 +1217,16 @@ class BaseSuite(object):
     #: A URL which is an endpoint for an oembed API.
     oembed_endpoint = None
 
+    #: A format string which generates the canonical url for a video from its
+    #: id, as returned by :meth:`get_video_id`. If this is ``None``,
+    #: :meth:`canonical_url` will return urls unchanged.
+    canonical_video_url = None
+
+    #: A function from :mod:`vidscraper.utils.fastfeed` which parses feeds
+    #: of the known shape this suite's feeds have, or ``None`` to parse them
+    #: with :mod:`feedparser`. See :meth:`parse_feed`.
+    feed_parser = None
+
     @property
     def oembed_fields(self):
         """
@@ -557,6 +1250,10 @@ class BaseSuite(object):
     #accurate : optimization.
     scrape_fields = set()
 
+    #: The fields which :meth:`parse_feed_entry` computes when it isn't
+    #: given any: all of them.
+    entry_fields = frozenset(Video._all_fields)
+
     def __init__(self):
         if isinstance(self.video_regex, basestring):
             self.video_regex = re.compile(self.video_regex)
@@ -614,6 +1311,40 @@ class BaseSuite(object):
         except AttributeError:
             raise NotImplementedError
 
+    def get_video_id(self, url):
+        """
+        Returns the service provider's id for the video at ``url``, or
+        ``None`` if the id can't be determined without network access. By
+        default, this returns the ``video_id`` or ``id`` group matched by
+        :attr:`.video_regex`, or raises a :exc:`NotImplementedError` if there
+        is no :attr:`.video_regex`.
+
+        """
+        try:
+            match = self.video_regex.match(url)
+        except AttributeError:
+            raise NotImplementedError
+        if match is None:
+            return None
+        groups = match.groupdict()
+        return groups.get('video_id') or groups.get('id')
+
+    def canonical_url(self, url):
+        """
+        Returns a canonical form of the video ``url``, so that the different
+        ways of linking to a single video all map to the same url. By
+        default, this fills :attr:`.canonical_video_url` with the id returned
+        by :meth:`get_video_id`; if either is ``None``, the ``url`` is
+        returned unchanged.
+
+        """
+        if self.canonical_video_url is None:
+            return url
+        video_id = self.get_video_id(url)
+        if video_id is None:
+            return url
+        return self.canonical_video_url % video_id
+
     def get_feed_url(self, url):
         """
         Some suites can handle URLs that are not technically feeds, but can
@@ -638,8 +1369,9 @@ class BaseSuite(object):
         attributes of a :class:`Video` instance.
 
         """
+        fields = video._sync_fields()
         for field, value in data.iteritems():
-            if (field in video.fields):# and getattr(video, field) is None):
+            if (field in fields):# and getattr(video, field) is None):
                 setattr(video, field, value)
 
     def get_oembed_url(self, video):
@@ -662,7 +1394,7 @@ class BaseSuite(object):
         ``author_url``, ``thumbnail_url``, and ``html`` are available.
 
         """
-        parsed = json.loads(response_text)
+        parsed = json_loads(response_text)
         data = {
             'title': parsed['title'],
             'user': parsed['author_name'],
@@ -709,14 +1441,33 @@ class BaseSuite(object):
     def _run_methods(self, video, methods):
         """
         Runs the selected methods, applies the returned data, and marks on the
-        video that they have been run.
+        video that they have been run. Returns a dictionary of all the data
+        returned by the methods.
 
         """
+        all_data = {}
         for method in methods:
             url = getattr(self, "get_%s_url" % method)(video)
-            response_text = urllib2.urlopen(url, timeout=5).read()
+            response_text = fetch_url(url).body
             data = getattr(self, "parse_%s_response" % method)(response_text)
             self.apply_video_data(video, data)
+            all_data.update(data)
+        return all_data
+
+    def get_cache_key(self, url):
+        """
+        Returns the key under which data for the video at ``url`` is cached.
+        The key is based on the video's id if :meth:`get_video_id` can
+        determine it, and on :meth:`canonical_url` otherwise.
+
+        """
+        try:
+            video_id = self.get_video_id(url)
+        except NotImplementedError:
+            video_id = None
+        if video_id is None:
+            video_id = self.canonical_url(url)
+        return u'%s:video:%s' % (type(self).__name__, video_id)
 
     def load_video_data(self, video):
         """
@@ -724,11 +1475,108 @@ class BaseSuite(object):
         fields for the ``video``. The data is immediately stored on the video
         instance.
 
+        If the video has a :attr:`~Video.cache`, fresh cached data is used
+        instead of making requests, and fetched data is stored in the cache.
+        Expired data is served immediately (and refreshed in the background)
+        if the cache allows stale-while-revalidate, and is also served if
+        fetching fresh data fails and the cache allows stale-if-error.
+
         """
         missing_fields = set(video.missing_fields)
         if not missing_fields:
             return
 
+        cache = video.cache
+        if cache is None:
+            self._load_missing_fields(video, missing_fields)
+            return
+
+        key = self.get_cache_key(video.url)
+        entry = cache.get_entry(key)
+        served = False
+        if entry is not None:
+            if not entry.is_expired():
+                self._apply_cache_entry(video, entry)
+                served = True
+            elif cache.can_serve_stale(entry):
+                self._apply_cache_entry(video, entry, stale=True)
+                served = True
+                fields = (set(entry.value) | missing_fields) & set(
+                    video._all_fields)
+                cache.revalidate(key, lambda: self._refresh_cache_entry(
+                    cache, key, video, fields))
+        if served:
+            missing_fields -= set(entry.value)
+            if not missing_fields:
+                return
+
+        try:
+            data = self._load_missing_fields(video, missing_fields)
+        except Exception:
+            # Only expired data may stand in for a failed fetch, and only
+            # within the stale-if-error window; a fresh entry which lacks
+            # some fields is no excuse for hiding the error.
+            if (entry is None or not entry.is_expired() or
+                    not cache.can_serve_stale(entry, error=True)):
+                raise
+            if not served:
+                self._apply_cache_entry(video, entry, stale=True)
+            return
+        self._store_cache_data(cache, key, data)
+
+    def _apply_cache_entry(self, video, entry, stale=False):
+        self.apply_video_data(video, entry.value)
+        video.cache_age = datetime.timedelta(seconds=entry.age)
+        video.stale = stale
+
+    def cache_video_data(self, cache, url, data):
+        """
+        Stores the fields in ``data`` which have values in the ``cache`` for
+        the video at ``url``. This lets data which is already at hand - from a
+        feed entry, for example - answer later requests for the video.
+
+        """
+        data = dict((field, value) for field, value in data.iteritems()
+                    if value is not None)
+        self._store_cache_data(cache, self.get_cache_key(url), data)
+
+    def _store_cache_data(self, cache, key, data):
+        """
+        Merges ``data`` into any fresh data already cached for ``key`` - so
+        that fields fetched for other requests aren't lost - and stores the
+        result. Unless ``data`` replaces every cached field, the entry keeps
+        its age, so that fields which weren't refetched (a signed
+        ``file_url``, say) still expire when they would have.
+
+        """
+        if not data:
+            return
+        entry = cache.get_entry(key, record=False)
+        if entry is not None and not entry.is_expired():
+            merged = entry.value.copy()
+            merged.update(data)
+            if len(merged) > len(data):
+                cache.set_entry(key, CacheEntry(merged, entry.created,
+                                                entry.timeout))
+                return
+        cache.set(key, data)
+
+    def _refresh_cache_entry(self, cache, key, video, fields):
+        """
+        Fetches fresh data for the given ``fields`` of ``video`` and stores it
+        in the ``cache``. The ``video`` itself is left untouched.
+
+        """
+        fresh = Video(video.url, self, fields=fields, api_keys=video.api_keys)
+        data = self._load_missing_fields(fresh, set(fields))
+        self._store_cache_data(cache, key, data)
+
+    def _load_missing_fields(self, video, missing_fields):
+        """
+        Runs the smallest combination of methods which will fill as many of the
+        ``missing_fields`` as possible, and returns the data they returned.
+
+        """
         # Check if the missing fields can be supplied by a single method, a
         # combination of two methods, or all three methods.
         remaining_dict = {}
@@ -742,8 +1590,7 @@ class BaseSuite(object):
 
             # If a method fills all the missing fields, take it immediately.
             if not remaining:
-                self._run_methods(video, methods)
-                return
+                return self._run_methods(video, methods)
 
             # Otherwise only consider the method if it would reduce the number
             # of remaining fields at all.
@@ -758,22 +1605,86 @@ class BaseSuite(object):
         # to be done and we can simply return.
         for i in xrange(len(missing_fields)):
             if i in remaining_dict:
-                self._run_methods(video, remaining_dict[i][0])
-                return
+                return self._run_methods(video, remaining_dict[i][0])
+        return {}
 
     def get_feed_response(self, feed, feed_url):
         """
         Returns a parsed response for this ``feed``. By default, this uses
         :mod:`feedparser` to get a response for the ``feed_url`` and returns
-        the resulting structure.
-
-        """
+        the resulting structure. If an HTTP response cache is set, or the
+        suite has a :attr:`feed_parser`, http urls are fetched through
+        :func:`~vidscraper.utils.http.fetch_url` and the body is parsed with
+        :meth:`parse_feed`.
+
+        If the ``feed`` is streaming and the suite has a :attr:`feed_parser`,
+        the response is parsed incrementally by :meth:`stream_feed` instead.
+
+        """
+        if getattr(feed, 'stream', False) and self.feed_parser is not None:
+            return self.stream_feed(feed_url)
+        if feed_url.startswith(('http://', 'https://')):
+            if (self.feed_parser is not None or
+                    get_response_cache() is not None):
+                fetched = fetch_url(feed_url)
+                response = self.parse_feed(fetched.body, fetched.headers)
+                response['href'] = fetched.url
+                return response
+        elif self.feed_parser is not None and feed_url.lstrip()[:1] == '<':
+            # The feed's document itself was passed in.
+            return self.parse_feed(feed_url)
         response = feedparser.parse(feed_url)
         # Don't let feedparser silence connection problems.
         if isinstance(response.get('bozo_exception', None), urllib2.URLError):
             raise response.bozo_exception
         return response
 
+    def parse_feed(self, text, response_headers=None):
+        """
+        Parses the ``text`` of a feed document and returns a
+        :mod:`feedparser`-compatible structure. If the suite has a
+        :attr:`feed_parser`, that is used, falling back to :mod:`feedparser`
+        for documents it doesn't recognize; otherwise, the text is parsed
+        with :mod:`feedparser`.
+
+        """
+        if self.feed_parser is not None:
+            return fastfeed.parse(text, self.feed_parser, response_headers)
+        return feedparser.parse(text, response_headers=response_headers)
+
+    def stream_feed(self, feed_url):
+        """
+        Opens ``feed_url`` (a url, a file path or the feed's document itself)
+        and parses it incrementally with :attr:`feed_parser`. The response's
+        ``entries`` are a generator which yields each entry as soon as it has
+        been read and then discards its element, so memory use doesn't grow
+        with the size of the feed; the feed is closed when the generator is
+        exhausted or closed. Documents the :attr:`feed_parser` doesn't
+        recognize are parsed with :mod:`feedparser` as usual.
+
+        """
+        headers = href = None
+        if feed_url.startswith(('http://', 'https://', 'file://')):
+            opened = open_url(feed_url)
+            fileobj, headers, href = opened.body, opened.headers, opened.url
+        elif feed_url.lstrip()[:1] == '<':
+            fileobj = StringIO(feed_url)
+        else:
+            fileobj = open(feed_url, 'rb')
+        try:
+            response = fastfeed.iterparse(fileobj, self.feed_parser, headers)
+        except Exception:
+            fileobj.close()
+            raise
+        if href is not None:
+            response['href'] = href
+        if isinstance(response.entries, list):
+            # The document was read completely.
+            fileobj.close()
+        else:
+            response['entries'] = _closing(response.entries, fileobj)
+        return response
+
     def get_feed_info_response(self, feed, response):
         """
         In case the response for the given ``feed`` needs to do other work on
@@ -797,9 +1708,11 @@ class BaseSuite(object):
         """
         Returns an estimate of the total number of entries in this feed, or
         ``None`` if that cannot be determined. By default, returns the number
-        of entries in the feed.
+        of entries in the feed, or ``None`` if they are being streamed.
 
         """
+        if not isinstance(feed_response.entries, list):
+            return None
         return len(feed_response.entries)
 
     def get_feed_description(self, feed, feed_response):
@@ -873,12 +1786,17 @@ class BaseSuite(object):
         """
         return feed_response.entries
 
-    def parse_feed_entry(self, entry):
+    def parse_feed_entry(self, entry, fields=None, pool=None):
         """
         Given a feed entry (as returned by :meth:`.get_feed_entries`), creates
         and returns a dictionary containing data from the feed entry, suitable
-        for application via :meth:`apply_video_data`. Must be implemented by
-        subclasses.
+        for application via :meth:`apply_video_data`. If ``fields`` is given,
+        only those fields (which always include ``link``) are wanted, and the
+        others needn't be computed. If a
+        :class:`~vidscraper.utils.interning.StringPool` is given as ``pool``,
+        values which repeat from entry to entry, like the user, should be
+        interned in it. Must be implemented by subclasses; implementations
+        may leave out either argument, and it won't be passed to them.
 
         """
         raise NotImplementedError
@@ -943,17 +1861,19 @@ class BaseSuite(object):
         """
         return self.get_feed_entries(search, search_response)
 
-    def parse_search_result(self, search, result):
+    def parse_search_result(self, search, result, fields=None, pool=None):
         """
         Given a :class:`VideoSearch` instance and a search result (as
         returned by :meth:`.get_search_results`), returns a dictionary
         containing data from the search result, suitable for application via
-        :meth:`apply_video_data`. By default, assumes that the ``result`` is a
-        :mod:`feedparser` entry and passes the work off to
+        :meth:`apply_video_data`. ``fields`` and ``pool`` are as for
+        :meth:`.parse_feed_entry`. By default, assumes that the ``result`` is
+        a :mod:`feedparser` entry and passes the work off to
         :meth:`.parse_feed_entry`.
 
         """
-        return self.parse_feed_entry(result)
+        method = self.parse_feed_entry
+        return method(result, **_get_parse_kwargs(method, fields, pool))
 
     def get_next_search_page_url(self, search, search_response):
         """
@@ -23,22 +23,30 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-from datetime import datetime
+import re
 import urllib
 import urlparse
 
-import feedparser
-
 from vidscraper.suites import BaseSuite, registry
+from vidscraper.utils.fastfeed import parse_blip_feed
 from vidscraper.utils.feedparser import get_entry_thumbnail_url, \
                                         get_first_accepted_enclosure
 from vidscraper.utils.http import clean_description_html, \
     open_url_while_lying_about_agent
+from vidscraper.utils.interning import StringPool
+from vidscraper.utils.timestamps import parse_datetime
 
 
 class BlipSuite(BaseSuite):
     video_regex = r'^https?://(?P<subsite>[a-zA-Z]+\.)?blip.tv(?:/.*)?$'
     feed_regex = video_regex
+    feed_parser = staticmethod(parse_blip_feed)
+    # Matches the post id at the end of urls like
+    # http://blip.tv/djangocon/lightning-talks-day-1-4167881
+    _post_id_re = re.compile(r'^[^?#]*-(?P<video_id>\d+)/?(?:[?#].*)?$')
+    # blip.tv's short permalink form; the show and slug are ignored, so this
+    # resolves to the post without a redirect in :meth:`get_api_url`.
+    canonical_video_url = u'http://blip.tv/a/a-%s'
 
     api_fields = set(['link', 'title', 'description', 'file_url', 'embed_code',
             'thumbnail_url', 'tags', 'publish_datetime', 'user', 'user_url'])
@@ -47,29 +55,54 @@ class BlipSuite(BaseSuite):
     oembed_fields = set(['user', 'user_url', 'embed_code', 'thumbnail_url',
             'title'])
 
-    def parse_feed_entry(self, entry):
+    def get_video_id(self, url):
+        """
+        Returns the post id for the video. Older ``/file/`` urls and
+        ``/play/`` urls only reveal the post id after a redirect, so ``None``
+        is returned for them.
+
+        """
+        if '/play/' in url:
+            return None
+        match = self._post_id_re.match(url)
+        if match is None:
+            return None
+        return match.group('video_id')
+
+    def parse_feed_entry(self, entry, fields=None, pool=None):
         """
         Reusable method to parse a feedparser entry from a blip rss feed into
         a dictionary mapping :class:`.Video` fields to values.
 
         """
-        enclosure = get_first_accepted_enclosure(entry)
-
-        return {
-            'link': entry['link'],
-            'title': entry['title'],
-            'description': clean_description_html(
-                entry['blip_puredescription']),
-            'file_url': enclosure['url'],
-            'embed_code': entry['media_player']['content'],
-            'publish_datetime': datetime.strptime(entry['blip_datestamp'],
-                                                  "%Y-%m-%dT%H:%M:%SZ"),
-            'thumbnail_url': get_entry_thumbnail_url(entry),
-            'tags': [tag['term'] for tag in entry['tags']
-                     if tag['scheme'] is None][1:],
-            'user': entry['blip_safeusername'],
-            'user_url': entry['blip_showpage']
-            }
+        if fields is None:
+            fields = self.entry_fields
+        if pool is None:
+            pool = StringPool()
+        data = {'link': entry['link']}
+        if 'title' in fields:
+            data['title'] = entry['title']
+        if 'description' in fields:
+            data['description'] = clean_description_html(
+                entry['blip_puredescription'])
+        if 'file_url' in fields:
+            data['file_url'] = get_first_accepted_enclosure(entry)['url']
+        if 'embed_code' in fields:
+            data['embed_code'] = entry['media_player']['content']
+        if 'publish_datetime' in fields:
+            data['publish_datetime'] = parse_datetime(entry['blip_datestamp'],
+                                                      "%Y-%m-%dT%H:%M:%SZ")
+        if 'thumbnail_url' in fields:
+            data['thumbnail_url'] = get_entry_thumbnail_url(entry)
+        if 'tags' in fields:
+            data['tags'] = pool.intern_list([tag['term']
+                                             for tag in entry['tags']
+                                             if tag['scheme'] is None][1:])
+        if 'user' in fields:
+            data['user'] = pool.intern(entry['blip_safeusername'])
+        if 'user_url' in fields:
+            data['user_url'] = pool.intern(entry['blip_showpage'])
+        return data
 
     def get_next_feed_page_url(self, feed, feed_response):
         parsed = urlparse.urlparse(feed_response.href)
@@ -104,6 +137,6 @@ class BlipSuite(BaseSuite):
         return urlparse.urlunparse(new_parsed_url)
 
     def parse_api_response(self, response_text):
-        parsed = feedparser.parse(response_text)
+        parsed = self.parse_feed(response_text)
         return self.parse_feed_entry(parsed.entries[0])
 registry.register(BlipSuite)
@@ -4,6 +4,7 @@ from vidscraper.utils.html import convert_entities, make_embed_code
 from vidscraper.utils.feedparser import (get_first_accepted_enclosure,
                                          get_entry_thumbnail_url,
                                          struct_time_to_datetime)
+from vidscraper.utils.interning import StringPool
 
 class GenericFeedSuite(BaseSuite):
 
@@ -13,6 +14,9 @@ class GenericFeedSuite(BaseSuite):
     def handles_feed_url(self, url):
         return True
 
+    def get_video_id(self, url):
+        return None
+
     def get_feed_response(self, feed, url):
         response = super(GenericFeedSuite, self).get_feed_response(feed, url)
         if response.entries or not response.bozo_exception: # good feed
@@ -23,15 +27,11 @@ class GenericFeedSuite(BaseSuite):
         else:
             raise CantIdentifyUrl
 
-    def parse_feed_entry(self, entry):
-        enclosure = get_first_accepted_enclosure(entry)
-        if 'published_parsed' in entry:
-            best_date = struct_time_to_datetime(entry['published_parsed'])
-        elif 'updated_parsed' in entry:
-            best_date = struct_time_to_datetime(entry['updated_parsed'])
-        else:
-            best_date = None
-
+    def parse_feed_entry(self, entry, fields=None, pool=None):
+        if fields is None:
+            fields = self.entry_fields
+        if pool is None:
+            pool = StringPool()
         link = entry.get('link')
         if 'links' in entry:
             for possible_link in entry.links:
@@ -39,35 +39,60 @@ class GenericFeedSuite(BaseSuite):
                     # original URL
                     link = possible_link['href']
                     break
-        if ('content' in entry and entry['content'] and
-            entry['content'][0]['value']): # Atom
-            description = entry['content'][0]['value']
-        else:
-            description = entry['summary'] or ''
+        data = {'link': link}
+
+        if 'title' in fields:
+            data['title'] = convert_entities(entry['title'])
+
+        if 'description' in fields:
+            if ('content' in entry and entry['content'] and
+                entry['content'][0]['value']): # Atom
+                data['description'] = entry['content'][0]['value']
+            else:
+                data['description'] = entry['summary'] or ''
+
+        if 'thumbnail_url' in fields:
+            data['thumbnail_url'] = get_entry_thumbnail_url(entry)
+
+        if ('file_url' in fields or 'file_url_mimetype' in fields or
+            'file_url_length' in fields):
+            enclosure = get_first_accepted_enclosure(entry) or {}
+            if 'file_url' in fields:
+                data['file_url'] = enclosure.get('url')
+            if 'file_url_mimetype' in fields:
+                data['file_url_mimetype'] = pool.intern(
+                    enclosure.get('type'))
+            if 'file_url_length' in fields:
+                data['file_url_length'] = (enclosure.get('filesize') or
+                                           enclosure.get('length'))
+
+        if 'publish_datetime' in fields:
+            if 'published_parsed' in entry:
+                best_date = struct_time_to_datetime(entry['published_parsed'])
+            elif 'updated_parsed' in entry:
+                best_date = struct_time_to_datetime(entry['updated_parsed'])
+            else:
+                best_date = None
+            data['publish_datetime'] = best_date
+
+        if 'guid' in fields:
+            data['guid'] = entry.get('id')
 
-        embed_code = None
-        if 'media_player' in entry:
-            player = entry['media_player']
-            if player.get('content'):
-                embed_code = convert_entities(player['content'])
-            elif 'url' in player:
-                embed_code = make_embed_code(player['url'], '')
+        if 'embed_code' in fields:
+            embed_code = None
+            if 'media_player' in entry:
+                player = entry['media_player']
+                if player.get('content'):
+                    embed_code = convert_entities(player['content'])
+                elif 'url' in player:
+                    embed_code = make_embed_code(player['url'], '')
+            data['embed_code'] = embed_code
 
-        return {
-            'link': link,
-            'title': convert_entities(entry['title']),
-            'description': description,
-            'thumbnail_url': get_entry_thumbnail_url(entry),
-            'file_url': enclosure.get('url') if enclosure else None,
-            'file_url_mimetype': enclosure.get('type') if enclosure else None,
-            'file_url_length': ((enclosure.get('filesize') or
-                                enclosure.get('length'))
-                                if enclosure else None),
-            'publish_datetime': best_date,
-            'guid': entry.get('id'),
-            'embed_code': embed_code,
-            'tags': [tag['term'] for tag in entry['tags']
-                     if tag['scheme'] is None] if 'tags' in entry else None
-            }
+        if 'tags' in fields:
+            data['tags'] = (pool.intern_list([tag['term']
+                                              for tag in entry['tags']
+                                              if tag['scheme'] is None])
+                            if 'tags' in entry else None)
+        return data
 
 registry.register_fallback(GenericFeedSuite)
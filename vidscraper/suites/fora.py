@@ -27,61 +27,66 @@ import datetime
 import urllib
 import urlparse
 
-from BeautifulSoup import BeautifulSoup, SoupStrainer
-
 from vidscraper.suites import BaseSuite, registry
-from vidscraper.utils.html import make_embed_code
+from vidscraper.utils.html import (element_string, inner_html, iterparse_html,
+                                   make_embed_code)
 
 
-CONTENT_IDS = set(['program_title_text',])
-CONTENT_CLASSES = set(['partner_header', 'information_left', 'description'])
 CONTENT_RELS = set(['image_src', 'video_src', 'canonical'])
 
 
-def _strain_filter(name, attrs):
-    return any((attr[0] == 'id' and attr[1] in CONTENT_IDS or
-        attr[0] == 'class' and attr[1] in CONTENT_CLASSES or
-        attr[0] == 'rel' and attr[1] in CONTENT_RELS
-        for attr in attrs))
-
-
 class ForaSuite(BaseSuite):
     """Suite for fora.tv. As of 19-09-2011 fora does not offer any public API, only video pages and rss feeds."""
-    video_regex = 'https?://(www\.)?fora\.tv/\d{4}/\d{2}/\d{2}/\w+'
+    video_regex = r'https?://(www\.)?fora\.tv/(?P<video_id>\d{4}/\d{2}/\d{2}/\w+)'
+    canonical_video_url = u'http://fora.tv/%s'
     scrape_fields = set(['link', 'title', 'description', 'flash_enclosure_url', 'embed_code', 'thumbnail_url', 'publish_date', 'user', 'user_url'])
 
     def get_scrape_url(self, video):
         return video.url
 
     def parse_scrape_response(self, response_text):
-        strainer = SoupStrainer(_strain_filter)
-        soup = BeautifulSoup(response_text, parseOnlyThese=strainer)
+        """
+        Streams the page through :mod:`lxml`'s pull parser and stops as soon
+        as every scraped field has been seen, so the (large) remainder of
+        the page is never parsed.
+
+        """
         data = {}
-        for tag in soup:
-            if tag.name == 'link':
-                if tag['rel'] == 'image_src':
-                    data['thumbnail_url'] = unicode(tag['href'])
-                elif tag['rel'] == 'video_src':
-                    src = unicode(tag['href'])
-                    data['flash_enclosure_url'] = src
-                    flash_url, flash_vars = src.split('?', 1)
-                    flash_vars = urlparse.parse_qs(flash_vars)
-                    flash_vars['cliptype'] = 'full'
-                    flash_vars = urllib.urlencode(flash_vars)
-                    data['embed_code'] = make_embed_code(flash_url, flash_vars)
-                elif tag['rel'] == 'canonical':
-                    data['link'] = u"http://fora.tv%s" % unicode(tag['href'])
-            elif tag.name == 'span' and tag['id'] == 'program_title_text':
-                data['title'] = unicode(tag.string)
-            elif tag.name == 'dd' and tag['class'] == 'description':
-                data['description'] = ''.join((unicode(t) for t in tag)).strip()
-            elif tag.name == 'a' and tag['class'] == 'partner_header':
-                data['user'] = unicode(tag.string)
-                data['user_url'] = unicode(tag['href'])
-            elif tag.name == 'div' and tag['class'] == 'information_left':
-                dds = tag.findAll('dd')
-                date = unicode(dds[2].string)
-                date = datetime.datetime.strptime(date, "%m.%d.%y")
-                data['publish_date'] = date
+        field_count = len(self.scrape_fields)
+        for elt in iterparse_html(response_text):
+            self._parse_scrape_element(elt, data)
+            if len(data) == field_count:
+                break
         return data
+
+    def _parse_scrape_element(self, elt, data):
+        tag = elt.tag
+        if tag == 'link':
+            rel = elt.get('rel')
+            if rel not in CONTENT_RELS:
+                return
+            href = unicode(elt.get('href'))
+            if rel == 'image_src':
+                data['thumbnail_url'] = href
+            elif rel == 'video_src':
+                data['flash_enclosure_url'] = href
+                flash_url, flash_vars = href.split('?', 1)
+                flash_vars = urlparse.parse_qs(flash_vars)
+                flash_vars['cliptype'] = 'full'
+                flash_vars = urllib.urlencode(flash_vars)
+                data['embed_code'] = make_embed_code(flash_url, flash_vars)
+            else:
+                data['link'] = u"http://fora.tv%s" % href
+        elif tag == 'span' and elt.get('id') == 'program_title_text':
+            data['title'] = element_string(elt)
+        elif tag == 'dd' and elt.get('class') == 'description':
+            data['description'] = inner_html(elt).strip()
+        elif tag == 'a' and elt.get('class') == 'partner_header':
+            data['user'] = element_string(elt)
+            data['user_url'] = unicode(elt.get('href'))
+        elif tag == 'div' and elt.get('class') == 'information_left':
+            dds = list(elt.iter('dd'))
+            date = datetime.datetime.strptime(element_string(dds[2]),
+                                              "%m.%d.%y")
+            data['publish_date'] = date
 registry.register(ForaSuite)
@@ -23,35 +23,35 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import re
-
-from BeautifulSoup import BeautifulSoup
-
 from vidscraper.suites import BaseSuite, registry
-
-
-ID_REGEX = re.compile(r'video-title|video-description|embed-video-code')
+from vidscraper.utils.html import element_string, inner_html, iterparse_html
 
 
 class GoogleSuite(BaseSuite):
     """Suite for scraping video pages from videos.google.com"""
-    video_regex = r'^https?://video.google.com/videoplay'
+    video_regex = (r'^https?://video.google.com/videoplay'
+                   r'(?:\?(?:[^#]*&)?docid=(?P<video_id>-?\d+))?')
+    canonical_video_url = u'http://video.google.com/videoplay?docid=%s'
     scrape_fields = set(['title', 'description', 'embed_code'])
 
     def get_scrape_url(self, video):
         return video.url
 
     def parse_scrape_response(self, response_text):
-        soup = BeautifulSoup(response_text).findAll(attrs={'id': ID_REGEX})
         data = {}
-        for tag in soup:
-            if tag['id'] == 'video-title':
-                data['title'] = unicode(tag.string)
-            elif tag['id'] == 'video-description':
-                data['description'] = ''.join((unicode(t) for t in tag)).strip()
-            elif tag['id'] == 'embed-video-code':
-                # This isn't the cleanest way of handling the gt/lt problem,
-                # but this is a scrape and liable to break anyway. KISS.
-                data['embed_code'] = unicode(tag.string).replace("&gt;", ">").replace("&lt;", "<")
+        field_count = len(self.scrape_fields)
+        for elt in iterparse_html(response_text):
+            elt_id = elt.get('id')
+            if elt_id == 'video-title':
+                data['title'] = element_string(elt)
+            elif elt_id == 'video-description':
+                data['description'] = inner_html(elt).strip()
+            elif elt_id == 'embed-video-code':
+                # lxml has already decoded the escaped embed code.
+                data['embed_code'] = element_string(elt)
+            else:
+                continue
+            if len(data) == field_count:
+                break
         return data
 registry.register(GoogleSuite)
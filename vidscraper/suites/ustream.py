@@ -23,16 +23,16 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import datetime
-
-from vidscraper.compat import json
+from vidscraper.compat import json_loads
 from vidscraper.suites import BaseSuite, registry
+from vidscraper.utils.timestamps import parse_datetime
 
 
 class UstreamSuite(BaseSuite):
     """Suite for fetching data on ustream videos."""
     # TODO: Ustream has feeds and search functionality - add support for that!
     video_regex = 'https?://(www\.)?ustream\.tv/recorded/(?P<id>\d+)'
+    canonical_video_url = u'http://www.ustream.tv/recorded/%s'
 
     oembed_endpoint = "http://www.ustream.tv/oembed/"
 
@@ -48,10 +48,10 @@ class UstreamSuite(BaseSuite):
                                 video_id, video.api_keys['ustream_key'])
 
     def parse_api_response(self, response_text):
-        parsed = json.loads(response_text)['results']
+        parsed = json_loads(response_text)['results']
         url = parsed['embedTagSourceUrl']
-        publish_date = datetime.datetime.strptime(parsed['createdAt'],
-                                                 '%Y-%m-%d %H:%M:%S')
+        publish_date = parse_datetime(parsed['createdAt'],
+                                      '%Y-%m-%d %H:%M:%S')
         data = {
             'link': parsed['url'],
             'title': parsed['title'],
@@ -24,23 +24,58 @@
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
 import time
-from datetime import datetime
-from xml.dom import minidom
+from StringIO import StringIO
 import re
 import urllib
-import urllib2
 import urlparse
 
+from lxml import etree
+
 try:
     import oauth2
 except ImportError:
     oauth2 = None
 
-from vidscraper.compat import json
+from vidscraper.compat import json_loads
 from vidscraper.suites import BaseSuite, registry
+from vidscraper.suites.base import _closing
+from vidscraper.utils.http import fetch_url, open_url
+from vidscraper.utils.interning import StringPool
+from vidscraper.utils.jsonstream import load_streaming
+from vidscraper.utils.timestamps import parse_datetime
 
 from vidscraper.utils.feedparser import struct_time_to_datetime
 
+
+SCRAPE_KEYS = frozenset(['url', 'caption', 'thumbnail', 'uploader_url',
+                         'uploader_display_name', 'isHD', 'embed_code',
+                         'request_signature', 'request_signature_expires',
+                         'nodeId'])
+
+
+def _parse_scrape_xml(response_text):
+    """
+    Returns a dictionary mapping each of the :data:`SCRAPE_KEYS` to the text
+    of the first element with that tag in a moogaloop clip document. The
+    document is read in a single pass, and elements are discarded as soon as
+    they have been seen.
+
+    """
+    if isinstance(response_text, unicode):
+        response_text = response_text.encode('utf8')
+    xml_data = {}
+    for event, elt in etree.iterparse(StringIO(response_text)):
+        tag = elt.tag
+        if tag in SCRAPE_KEYS and tag not in xml_data:
+            xml_data[tag] = unicode(elt.text or u'')
+            if len(xml_data) == len(SCRAPE_KEYS):
+                break
+        elt.clear()
+        while elt.getprevious() is not None:
+            del elt.getparent()[0]
+    return xml_data
+
+
 class VimeoSuite(BaseSuite):
     """
     Suite for vimeo.com. Currently supports their oembed api and simple api. No
@@ -48,6 +83,7 @@ class VimeoSuite(BaseSuite):
 
     """
     video_regex = r'https?://([^/]+\.)?vimeo.com/(?:video/)?(?P<video_id>\d+)'
+    canonical_video_url = u'http://vimeo.com/%s'
     feed_regex = (r'http://(?:www\.)?vimeo\.com/'
                   r'(?:(?P<collection>channel|group)s/)?'
                   r'(?P<name>\w+)'
@@ -61,6 +97,9 @@ class VimeoSuite(BaseSuite):
                          'embed_code', 'file_url', 'file_url_mimetype',
                          'file_url_expires'])
     oembed_endpoint = u"http://vimeo.com/api/oembed.json"
+    #: The number of seconds for which a feed's user or channel info is
+    #: cached, if the feed has a cache.
+    feed_info_timeout = 24 * 60 * 60
 
     def _embed_code_from_id(self, video_id):
         return u"""<iframe src="http://player.vimeo.com/video/%s" \
@@ -75,31 +114,46 @@ allowFullScreen></iframe>""" % video_id
         return u"http://vimeo.com/api/v2/video/%s.json" % video_id
 
     def parse_api_response(self, response_text):
-        parsed = json.loads(response_text)[0]
+        parsed = json_loads(response_text)[0]
         return self._data_from_api_video(parsed)
 
-    def _data_from_api_video(self, video):
+    def _data_from_api_video(self, video, fields=None, pool=None):
         """
         Takes a video dictionary from a vimeo API response and returns a
-        dictionary mapping field names to values.
+        dictionary mapping field names to values. ``fields`` and ``pool``
+        are as for :meth:`parse_feed_entry`.
 
         """
+        if fields is None:
+            fields = self.entry_fields
+        if pool is None:
+            pool = StringPool()
         video_id = video['id']
-        data = {
-            'title': video['title'],
-            'link': video['url'],
-            'description': video['description'],
-            'thumbnail_url': video['thumbnail_medium'],
-            'user': video['user_name'],
-            'user_url': video['user_url'],
-            'publish_datetime': datetime.strptime(video['upload_date'],
-                                             '%Y-%m-%d %H:%M:%S'),
-            'tags': [tag for tag in video['tags'].split(', ') if tag],
-            'flash_enclosure_url': self._flash_enclosure_url_from_id(video_id),
-            'embed_code': self._embed_code_from_id(video_id),
-            'guid': 'tag:vimeo,%s:clip%i' % (video['upload_date'][:10],
-                                             video['id'])
-        }
+        data = {'link': video['url']}
+        if 'title' in fields:
+            data['title'] = video['title']
+        if 'description' in fields:
+            data['description'] = video['description']
+        if 'thumbnail_url' in fields:
+            data['thumbnail_url'] = video['thumbnail_medium']
+        if 'user' in fields:
+            data['user'] = pool.intern(video['user_name'])
+        if 'user_url' in fields:
+            data['user_url'] = pool.intern(video['user_url'])
+        if 'publish_datetime' in fields:
+            data['publish_datetime'] = parse_datetime(video['upload_date'],
+                                                      '%Y-%m-%d %H:%M:%S')
+        if 'tags' in fields:
+            data['tags'] = pool.intern_list([tag for tag in
+                                             video['tags'].split(', ') if tag])
+        if 'flash_enclosure_url' in fields:
+            data['flash_enclosure_url'] = self._flash_enclosure_url_from_id(
+                video_id)
+        if 'embed_code' in fields:
+            data['embed_code'] = self._embed_code_from_id(video_id)
+        if 'guid' in fields:
+            data['guid'] = 'tag:vimeo,%s:clip%i' % (video['upload_date'][:10],
+                                                    video_id)
         return data
 
     def get_scrape_url(self, video):
@@ -107,15 +161,7 @@ allowFullScreen></iframe>""" % video_id
         return u"http://www.vimeo.com/moogaloop/load/clip:%s" % video_id
 
     def parse_scrape_response(self, response_text):
-        doc = minidom.parseString(response_text)
-        xml_data = {}
-        for key in ('url', 'caption', 'thumbnail', 'uploader_url',
-                    'uploader_display_name', 'isHD', 'embed_code',
-                    'request_signature', 'request_signature_expires',
-                    'nodeId'):
-            xml_data[key] = doc.getElementsByTagName(
-                key).item(0).firstChild.data.decode('utf8')
-
+        xml_data = _parse_scrape_xml(response_text)
         data = {
             'link': xml_data['url'],
             'user': xml_data['uploader_display_name'],
@@ -142,10 +188,10 @@ allowFullScreen></iframe>""" % video_id
     def _get_user_api_url(self, user, type):
         return 'http://vimeo.com/api/v2/%s/%s.json' % (user, type)
         
-    def get_feed_url(self, feed_url, type_override=None):
+    def _get_feed_path(self, feed_url):
         """
-        Rewrites a feed url into an api request url so that crawl can work, and
-        because more information can be retrieved from the api.
+        Returns a ``(path, type)`` tuple for the user, channel or group feed at
+        ``feed_url``.
 
         """
         groups = self.feed_regex.match(feed_url).groupdict()
@@ -153,17 +199,55 @@ allowFullScreen></iframe>""" % video_id
             path = "/".join((groups['collection'], groups['name']))
         else:
             path = groups['name']
+        return path, groups['type']
+
+    def get_feed_url(self, feed_url, type_override=None):
+        """
+        Rewrites a feed url into an api request url so that crawl can work, and
+        because more information can be retrieved from the api.
+
+        """
+        path, type = self._get_feed_path(feed_url)
         return self._get_user_api_url(path,
-                                      groups['type']
-                                      if not type_override else type_override)
+                                      type if not type_override else
+                                      type_override)
 
     def get_feed_response(self, feed, feed_url):
-        response_text = urllib2.urlopen(feed_url, timeout=5).read()
-        return json.loads(response_text)
+        """
+        Returns the decoded api response for ``feed_url``. If the ``feed`` is
+        streaming, the response's videos are decoded one at a time as they
+        are read, by a generator, and the response is closed once the
+        generator is exhausted or closed.
+
+        """
+        if getattr(feed, 'stream', False):
+            body = open_url(feed_url).body
+            try:
+                videos = load_streaming(body)
+            except Exception:
+                body.close()
+                raise
+            return _closing(videos, body)
+        return json_loads(fetch_url(feed_url).body)
 
     def get_feed_info_response(self, feed, response):
+        """
+        Fetches the info for the feed's user or channel, which is where the
+        feed's metadata lives. If the feed has a cache, the info is cached
+        per user or channel for :attr:`feed_info_timeout` seconds.
+
+        """
         info_url = self.get_feed_url(feed.original_url, type_override='info')
-        return self.get_feed_response(feed, info_url)
+        # The info is a single object, so it is never streamed.
+        if feed.cache is None:
+            return self.get_feed_response(None, info_url)
+        key = u'%s:info:%s' % (type(self).__name__,
+                               self._get_feed_path(feed.original_url)[0])
+        info = feed.cache.get(key)
+        if info is None:
+            info = self.get_feed_response(None, info_url)
+            feed.cache.set(key, info, timeout=self.feed_info_timeout)
+        return info
 
     def get_feed_title(self, feed, response):
         if 'creator_display_name' in response:
@@ -214,8 +298,8 @@ allowFullScreen></iframe>""" % video_id
     def get_feed_entries(self, feed, feed_response):
         return feed_response
 
-    def parse_feed_entry(self, entry):
-        return self._data_from_api_video(entry)
+    def parse_feed_entry(self, entry, fields=None, pool=None):
+        return self._data_from_api_video(entry, fields, pool)
 
     def get_next_feed_page_url(self, last_url, feed_response):
         # TODO: Vimeo only lets the first 3 pages of 20 results each be fetched
@@ -273,7 +357,11 @@ allowFullScreen></iframe>""" % video_id
         consumer = oauth2.Consumer(api_key, api_secret)
         client = oauth2.Client(consumer)
         request = client.request(search_url)
-        return json.loads(request[1])
+        if search.stream:
+            # The whole response has been read already, but decoding the
+            # results one at a time lets the first ones be used sooner.
+            return load_streaming(StringIO(request[1]), ('videos', 'video'))
+        return json_loads(request[1])
 
     def get_search_total_results(self, search, search_response):
         return int(search_response['videos']['total'])
@@ -281,25 +369,40 @@ allowFullScreen></iframe>""" % video_id
     def get_search_results(self, search, search_response):
         return search_response['videos']['video']
 
-    def parse_search_result(self, search, result):
+    def parse_search_result(self, search, result, fields=None, pool=None):
         # TODO: results have an embed_privacy key. What is this? Should
         # vidscraper return that information? Doesn't youtube have something
         # similar?
+        if fields is None:
+            fields = self.entry_fields
+        if pool is None:
+            pool = StringPool()
         video_id = result['id']
         data = {
-            'title': result['title'],
             'link': [u['_content'] for u in result['urls']['url']
                     if u['type'] == 'video'][0],
-            'description': result['description'],
-            'thumbnail_url': result['thumbnails']['thumbnail'][1]['_content'],
-            'user': result['owner']['realname'],
-            'user_url': result['owner']['profileurl'],
-            'publish_datetime': datetime.strptime(result['upload_date'],
-                                             '%Y-%m-%d %H:%M:%S'),
-            'tags': [t['_content']
-                            for t in result.get('tags', {}).get('tag', [])],
-            'flash_enclosure_url': self._flash_enclosure_url_from_id(video_id),
-            'embed_code': self._embed_code_from_id(video_id)
         }
+        if 'title' in fields:
+            data['title'] = result['title']
+        if 'description' in fields:
+            data['description'] = result['description']
+        if 'thumbnail_url' in fields:
+            data['thumbnail_url'] = (
+                result['thumbnails']['thumbnail'][1]['_content'])
+        if 'user' in fields:
+            data['user'] = pool.intern(result['owner']['realname'])
+        if 'user_url' in fields:
+            data['user_url'] = pool.intern(result['owner']['profileurl'])
+        if 'publish_datetime' in fields:
+            data['publish_datetime'] = parse_datetime(result['upload_date'],
+                                                      '%Y-%m-%d %H:%M:%S')
+        if 'tags' in fields:
+            data['tags'] = pool.intern_list([
+                t['_content'] for t in result.get('tags', {}).get('tag', [])])
+        if 'flash_enclosure_url' in fields:
+            data['flash_enclosure_url'] = self._flash_enclosure_url_from_id(
+                video_id)
+        if 'embed_code' in fields:
+            data['embed_code'] = self._embed_code_from_id(video_id)
         return data
 registry.register(VimeoSuite)
@@ -37,14 +37,91 @@ feedparser._FeedParserMixin.namespaces[
     'http://a9.com/-/spec/opensearch/1.1/'] = 'opensearch'
 
 from vidscraper.suites import BaseSuite, registry
+from vidscraper.utils.fastfeed import parse_gdata_feed
 from vidscraper.utils.feedparser import get_entry_thumbnail_url
 from vidscraper.utils.feedparser import struct_time_to_datetime
+from vidscraper.utils.interning import StringPool
+
+
+# The separators between the parameters of a query string, as parse_qs sees
+# them.
+_QS_SEPARATOR_RE = re.compile(r'[&;]')
+# The separators between the streams of a quoted url_encoded_fmt_stream_map.
+_STREAM_SEPARATOR_RE = re.compile(r'%2[cC]|,')
+
+# The parameters of a get_video_info response which parse_scrape_response
+# uses.
+SCRAPE_INFO_KEYS = frozenset(['status', 'title', 'author', 'thumbnail_url',
+                              'keywords', 'fmt_list',
+                              'url_encoded_fmt_stream_map'])
+
+# Matches the first <span> in the html descriptions of youtube's rss feeds.
+_SPAN_RE = re.compile(r'<span(?:\s[^>]*)?>(.*?)</span>', re.DOTALL)
+# Span text which BeautifulSoup doesn't return unchanged.
+_SPAN_FALLBACK_RE = re.compile(r'[<>&]')
+
+
+def _get_span_description(summary):
+    """
+    Returns the text of the first ``<span>`` in a youtube rss ``summary``,
+    exactly as ``unicode(BeautifulSoup(summary).findAll('span')[0].string)``
+    would, but without parsing the rest of the summary. BeautifulSoup
+    rewrites some text - it escapes bare ``&`` and ``>``, and collapses text
+    which is only whitespace - so if the span's text contains any of those,
+    or markup, this falls back to BeautifulSoup.
+
+    """
+    match = _SPAN_RE.search(summary)
+    if match is None or _SPAN_FALLBACK_RE.search(match.group(1)) or (
+            match.group(1) and not match.group(1).strip()):
+        soup = BeautifulSoup(summary).findAll('span')[0]
+        return unicode(soup.string)
+    # BeautifulSoup's ``.string`` is ``None`` for an empty tag.
+    return unicode(match.group(1) or None)
+
+
+def _parse_video_info(response_text, keys, quoted=()):
+    """
+    Parses only the given ``keys`` out of a query string, such as the one
+    returned by youtube's ``get_video_info``. Returns a dictionary mapping
+    each key which has a non-blank value to its first value, like
+    ``urlparse.parse_qs`` without unquoting all the other values. The values
+    of any ``quoted`` keys are returned without being unquoted at all.
+
+    """
+    params = {}
+    for pair in _QS_SEPARATOR_RE.split(response_text):
+        name, sep, value = pair.partition('=')
+        if not sep or not value:
+            continue
+        if '%' in name or '+' in name:
+            name = urllib.unquote_plus(name)
+        if name in keys and name not in params:
+            if name not in quoted:
+                value = urllib.unquote_plus(value)
+            params[name] = value
+    return params
+
 
 class YouTubeSuite(BaseSuite):
+    """
+    :param max_quality: See :attr:`max_quality`.
+    :param preferred_mimetypes: See :attr:`preferred_mimetypes`.
+
+    The registered suite picks from all of the :attr:`preferred_fmt_types`.
+    To limit the ``file_url`` of particular videos or feeds, pass them a
+    suite made with other preferences, rather than changing the registered
+    one; for example::
+
+        Video(url, YouTubeSuite(max_quality=360))
+
+    """
     video_regex = r'^https?://(' +\
     r'([^/]+\.)?youtube.com/(?:(?:watch)?\?(\w+=[^&]+&)*v=|(?:embed|v)/)' +\
                   r'|youtu.be/)(?P<video_id>[\w-]+)'
     feed_regex = r'^https?://([^/]+\.)?youtube.com/'
+    canonical_video_url = u'http://www.youtube.com/watch?v=%s'
+    feed_parser = staticmethod(parse_gdata_feed)
     feed_regexes = [re.compile(r) for r in (
             (r'^(http://)?(www\.)?youtube\.com/profile(_videos)?'
              r'\?(\w+=\w+&)*user=(?P<name>\w+)'),
@@ -74,6 +151,31 @@ class YouTubeSuite(BaseSuite):
         (6, u'video/x-flv'), # 480x270
         (5, u'video/x-flv'), # 400x240
         ]
+    # the height of the video for each of the fmt codes above
+    fmt_heights = {38: 3072, 37: 1080, 22: 720, 18: 360, 35: 480, 34: 360,
+                   6: 270, 5: 240}
+
+    #: The greatest height (in pixels) of video which should be picked as the
+    #: ``file_url``, or ``None`` for no limit.
+    max_quality = None
+    #: A list of mimetypes, most preferred first, which the ``file_url`` is
+    #: limited to, or ``None`` to allow any of the
+    #: :attr:`preferred_fmt_types`.
+    preferred_mimetypes = None
+
+    def __init__(self, max_quality=None, preferred_mimetypes=None):
+        super(YouTubeSuite, self).__init__()
+        self.max_quality = max_quality
+        self.preferred_mimetypes = preferred_mimetypes
+
+    def get_cache_key(self, url):
+        # Suites with different preferences pick different file urls, so
+        # they mustn't share cached data.
+        key = super(YouTubeSuite, self).get_cache_key(url)
+        if self.max_quality is None and self.preferred_mimetypes is None:
+            return key
+        return u'%s:%s:%s' % (key, self.max_quality,
+                              u','.join(self.preferred_mimetypes or ()))
 
     def get_feed_url(self, url, extra_params=None):
         for regex in self.feed_regexes:
@@ -86,50 +188,64 @@ class YouTubeSuite(BaseSuite):
             url = '%s&%s' % (url, urllib.urlencode(extra_params))
         return url
 
-    def parse_feed_entry(self, entry):
+    def parse_feed_entry(self, entry, fields=None, pool=None):
         """
         Reusable method to parse a feedparser entry from a youtube rss feed.
         Returns a dictionary mapping :class:`.Video` fields to values.
 
         """
-        user = entry['author']
-        if 'published_parsed' in entry:
-            best_date = struct_time_to_datetime(entry['published_parsed'])
-        else:
-            best_date = struct_time_to_datetime(entry['updated_parsed'])
-        if ('summary_detail' in entry and
-            entry['summary_detail']['type'] == 'text/html'):
-            # HTML-ified description in RSS feeds
-            soup = BeautifulSoup(entry['summary']).findAll('span')[0]
-            description = unicode(soup.string)
-        else:
-            description = entry['summary']
-        data = {
-            'link': entry['links'][0]['href'].split('&', 1)[0],
-            'title': entry['title'],
-            'description': description,
-            'thumbnail_url': get_entry_thumbnail_url(entry),
-            'publish_datetime': best_date,
-            'tags': [t['term'] for t in entry['tags']
-                    if not t['term'].startswith('http')],
-            'user': user,
-            'user_url': u'http://www.youtube.com/user/%s' % user,
-            'guid' : entry['id'],
-        }
-        if entry.id.startswith('tag:youtube.com'):
-            data['guid'] = 'http://gdata.youtube.com/feeds/api/videos/%s' % (
-                entry.id.split(':')[-1],)
-        if 'media_player' in entry: # not in feeds, just the API
+        if fields is None:
+            fields = self.entry_fields
+        if pool is None:
+            pool = StringPool()
+        data = {'link': entry['links'][0]['href'].split('&', 1)[0]}
+        if 'title' in fields:
+            data['title'] = entry['title']
+        if 'description' in fields:
+            if ('summary_detail' in entry and
+                entry['summary_detail']['type'] == 'text/html'):
+                # HTML-ified description in RSS feeds
+                data['description'] = _get_span_description(entry['summary'])
+            else:
+                data['description'] = entry['summary']
+        if 'thumbnail_url' in fields:
+            thumbnail_url = get_entry_thumbnail_url(entry)
+            if thumbnail_url.endswith('/default.jpg'):
+                # got a crummy version; increase the resolution
+                thumbnail_url = thumbnail_url.replace('/default.jpg',
+                                                      '/hqdefault.jpg')
+            data['thumbnail_url'] = thumbnail_url
+        if 'publish_datetime' in fields:
+            if 'published_parsed' in entry:
+                data['publish_datetime'] = struct_time_to_datetime(
+                    entry['published_parsed'])
+            else:
+                data['publish_datetime'] = struct_time_to_datetime(
+                    entry['updated_parsed'])
+        if 'tags' in fields:
+            data['tags'] = pool.intern_list([t['term'] for t in entry['tags']
+                                             if not t['term'].startswith('http')])
+        if 'user' in fields or 'user_url' in fields:
+            user = pool.intern(entry['author'])
+            data['user'] = user
+            data['user_url'] = pool.format(u'http://www.youtube.com/user/%s',
+                                           user)
+        if 'guid' in fields:
+            if entry.id.startswith('tag:youtube.com'):
+                data['guid'] = ('http://gdata.youtube.com/feeds/api/videos/%s'
+                                % entry.id.split(':')[-1])
+            else:
+                data['guid'] = entry['id']
+        if ('flash_enclosure_url' in fields and
+            'media_player' in entry): # not in feeds, just the API
             data['flash_enclosure_url'] = entry['media_player']['url']
-        if data['thumbnail_url'].endswith('/default.jpg'):
-            # got a crummy version; increase the resolution
-            data['thumbnail_url'] = data['thumbnail_url'].replace(
-                '/default.jpg', '/hqdefault.jpg')
         return data
 
     def get_feed_entry_count(self, feed, feed_response):
-        return int(feed_response.feed.get('opensearch_totalresults',
-                                          len(feed_response.entries)))
+        if 'opensearch_totalresults' in feed_response.feed:
+            return int(feed_response.feed['opensearch_totalresults'])
+        return super(YouTubeSuite, self).get_feed_entry_count(feed,
+                                                              feed_response)
 
     def get_oembed_url(self, video):
         if '/embed/' in video.url:
@@ -147,7 +263,7 @@ class YouTubeSuite(BaseSuite):
         return "http://gdata.youtube.com/feeds/api/videos/%s" % video_id
 
     def parse_api_response(self, response_text):
-        parsed = feedparser.parse(response_text)
+        parsed = self.parse_feed(response_text)
         return self.parse_feed_entry(parsed.entries[0])
 
     def get_scrape_url(self, video):
@@ -155,17 +271,48 @@ class YouTubeSuite(BaseSuite):
         return (u"http://www.youtube.com/get_video_info?video_id=%s&"
                 "el=embedded&ps=default&eurl=" % video_id)
 
-    def parse_scrape_response(self, response_text):
-        params = urlparse.parse_qs(response_text)
-        if params['status'] != ['ok']:
+    def get_preferred_fmt_types(self, max_quality=None,
+                                preferred_mimetypes=None):
+        """
+        Returns the ``(fmt, mimetype)`` pairs which may be picked as the
+        ``file_url``, most preferred first: the :attr:`preferred_fmt_types`,
+        limited by ``max_quality`` and ``preferred_mimetypes``, which default
+        to the suite's :attr:`max_quality` and :attr:`preferred_mimetypes`.
+
+        """
+        if max_quality is None:
+            max_quality = self.max_quality
+        if preferred_mimetypes is None:
+            preferred_mimetypes = self.preferred_mimetypes
+        fmt_types = self.preferred_fmt_types
+        if max_quality is not None:
+            fmt_types = [(fmt, mimetype) for fmt, mimetype in fmt_types
+                         if self.fmt_heights.get(fmt, 0) <= max_quality]
+        if preferred_mimetypes is not None:
+            fmt_types = [(fmt, mimetype)
+                         for preferred in preferred_mimetypes
+                         for fmt, mimetype in fmt_types
+                         if mimetype == preferred]
+        return fmt_types
+
+    def parse_scrape_response(self, response_text, max_quality=None,
+                              preferred_mimetypes=None):
+        """
+        Parses a get_video_info response. ``max_quality`` and
+        ``preferred_mimetypes`` are as for :meth:`get_preferred_fmt_types`.
+
+        """
+        params = _parse_video_info(response_text, SCRAPE_INFO_KEYS,
+                                   quoted=('url_encoded_fmt_stream_map',))
+        if params['status'] != 'ok':
             return {}
         data = {
-            'title': params['title'][0].decode('utf8'),
-            'user': params['author'][0].decode('utf8'),
+            'title': params['title'].decode('utf8'),
+            'user': params['author'].decode('utf8'),
             'user_url': u'http://www.youtube.com/user/%s' % (
-                params['author'][0].decode('utf8')),
-            'thumbnail_url': params['thumbnail_url'][0],
-            'tags': params['keywords'][0].decode('utf8').split(','),
+                params['author'].decode('utf8')),
+            'thumbnail_url': params['thumbnail_url'],
+            'tags': params['keywords'].decode('utf8').split(','),
             'file_url': None,
             'file_url_mimetype': None,
             'file_url_expires': None,
@@ -175,26 +322,31 @@ class YouTubeSuite(BaseSuite):
             data['thumbnail_url'] = data['thumbnail_url'].replace(
                 '/default.jpg', '/hqdefault.jpg')
 
-        # fmt_url_map is a comma separated list of pipe separated
-        # pairs of fmt, url
         # build the format codes.
         fmt_list = [int(x.split('/')[0])
-                    for x in params['fmt_list'][0].split(',')]
-        # build the list of available urls.
-        fmt_url_map = params["url_encoded_fmt_stream_map"][0].split(",")
-        # strip url= from url=xxxxxx, strip trailer.
-        fmt_url_map = [urllib.unquote_plus(x[4:]).split(';')[0]
-                       for x in fmt_url_map]
-        # now build the actual fmt_url_map ...
-        fmt_url_map = dict(zip(fmt_list, fmt_url_map))
-        for fmt, mimetype in self.preferred_fmt_types:
-            if fmt in fmt_url_map and fmt_url_map[fmt].startswith('http'):
-                data['file_url'] = file_url = fmt_url_map[fmt]
-                data['file_url_mimetype'] = mimetype
-                parsed_url = urlparse.urlparse(file_url)
-                file_url_qs = urlparse.parse_qs(parsed_url.query)
-                data['file_url_expires'] = struct_time_to_datetime(
-                    time.gmtime(int(file_url_qs['expire'][0])))
+                    for x in params['fmt_list'].split(',')]
+        # url_encoded_fmt_stream_map is a comma separated list of encoded
+        # streams, in the same order as the format codes. They're only
+        # decoded when their format is the one being considered.
+        streams = _STREAM_SEPARATOR_RE.split(
+            params['url_encoded_fmt_stream_map'])
+        fmt_url_map = dict(zip(fmt_list, streams))
+        for fmt, mimetype in self.get_preferred_fmt_types(
+                max_quality, preferred_mimetypes):
+            if fmt not in fmt_url_map:
+                continue
+            # strip url= from url=xxxxxx, strip trailer.
+            stream = urllib.unquote_plus(fmt_url_map[fmt])
+            file_url = urllib.unquote_plus(stream[4:]).split(';')[0]
+            if not file_url.startswith('http'):
+                continue
+            data['file_url'] = file_url
+            data['file_url_mimetype'] = mimetype
+            file_url_qs = _parse_video_info(urlparse.urlparse(file_url).query,
+                                            ('expire',))
+            data['file_url_expires'] = struct_time_to_datetime(
+                time.gmtime(int(file_url_qs['expire'])))
+            break
         return data
             
     def get_search_url(self, search, order_by=None, extra_params=None):
@@ -85,6 +85,30 @@ class BlipApiTestCase(BlipTestCase):
     def test_get_api_url(self):
         self._test_video_api_url(self.video)
 
+    def test_get_video_id(self):
+        self.assertEqual(self.suite.get_video_id(self.base_url), '4167881')
+        self.assertEqual(
+            self.suite.get_video_id("%s/?skin=json" % self.base_url),
+            '4167881')
+        self.assertEqual(
+            self.suite.get_video_id('http://blip.tv/file/1077145/'), None)
+        self.assertEqual(
+            self.suite.get_video_id('http://blip.tv/play/AYH%2Bsi0C.html'),
+            None)
+
+    def test_canonical_url(self):
+        canonical = self.suite.canonical_url(self.base_url)
+        self.assertEqual(canonical, u'http://blip.tv/a/a-4167881')
+        self.assertEqual(
+            self.suite.canonical_url("%s/?skin=json" % self.base_url),
+            canonical)
+        self.assertEqual(self.suite.get_video_id(canonical), '4167881')
+        video = self.suite.get_video(url=canonical)
+        self.assertEqual(urlparse.urlparse(self.suite.get_api_url(video))[2],
+                         '/rss/4167881')
+        old_url = 'http://blip.tv/file/1077145/'
+        self.assertEqual(self.suite.canonical_url(old_url), old_url)
+
     def test_get_api_url_play_url(self):
         video = self.suite.get_video(url="http://blip.tv/play/AYH%2Bsi0C.html")
         self._test_video_api_url(video)
@@ -171,11 +195,38 @@ class BlipFeedTestCase(BlipTestCase):
         self.assertTrue(isinstance(data, dict))
         self._check_disqus_data(data)
 
+    def test_parse_entry_fields(self):
+        response = self.suite.get_feed_response(self.feed, self.feed_data)
+        entries = self.suite.get_feed_entries(self.feed, response)
+        data = self.suite.parse_feed_entry(entries[1])
+        projected = self.suite.parse_feed_entry(
+            entries[1], fields=frozenset(['link', 'user', 'tags']))
+        self.assertEqual(projected, {'link': data['link'],
+                                     'user': data['user'],
+                                     'tags': data['tags']})
+
     def test_parse_feed(self):
         self.assertEqual(len(list(self.feed)), 77)
         for video in self.feed:
             self.assertTrue(isinstance(video, Video))
 
+    def test_parse_feed_interned(self):
+        videos = list(self.feed)
+        self.assertEqual(videos[0].user, videos[1].user)
+        self.assertTrue(videos[0].user is videos[1].user)
+        self.assertTrue(videos[0].user_url is videos[1].user_url)
+
+    def test_iter_batches(self):
+        batches = list(self.feed.iter_batches())
+        self.assertEqual(len(batches), 1)
+        batch = batches[0]
+        self.assertEqual(len(batch), 77)
+        self.assertEqual(batch.page, 1)
+        videos = list(self.feed)
+        for field in ('link', 'title', 'publish_datetime', 'tags', 'index'):
+            self.assertEqual(batch.column(field),
+                             [getattr(video, field) for video in videos])
+
     def test_next_feed_page_url(self):
         # get_next_feed_page_url expects ``feed``, ``feed_response`` arguments.
         # feed_response is a feedparser response.
@@ -0,0 +1,397 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import zlib
+
+from vidscraper.compat import json
+from vidscraper.suites import BaseSuite, Video
+from vidscraper.suites.youtube import YouTubeSuite
+from vidscraper.utils.cache import (CacheEntry, MemoryCache, SqliteCache,
+                                    TwoTierCache)
+
+
+class CountingSuite(BaseSuite):
+    """A suite which counts its fetches instead of touching the network."""
+    video_regex = r'^http://example.com/(?P<video_id>\d+)'
+    canonical_video_url = u'http://example.com/%s'
+    api_fields = set(['title', 'user'])
+
+    def __init__(self):
+        super(CountingSuite, self).__init__()
+        self.fetches = 0
+        self.error = None
+        self.title = u'Fresh'
+        self.release = None
+
+    def _run_methods(self, video, methods):
+        self.fetches += 1
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        data = {'title': self.title, 'user': u'someone'}
+        self.apply_video_data(video, data)
+        return data
+
+
+class CacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = CountingSuite()
+        self.url = 'http://example.com/1?feature=share'
+
+    def get_video(self, cache, fields=None):
+        return self.suite.get_video(self.url, fields=fields, cache=cache)
+
+    def set_expired(self, cache, value):
+        key = self.suite.get_cache_key(self.url)
+        cache.set_entry(key, CacheEntry(value, timeout=0))
+
+
+class CachedLoadTestCase(CacheTestCase):
+    def test_cache_key(self):
+        self.assertEqual(self.suite.get_cache_key(self.url),
+                         self.suite.get_cache_key('http://example.com/1'))
+
+    def test_no_cache(self):
+        video = self.get_video(None)
+        video.load()
+        self.assertEqual(video.title, u'Fresh')
+        self.assertEqual(video.cache_age, None)
+
+    def test_cache_hit(self):
+        cache = MemoryCache()
+        self.get_video(cache).load()
+        video = self.get_video(cache)
+        video.load()
+        self.assertEqual(self.suite.fetches, 1)
+        self.assertEqual(video.title, u'Fresh')
+        self.assertFalse(video.stale)
+        self.assertNotEqual(video.cache_age, None)
+
+    def test_partial_hit(self):
+        cache = MemoryCache()
+        cache.set(self.suite.get_cache_key(self.url), {'title': u'Cached'})
+        video = self.get_video(cache, fields=['title'])
+        video.load()
+        self.assertEqual(self.suite.fetches, 0)
+        self.assertEqual(video.title, u'Cached')
+        video = self.get_video(cache, fields=['title', 'user'])
+        video.load()
+        self.assertEqual(self.suite.fetches, 1)
+        self.assertEqual(video.user, u'someone')
+
+    def test_expired(self):
+        cache = MemoryCache()
+        self.set_expired(cache, {'title': u'Stale', 'user': u'someone'})
+        video = self.get_video(cache)
+        video.load()
+        self.assertEqual(self.suite.fetches, 1)
+        self.assertEqual(video.title, u'Fresh')
+        self.assertEqual(video.cache_age, None)
+
+
+    def test_merge_keeps_age(self):
+        cache = MemoryCache()
+        key = self.suite.get_cache_key(self.url)
+        created = time.time() - 3000
+        cache.set_entry(key, CacheEntry({'file_url': u'http://example.com/f',
+                                         'title': u'Old'}, created))
+        self.suite.cache_video_data(cache, self.url, {'title': u'New'})
+        entry = cache.get_entry(key)
+        self.assertEqual(entry.value, {'file_url': u'http://example.com/f',
+                                       'title': u'New'})
+        self.assertEqual(entry.created, created)
+        # Data which replaces every cached field starts a fresh entry.
+        self.suite.cache_video_data(cache, self.url,
+                                    {'file_url': u'http://example.com/g',
+                                     'title': u'Newer'})
+        self.assertTrue(cache.get_entry(key).created > created)
+
+
+    def test_stats(self):
+        cache = MemoryCache()
+        self.get_video(cache).load()
+        self.get_video(cache).load()
+        # Storing the fetched data doesn't count as a lookup.
+        self.assertEqual(cache.stats(),
+                         {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+
+class StaleWhileRevalidateTestCase(CacheTestCase):
+    def test_serves_stale(self):
+        cache = MemoryCache(stale_while_revalidate=60)
+        self.set_expired(cache, {'title': u'Stale', 'user': u'someone'})
+        self.suite.release = threading.Event()
+        video = self.get_video(cache)
+        video.load()
+        self.assertEqual(video.title, u'Stale')
+        self.assertTrue(video.stale)
+        self.assertNotEqual(video.cache_age, None)
+
+        # Only a single refresh runs at a time for a video.
+        key = self.suite.get_cache_key(self.url)
+        self.assertTrue(cache.is_refreshing(key))
+        self.get_video(cache).load()
+        self.suite.release.set()
+        while cache.is_refreshing(key):
+            time.sleep(0.01)
+        self.assertEqual(self.suite.fetches, 1)
+
+        video = self.get_video(cache)
+        video.load()
+        self.assertEqual(video.title, u'Fresh')
+        self.assertFalse(video.stale)
+
+    def test_stale_if_error(self):
+        cache = MemoryCache(stale_if_error=60)
+        self.set_expired(cache, {'title': u'Stale', 'user': u'someone'})
+        self.suite.error = IOError()
+        video = self.get_video(cache)
+        video.load()
+        self.assertEqual(video.title, u'Stale')
+        self.assertTrue(video.stale)
+
+    def test_error_without_stale(self):
+        cache = MemoryCache()
+        self.set_expired(cache, {'title': u'Stale', 'user': u'someone'})
+        self.suite.error = IOError()
+        self.assertRaises(IOError, self.get_video(cache).load)
+
+    def test_error_with_partial_fresh_entry(self):
+        for cache in (MemoryCache(), MemoryCache(stale_if_error=60)):
+            cache.set(self.suite.get_cache_key(self.url), {'title': u'Cached'})
+            self.suite.error = IOError()
+            video = self.get_video(cache, fields=['title', 'user'])
+            self.assertRaises(IOError, video.load)
+
+
+class OfflineYouTubeSuite(YouTubeSuite):
+    def _run_methods(self, video, methods):
+        raise AssertionError("%s made a request" % video.url)
+
+
+class FeedWarmingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = OfflineYouTubeSuite()
+        self.cache = MemoryCache()
+        data_file = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                 'data', 'youtube', 'feed.atom')
+        self.feed = self.suite.get_feed(
+            'http://www.youtube.com/user/AssociatedPress', cache=self.cache)
+        self.feed._first_response = self.suite.get_feed_response(
+            self.feed, open(data_file).read())
+
+    def test_feed_warms_cache(self):
+        videos = list(self.feed)
+        self.assertTrue(videos)
+        self.assertTrue(all(video.cache is self.cache for video in videos))
+        video = self.suite.get_video(
+            'http://youtu.be/w_eGBcd--HU', cache=self.cache,
+            fields=['title', 'user', 'thumbnail_url', 'tags'])
+        video.load()
+        self.assertEqual(video.title, u'Getting It Straight With the Straits')
+        self.assertEqual(video.user, u'AssociatedPress')
+        self.assertFalse(video.stale)
+
+    def test_no_none_values(self):
+        list(self.feed)
+        entry = self.cache.get_entry(
+            self.suite.get_cache_key('http://youtu.be/w_eGBcd--HU'))
+        self.assertFalse(None in entry.value.values())
+
+    def test_batches_warm_cache(self):
+        batches = list(self.feed.iter_batches())
+        self.assertTrue(batches)
+        entry = self.cache.get_entry(
+            self.suite.get_cache_key('http://youtu.be/w_eGBcd--HU'))
+        self.assertEqual(entry.value['title'],
+                         u'Getting It Straight With the Straits')
+        self.assertFalse('index' in entry.value)
+
+
+class MemoryCacheTestCase(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = MemoryCache(max_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.get('b'), None)
+        self.assertEqual(cache.stats(),
+                         {'hits': 2, 'misses': 1, 'hit_ratio': 2 / 3.0})
+
+
+class SqliteCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tempdir, 'cache.sqlite')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_round_trip(self):
+        cache = SqliteCache(self.path)
+        value = {'title': u'T\xedtulo', 'tags': [u'a', u'b'],
+                 'publish_datetime': datetime.datetime(2011, 1, 1, 12)}
+        cache.set(u'key', value)
+        self.assertEqual(cache.get(u'key'), value)
+        cache.delete(u'key')
+        self.assertEqual(cache.get(u'key'), None)
+
+    def test_video_data_json(self):
+        cache = SqliteCache(self.path)
+        video = Video('http://www.youtube.com/watch?v=J_DV9b0x7v4')
+        video.title = u'T\xedtulo'
+        video.tags = [u'a', u'b']
+        video.publish_datetime = datetime.datetime(2011, 1, 1, 12)
+        video.index = 3
+        data = video.to_dict()
+        del data['url'], data['suite']
+        value = dict(data, publish_datetime=video.publish_datetime)
+        cache.set(u'key', value)
+        stored = str(cache._get_connection().execute(
+            'SELECT value FROM entries').fetchone()[0])
+        self.assertEqual(json.loads(zlib.decompress(stored[1:])), data)
+        self.assertEqual(cache.get(u'key'), value)
+
+    def test_pickled_values(self):
+        cache = SqliteCache(self.path)
+        values = [('url', {'etag': 'x'}, zlib.compress('body')),
+                  {'feed': {'title': u'Title'}},
+                  {'publish_datetime': u'2011-01-01'},
+                  {'title': '\xff'}]
+        for i, value in enumerate(values):
+            cache.set(str(i), value)
+        for i, value in enumerate(values):
+            self.assertEqual(cache.get(str(i)), value)
+
+    def test_shared(self):
+        SqliteCache(self.path).set('key', u'value')
+        self.assertEqual(SqliteCache(self.path).get('key'), u'value')
+
+    def test_compressed(self):
+        cache = SqliteCache(self.path)
+        cache.set('key', u'x' * 10000)
+        self.assertTrue(cache.size() < 1000)
+
+    def test_cull(self):
+        cache = SqliteCache(self.path, max_size=2500, cull_frequency=1)
+        for i in range(10):
+            cache.set_entry(str(i), CacheEntry(os.urandom(1000), created=i))
+        self.assertTrue(cache.size() <= 2500)
+        self.assertEqual(cache.get_entry('0'), None)
+        self.assertNotEqual(cache.get_entry('9'), None)
+
+
+class TwoTierCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        path = os.path.join(self.tempdir, 'cache.sqlite')
+        self.disk = SqliteCache(path)
+        self.cache = TwoTierCache(MemoryCache(max_entries=10), self.disk)
+        # Stands in for another worker process sharing the disk tier.
+        self.other = TwoTierCache(MemoryCache(max_entries=10),
+                                  SqliteCache(path))
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_shared_disk_tier(self):
+        self.other.set('key', u'value')
+        self.assertEqual(self.cache.get('key'), u'value')
+        self.assertEqual(self.cache.get('key'), u'value')
+        stats = self.cache.stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['memory']['hits'], 1)
+        self.assertEqual(stats['memory']['misses'], 1)
+        self.assertEqual(stats['disk']['hits'], 1)
+
+    def test_expired_memory_entry(self):
+        self.cache.set('key', u'old', timeout=0)
+        self.other.set('key', u'new')
+        self.assertEqual(self.cache.get('key'), u'new')
+
+
+class PagedSearchSuite(BaseSuite):
+    """A suite with three pages of search results and no network access."""
+    video_regex = r'^http://example.com/(?P<video_id>\d+)'
+
+    def __init__(self):
+        super(PagedSearchSuite, self).__init__()
+        self.fetched_pages = []
+
+    def get_search_url(self, search):
+        return 'page:1'
+
+    def get_search_response(self, search, search_url):
+        page = int(search_url.split(':')[1])
+        self.fetched_pages.append(page)
+        return {'page': page}
+
+    def get_search_total_results(self, search, search_response):
+        return 3
+
+    def get_search_results(self, search, search_response):
+        return [search_response['page']]
+
+    def parse_search_result(self, search, result):
+        return {'link': 'http://example.com/%i' % result,
+                'title': u'Result %i' % result}
+
+    def get_next_search_page_url(self, search, search_response):
+        if search_response['page'] < 3:
+            return 'page:%i' % (search_response['page'] + 1)
+
+
+class SearchCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = PagedSearchSuite()
+        self.cache = MemoryCache()
+
+    def search(self, query):
+        return [video.title for video in self.suite.get_search(
+                query, crawl=True, cache=self.cache)]
+
+    def test_normalized_query(self):
+        self.assertEqual(self.search('parrot norwegian -dead'),
+                         [u'Result 1', u'Result 2', u'Result 3'])
+        self.assertEqual(self.search('-dead norwegian  parrot'),
+                         [u'Result 1', u'Result 2', u'Result 3'])
+        # The first two pages were served from the cache.
+        self.assertEqual(self.suite.fetched_pages, [1, 2, 3, 3])
+
+    def test_different_query(self):
+        self.search('parrot')
+        self.search('parrot -dead')
+        self.assertEqual(self.suite.fetched_pages, [1, 2, 3, 1, 2, 3])
@@ -0,0 +1,244 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import glob
+import os
+from StringIO import StringIO
+import unittest
+
+import feedparser
+from lxml import etree
+
+from vidscraper.suites import base
+from vidscraper.suites.blip import BlipSuite
+from vidscraper.suites.youtube import YouTubeSuite
+from vidscraper.utils import fastfeed
+
+
+DATA_DIR = os.path.join(os.path.abspath(os.path.dirname(
+                        os.path.dirname(__file__))), 'data')
+
+FEED_METHODS = ('get_feed_title', 'get_feed_entry_count',
+                'get_feed_description', 'get_feed_webpage', 'get_feed_guid',
+                'get_feed_thumbnail_url', 'get_feed_last_modified',
+                'get_feed_etag')
+
+
+def _call(method, *args):
+    # Returns the result of a call, or the type of the exception it raised,
+    # so that failures can be compared as well.
+    try:
+        return method(*args)
+    except Exception, e:
+        return type(e)
+
+
+class FastFeedEquivalenceTestCase(unittest.TestCase):
+    """
+    Checks that suites get the same data from the fast parsers as from
+    feedparser, for every feed document in the test data.
+
+    """
+    def _get_fixtures(self):
+        paths = (glob.glob(os.path.join(DATA_DIR, '*', '*.rss')) +
+                 glob.glob(os.path.join(DATA_DIR, '*', '*.atom')))
+        self.assertTrue(paths)
+        return sorted(paths)
+
+    def _check_equivalent(self, suite):
+        for path in self._get_fixtures():
+            text = open(path).read()
+            expected = feedparser.parse(text)
+            response = fastfeed.parse(text, suite.feed_parser)
+            for name in FEED_METHODS:
+                method = getattr(suite, name)
+                self.assertEqual(_call(method, None, response),
+                                 _call(method, None, expected),
+                                 '%s: %s' % (path, name))
+            self.assertEqual(len(response.entries), len(expected.entries))
+            for entry, expected_entry in zip(response.entries,
+                                             expected.entries):
+                self.assertEqual(_call(suite.parse_feed_entry, entry),
+                                 _call(suite.parse_feed_entry,
+                                       expected_entry),
+                                 path)
+
+    def test_youtube(self):
+        self._check_equivalent(YouTubeSuite())
+
+    def test_blip(self):
+        self._check_equivalent(BlipSuite())
+
+
+class FastFeedTestCase(unittest.TestCase):
+    def _read(self, *path):
+        return open(os.path.join(DATA_DIR, *path)).read()
+
+    def test_parse_gdata_feed(self):
+        for name in ('feed.atom', 'search.atom', 'api.atom'):
+            version, feed, entries = fastfeed.parse_gdata_feed(
+                self._read('youtube', name))
+            self.assertTrue(entries)
+        self.assertRaises(fastfeed.UnexpectedFeedError,
+                          fastfeed.parse_gdata_feed,
+                          self._read('blip', 'feed.rss'))
+        self.assertRaises(fastfeed.UnexpectedFeedError,
+                          fastfeed.parse_gdata_feed,
+                          self._read('feed', 'feed.atom'))
+
+    def test_parse_blip_feed(self):
+        version, feed, entries = fastfeed.parse_blip_feed(
+            self._read('blip', 'feed.rss'))
+        self.assertEqual(len(entries), 77)
+        self.assertRaises(fastfeed.UnexpectedFeedError,
+                          fastfeed.parse_blip_feed,
+                          self._read('youtube', 'feed.atom'))
+
+    def test_parse_fallback(self):
+        # Documents which the fast parser doesn't recognize, including ones
+        # which aren't well-formed xml, are handed to feedparser.
+        for name in ('feed.atom', 'feed_with_media_player.atom'):
+            text = self._read('feed', name)
+            response = fastfeed.parse(text, fastfeed.parse_gdata_feed)
+            expected = feedparser.parse(text)
+            self.assertEqual(response.version, expected.version)
+            self.assertEqual(response.entries, expected.entries)
+
+    def test_parse_headers(self):
+        response = fastfeed.parse(self._read('youtube', 'feed.atom'),
+                                  fastfeed.parse_gdata_feed,
+                                  {'ETag': '"abc"'})
+        self.assertEqual(response.bozo, 0)
+        self.assertEqual(response.etag, '"abc"')
+        self.assertEqual(response.headers, {'etag': '"abc"'})
+
+    def test_suite_parse_feed(self):
+        suite = YouTubeSuite()
+        text = self._read('youtube', 'search.atom')
+        response = suite.get_feed_response(None, text)
+        self.assertEqual(response.version, u'atom10')
+        self.assertEqual(len(response.entries), 25)
+        # Without a feed_parser, suites use feedparser.
+        suite.feed_parser = None
+        self.assertEqual(suite.parse_feed(text), feedparser.parse(text))
+
+
+class FastFeedStreamingTestCase(unittest.TestCase):
+    def _path(self, *path):
+        return os.path.join(DATA_DIR, *path)
+
+    def test_iterparse(self):
+        for parser, name in ((fastfeed.parse_gdata_feed, 'youtube'),
+                             (fastfeed.parse_blip_feed, 'blip')):
+            paths = sorted(glob.glob(self._path(name, '*.rss')) +
+                           glob.glob(self._path(name, '*.atom')))
+            for path in paths:
+                expected = fastfeed.parse(open(path).read(), parser)
+                response = fastfeed.iterparse(open(path, 'rb'), parser)
+                self.assertEqual(response.version, expected.version, path)
+                self.assertEqual(response.feed, expected.feed, path)
+                self.assertEqual(list(response.entries), expected.entries,
+                                 path)
+
+    def test_iterparse_generator(self):
+        response = fastfeed.iterparse(open(self._path('blip', 'feed.rss')),
+                                      fastfeed.parse_blip_feed)
+        self.assertFalse(isinstance(response.entries, list))
+        self.assertEqual(len(list(response.entries)), 77)
+        self.assertEqual(list(response.entries), [])
+
+    def test_iterparse_fallback(self):
+        text = open(self._path('feed', 'feed.atom')).read()
+        response = fastfeed.iterparse(StringIO(text),
+                                      fastfeed.parse_gdata_feed)
+        self.assertEqual(response.entries, feedparser.parse(text).entries)
+
+    def test_iterparse_truncated(self):
+        # Entries before the point where the document breaks are still
+        # yielded, and then the error is raised.
+        text = open(self._path('blip', 'feed.rss')).read()
+        text = text[:text.index('<item', text.index('</item>'))] + '<item><'
+        response = fastfeed.iterparse(StringIO(text),
+                                      fastfeed.parse_blip_feed)
+        entries = []
+        try:
+            for entry in response.entries:
+                entries.append(entry)
+        except etree.XMLSyntaxError:
+            pass
+        else:
+            self.fail('XMLSyntaxError not raised')
+        self.assertEqual(len(entries), 1)
+
+    def test_iterparse_entry_fallback(self):
+        # An entry which the fast parser can't handle is parsed by
+        # feedparser, and the entries after it are still yielded.
+        text = open(self._path('blip', 'feed.rss')).read()
+        start = text.index('<title>', text.index('<item'))
+        end = text.index('</title>', start)
+        text = (text[:start] + '<title>&lt;b&gt;Bold&lt;/b&gt; title' +
+                text[end:])
+        expected = feedparser.parse(text)
+        response = fastfeed.iterparse(StringIO(text),
+                                      fastfeed.parse_blip_feed)
+        entries = list(response.entries)
+        self.assertEqual(len(entries), 77)
+        self.assertEqual(entries[0]['title'], expected.entries[0]['title'])
+        suite = BlipSuite()
+        self.assertEqual(
+            [suite.parse_feed_entry(entry) for entry in entries],
+            [suite.parse_feed_entry(entry) for entry in expected.entries])
+
+    def test_stream_feed(self):
+        suite = BlipSuite()
+        path = self._path('blip', 'feed.rss')
+        for url in (path, 'file://' + path, open(path).read()):
+            response = suite.stream_feed(url)
+            self.assertEqual(len(list(response.entries)), 77)
+
+    def test_stream_feed_closes(self):
+        fileobj = StringIO('')
+        entries = base._closing(iter([1, 2]), fileobj)
+        self.assertEqual(entries.next(), 1)
+        self.assertFalse(fileobj.closed)
+        entries.close()
+        self.assertTrue(fileobj.closed)
+        fileobj = StringIO('')
+        self.assertEqual(list(base._closing(iter([1, 2]), fileobj)), [1, 2])
+        self.assertTrue(fileobj.closed)
+
+    def test_streaming_video_feed(self):
+        suite = BlipSuite()
+        path = self._path('blip', 'feed.rss')
+        expected = suite.get_feed('http://blip.tv/djangocon/rss')
+        expected._first_response = suite.get_feed_response(
+            expected, open(path).read())
+        feed = suite.get_feed('http://blip.tv/djangocon/rss', stream=True)
+        feed.url = path
+        videos = [(video.url, video.title) for video in feed]
+        self.assertEqual(videos, [(video.url, video.title)
+                                  for video in expected])
+        # Streaming feeds are refetched for each iteration.
+        self.assertEqual(len(list(feed)), len(videos))
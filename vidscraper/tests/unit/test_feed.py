@@ -163,6 +163,27 @@ h.264</p>""")
              'thumbnail_url': None,
              'publish_datetime': datetime.datetime(2005, 7, 15, 12, 0)})
 
+    def test_parse_feed_entry_fields(self):
+        fp = feedparser.parse(os.path.join(self.data_file_dir,
+                                           'feed.atom'))
+        data = self.suite.parse_feed_entry(fp.entries[0])
+        for fields in (['link'], ['link', 'guid'],
+                       ['link', 'title', 'file_url_length', 'tags']):
+            projected = self.suite.parse_feed_entry(fp.entries[0],
+                                                    fields=frozenset(fields))
+            self.assertEqual(projected,
+                             dict((field, data[field]) for field in fields))
+
+    def test_feed_fields(self):
+        feed = self.suite.get_feed(
+            'file://%s' % os.path.join(self.data_file_dir, 'feed.rss'),
+            fields=['guid'])
+        video = iter(feed).next()
+        self.assertEqual(video.fields, ['guid'])
+        self.assertEqual(video.url,
+            'http://www.archive.org/details/SFGTV_20111020_130000')
+        self.assertTrue(video.title is None)
+
     def test_parse_feed_media_player(self):
         fp = feedparser.parse(os.path.join(self.data_file_dir,
                                            'feed_with_media_player.atom'))
@@ -52,6 +52,12 @@ class ForaScrapeTestCase(ForaTestCase):
     def test_get_scrape_url(self):
         self.assertEqual(self.suite.get_scrape_url(self.video), self.base_url)
 
+    def test_canonical_url(self):
+        url = self.base_url.replace('http://', 'https://www.')
+        self.assertEqual(self.suite.get_video_id(url),
+            '2011/08/08/Cradle_of_Gold_Hiram_Bingham_and_Machu_Picchu')
+        self.assertEqual(self.suite.canonical_url(url), self.base_url)
+
     def test_parse_scrape_response(self):
         scrape_file = open(os.path.join(self.data_file_dir, 'scrape.html'))
         data = self.suite.parse_scrape_response(scrape_file.read())
@@ -95,3 +101,11 @@ class ForaScrapeTestCase(ForaTestCase):
             "Contemporary Black History at Columbia University. He is "
             "recognized as one of the most forceful and outspoken scholars of "
             "African-American history and race relations in the United States.")
+
+    def test_parse_scrape_response_stops_early(self):
+        # Once every field has been found, the rest of the page is ignored.
+        scrape_file = open(os.path.join(self.data_file_dir, 'scrape.html'))
+        page = scrape_file.read()
+        expected = self.suite.parse_scrape_response(page)
+        page += '<dd class="description">Ignored</dd>' * 1000
+        self.assertEqual(self.suite.parse_scrape_response(page), expected)
@@ -51,6 +51,11 @@ class GoogleScrapeTestCase(GoogleTestCase):
     def test_get_scrape_url(self):
         self.assertEqual(self.suite.get_scrape_url(self.video), self.base_url)
 
+    def test_canonical_url(self):
+        url = "http://video.google.com/videoplay?hl=en&docid=3372610739323185039"
+        self.assertEqual(self.suite.get_video_id(url), '3372610739323185039')
+        self.assertEqual(self.suite.canonical_url(url), self.base_url)
+
     def test_parse_scrape_response(self):
         scrape_file = open(os.path.join(self.data_file_dir, 'scrape.html'))
         data = self.suite.parse_scrape_response(scrape_file.read())
@@ -67,3 +72,10 @@ allowScriptAccess="always" type="application/x-shockwave-flash"> </embed>"""
         for key in expected_data:
             self.assertTrue(key in data)
             self.assertEqual(data[key], expected_data[key])
+
+    def test_parse_scrape_response_stops_early(self):
+        scrape_file = open(os.path.join(self.data_file_dir, 'scrape.html'))
+        page = scrape_file.read()
+        expected = self.suite.parse_scrape_response(page)
+        page += '<div id=video-title>Ignored</div>' * 1000
+        self.assertEqual(self.suite.parse_scrape_response(page), expected)
@@ -0,0 +1,102 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from BeautifulSoup import BeautifulStoneSoup
+
+from vidscraper.utils import html
+from vidscraper.utils.html import convert_entities
+
+
+TRICKY_ENTITIES = (
+    u'',
+    u'Plain title',
+    u'Tom &amp; Jerry',
+    u'Tom & Jerry',
+    u'AT&T',
+    u'AT&T rocks',
+    u'AT&amp;T',
+    u'&lt;b&gt;bold&lt;/b&gt;',
+    u'caf&eacute; &nbsp;&copy;',
+    u'&eacute',
+    u'&eacute!',
+    u'&nbsp',
+    u'&#65;&#66&#67',
+    u'&#65;&#66;x',
+    u'&#x41; &#X41;',
+    u'&#0;',
+    u'&#;',
+    u'&#',
+    u'&',
+    u'a & b > c',
+    u'&apos;quoted&apos;',
+    u'&quot;quoted&quot;',
+    u'&carol; &Carol;',
+    u'&amp.',
+    u'&gt.&x1',
+    u'&a-b; &a.b; &a_b;',
+    u'&amp;amp;',
+    u'&amp;foo;',
+    u'   ',
+    u' \n ',
+    u'&#32;&#10;',
+    u'\u2603 &hearts; \u2603',
+    'ascii &amp; bytes',
+    'caf\xc3\xa9 &amp; bytes',
+)
+
+
+def _soup_convert(text):
+    return unicode(
+        BeautifulStoneSoup(text,
+                           convertEntities=BeautifulStoneSoup.HTML_ENTITIES))
+
+
+class ConvertEntitiesTestCase(unittest.TestCase):
+    def setUp(self):
+        html._converted.clear()
+
+    def test_equivalent(self):
+        for text in TRICKY_ENTITIES:
+            self.assertEqual(convert_entities(text), _soup_convert(text),
+                             repr(text))
+
+    def test_markup(self):
+        for text in (u'<b>Tom &amp; Jerry</b>',
+                     u'<embed src="http://example.com/?a=1&amp;b=2"/>',
+                     u'1 < 2 &amp; 3'):
+            self.assertEqual(convert_entities(text), _soup_convert(text),
+                             repr(text))
+
+    def test_invalid_charref(self):
+        self.assertRaises(ValueError, convert_entities, u'&#1114112;')
+
+    def test_memo(self):
+        converted = convert_entities(u'Tom &amp; Jerry')
+        self.assertTrue(convert_entities(u'Tom &amp; Jerry') is converted)
+        for i in xrange(html._CONVERTED_MAX + 1):
+            convert_entities(u'&#%d;' % (i + 32))
+        self.assertTrue(len(html._converted) <= html._CONVERTED_MAX)
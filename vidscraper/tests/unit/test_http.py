@@ -0,0 +1,149 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import BaseHTTPServer
+import threading
+import unittest
+
+from lxml.etree import ParserError
+
+from vidscraper.utils import http
+from vidscraper.utils.cache import MemoryCache
+from vidscraper.utils.http import (DESCRIPTION_CLEANER, clean_description_html,
+                                   fetch_url, get_freshness_lifetime,
+                                   set_response_cache)
+
+
+class CachingHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    headers_for_path = {
+        '/max-age': {'Cache-Control': 'public, max-age=60'},
+        '/etag': {'Cache-Control': 'no-cache', 'ETag': '"abc"'},
+        '/no-store': {'Cache-Control': 'no-store', 'ETag': '"abc"'},
+    }
+
+    def do_GET(self):
+        self.server.requests.append((self.path, dict(self.headers)))
+        if self.headers.get('If-None-Match') == '"abc"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        for name, value in self.headers_for_path[self.path].items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write('body for %s' % self.path)
+
+    def log_message(self, *args):
+        pass
+
+
+class FetchUrlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = BaseHTTPServer.HTTPServer(('127.0.0.1', 0),
+                                                CachingHandler)
+        self.server.requests = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.base_url = 'http://127.0.0.1:%i' % self.server.server_port
+        set_response_cache(MemoryCache())
+
+    def tearDown(self):
+        set_response_cache(None)
+        self.server.shutdown()
+        self.server.server_close()
+
+    def fetch_twice(self, path):
+        first = fetch_url(self.base_url + path)
+        second = fetch_url(self.base_url + path)
+        self.assertEqual(first.body, 'body for %s' % path)
+        self.assertEqual(second.body, first.body)
+        return [headers for p, headers in self.server.requests]
+
+    def test_max_age(self):
+        self.assertEqual(len(self.fetch_twice('/max-age')), 1)
+
+    def test_etag_revalidation(self):
+        requests = self.fetch_twice('/etag')
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1].get('if-none-match'), '"abc"')
+
+    def test_no_store(self):
+        requests = self.fetch_twice('/no-store')
+        self.assertEqual(len(requests), 2)
+        self.assertFalse('if-none-match' in requests[1])
+
+    def test_no_cache_set(self):
+        set_response_cache(None)
+        self.assertEqual(len(self.fetch_twice('/max-age')), 2)
+
+
+class FreshnessLifetimeTestCase(unittest.TestCase):
+    def test_freshness_lifetime(self):
+        self.assertEqual(get_freshness_lifetime({}), 0)
+        self.assertEqual(get_freshness_lifetime(
+                {'cache-control': 'private, max-age=300'}), 300)
+        self.assertEqual(get_freshness_lifetime(
+                {'cache-control': 'no-store, max-age=300'}), None)
+        self.assertEqual(get_freshness_lifetime(
+                {'date': 'Tue, 15 Nov 1994 08:12:31 GMT',
+                 'expires': 'Tue, 15 Nov 1994 09:12:31 GMT'}), 3600)
+        self.assertEqual(get_freshness_lifetime(
+                {'cache-control': 'max-age=10',
+                 'expires': 'Tue, 15 Nov 1994 09:12:31 GMT'}), 10)
+
+
+class CleanDescriptionHtmlTestCase(unittest.TestCase):
+    descriptions = (
+        u'Plain text',
+        '  Leading whitespace and a trailing newline\n',
+        u'Caf\xe9 \u2603 -> "quotes" \'and\' more\r\n',
+        u'\ufeffByte order mark',
+        u'Control\x00\x0bcharacters',
+        u'Tom & Jerry',
+        u'Tom &amp; Jerry',
+        u'<p>Already a paragraph</p>',
+        u'Mixed <b>markup</b><img src="x.jpg"/><script>evil()</script>',
+        'caf\xc3\xa9 bytes',
+    )
+
+    def setUp(self):
+        http._cleaned.clear()
+
+    def test_equivalent(self):
+        for description in self.descriptions:
+            self.assertEqual(clean_description_html(description),
+                             DESCRIPTION_CLEANER.clean_html(description),
+                             repr(description))
+
+    def test_empty(self):
+        self.assertEqual(clean_description_html(u''), u'')
+        self.assertEqual(clean_description_html(None), None)
+        self.assertRaises(ParserError, clean_description_html, u' \n')
+
+    def test_cache(self):
+        cleaned = clean_description_html(u'<b>bold</b>')
+        self.assertTrue(clean_description_html(u'<b>bold</b>') is cleaned)
+
@@ -0,0 +1,69 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import unittest
+
+from vidscraper.utils.interning import StringPool
+
+
+class StringPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pool = StringPool()
+
+    def test_intern(self):
+        first = u''.join([u'Associated', u'Press'])
+        second = u''.join([u'Associated', u'Press'])
+        self.assertFalse(first is second)
+        self.assertTrue(self.pool.intern(first) is first)
+        self.assertTrue(self.pool.intern(second) is first)
+        self.assertEqual(len(self.pool), 1)
+
+    def test_intern_none(self):
+        self.assertEqual(self.pool.intern(None), None)
+        self.assertEqual(len(self.pool), 0)
+
+    def test_intern_type(self):
+        self.pool.intern(u'video/mp4')
+        value = self.pool.intern('video/mp4')
+        self.assertEqual(value, 'video/mp4')
+        self.assertTrue(isinstance(value, str))
+        self.assertTrue(isinstance(self.pool.intern(u'video/mp4'), unicode))
+
+    def test_intern_list(self):
+        tags = self.pool.intern_list([u'django', u'python'])
+        more = self.pool.intern_list([u''.join([u'py', u'thon'])])
+        self.assertEqual(more, [u'python'])
+        self.assertTrue(more[0] is tags[1])
+
+    def test_format(self):
+        template = u'http://www.youtube.com/user/%s'
+        first = self.pool.format(template, u'AssociatedPress')
+        self.assertEqual(first, u'http://www.youtube.com/user/AssociatedPress')
+        self.assertTrue(self.pool.format(template, u'AssociatedPress')
+                        is first)
+        self.assertTrue(
+            self.pool.intern(u'http://www.youtube.com/user/AssociatedPress')
+            is first)
+
@@ -0,0 +1,103 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from StringIO import StringIO
+import os
+import unittest
+
+from vidscraper import compat
+from vidscraper.compat import json, json_loads, set_json_backend
+from vidscraper.utils.jsonstream import load_streaming
+
+
+DATA_DIR = os.path.join(os.path.abspath(os.path.dirname(
+                        os.path.dirname(__file__))), 'data', 'vimeo')
+
+
+class JsonBackendTestCase(unittest.TestCase):
+    def tearDown(self):
+        set_json_backend()
+
+    def test_backends(self):
+        text = open(os.path.join(DATA_DIR, 'search.json')).read()
+        expected = json.loads(text)
+        for backend, make_loads in compat.JSON_BACKENDS:
+            try:
+                set_json_backend(backend)
+            except ImportError:
+                continue
+            self.assertEqual(compat.json_backend, backend)
+            self.assertEqual(json_loads(text), expected)
+            self.assertTrue(isinstance(json_loads('["ascii"]')[0], unicode))
+            self.assertRaises(ValueError, json_loads, '[1,')
+
+    def test_unknown_backend(self):
+        self.assertRaises(ValueError, set_json_backend, 'nonexistent')
+
+
+class LoadStreamingTestCase(unittest.TestCase):
+    def test_array(self):
+        text = open(os.path.join(DATA_DIR, 'feed.json')).read()
+        for chunk_size in (1, 7, 1024, 64 * 1024):
+            entries = load_streaming(StringIO(text), chunk_size=chunk_size)
+            self.assertFalse(isinstance(entries, list))
+            self.assertEqual(list(entries), json.loads(text))
+
+    def test_path(self):
+        text = open(os.path.join(DATA_DIR, 'search.json')).read()
+        expected = json.loads(text)
+        response = load_streaming(StringIO(text), ('videos', 'video'),
+                                  chunk_size=100)
+        self.assertEqual(response['stat'], expected['stat'])
+        self.assertEqual(response['videos']['total'],
+                         expected['videos']['total'])
+        self.assertEqual(list(response['videos']['video']),
+                         expected['videos']['video'])
+
+    def test_split_values(self):
+        # Values which are cut off at the end of a chunk are read in full.
+        text = u'[12345, 1.5e10, -0.25, "\u2603\\u00e9", true, null, []]'
+        for chunk_size in xrange(1, 10):
+            self.assertEqual(
+                list(load_streaming(StringIO(text.encode('utf-8')),
+                                    chunk_size=chunk_size)),
+                json.loads(text))
+
+    def test_lazy(self):
+        # Items are yielded before the rest of the document is read.
+        entries = load_streaming(StringIO('[{"a": 1}, {"b": 2}, oops'),
+                                 chunk_size=4)
+        self.assertEqual(entries.next(), {u'a': 1})
+        self.assertEqual(entries.next(), {u'b': 2})
+        self.assertRaises(ValueError, entries.next)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, load_streaming, StringIO('{"a": []}'))
+        self.assertRaises(ValueError, load_streaming, StringIO(''))
+        self.assertEqual(load_streaming(StringIO('{"a": 1}'), ('b',)),
+                         {u'a': 1})
+        for text in ('[1 2]', '[1,]', '[1,'):
+            self.assertRaises(ValueError, list,
+                              load_streaming(StringIO(text)))
@@ -0,0 +1,118 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+import unittest
+
+from vidscraper.suites import BaseSuite
+from vidscraper.utils.refresh import FileUrlRefresher
+
+
+class ScrapingSuite(BaseSuite):
+    """A suite whose scrapes push each video's expiry back by an hour."""
+    video_regex = r'^http://example.com/(?P<video_id>\d+)'
+    scrape_fields = set(['file_url', 'file_url_expires'])
+
+    def __init__(self):
+        super(ScrapingSuite, self).__init__()
+        self.scraped = []
+        self.fail = set()
+        self.unsupported = set()
+        self.stuck = set()
+
+    def _run_methods(self, video, methods):
+        self.scraped.append((video.url, methods))
+        if video.url in self.fail:
+            raise IOError
+        if video.url in self.unsupported:
+            raise NotImplementedError
+        if video.url in self.stuck:
+            return {}
+        data = {'file_url': video.url + '/new',
+                'file_url_expires': (video.file_url_expires +
+                                     datetime.timedelta(hours=1))}
+        self.apply_video_data(video, data)
+        return data
+
+
+class FileUrlRefresherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = ScrapingSuite()
+        self.now = datetime.datetime(2012, 1, 1, 12, 0, 0)
+        self.videos = []
+        for i in range(5):
+            video = self.suite.get_video('http://example.com/%i' % i)
+            video.file_url_expires = self.now + datetime.timedelta(minutes=i)
+            self.videos.append(video)
+        self.refresher = FileUrlRefresher(
+            self.videos, lead_time=datetime.timedelta(minutes=2),
+            max_concurrent=2)
+
+    def test_ignores_unexpiring_videos(self):
+        video = self.suite.get_video('http://example.com/9')
+        self.assertFalse(self.refresher.add(video))
+        self.assertEqual(len(self.refresher), 5)
+
+    def test_next_refresh(self):
+        self.assertEqual(self.refresher.next_refresh(),
+                         self.now - datetime.timedelta(minutes=2))
+
+    def test_run_pending(self):
+        refreshed = self.refresher.run_pending(self.now)
+        self.assertEqual(refreshed, self.videos[:3])
+        self.assertEqual(sorted(self.suite.scraped),
+                         [(video.url, ['scrape'])
+                          for video in self.videos[:3]])
+        self.assertEqual(self.videos[0].file_url, 'http://example.com/0/new')
+        self.assertEqual(self.videos[3].file_url, None)
+        # The refreshed videos are back in the heap with their new expiry.
+        self.assertEqual(len(self.refresher), 5)
+        self.assertEqual(self.refresher.next_refresh(),
+                         self.now + datetime.timedelta(minutes=1))
+
+    def test_retry_failed(self):
+        self.suite.fail.add(self.videos[0].url)
+        refreshed = self.refresher.run_pending(self.now)
+        self.assertEqual(refreshed, self.videos[1:3])
+        self.assertEqual(len(self.refresher), 5)
+        self.assertEqual(self.refresher.pop_due(self.now), [])
+        due = self.refresher.pop_due(self.now + datetime.timedelta(minutes=1))
+        self.assertTrue(self.videos[0] in due)
+
+    def test_drop_unsupported(self):
+        self.suite.unsupported.add(self.videos[0].url)
+        refreshed = self.refresher.run_pending(self.now)
+        self.assertEqual(refreshed, self.videos[1:3])
+        self.assertEqual(self.refresher.dropped, [self.videos[0]])
+        self.assertEqual(len(self.refresher), 4)
+
+    def test_expiry_not_moved(self):
+        self.suite.stuck.add(self.videos[0].url)
+        refreshed = self.refresher.run_pending(self.now)
+        self.assertEqual(refreshed, self.videos[:3])
+        self.assertEqual(len(self.refresher), 5)
+        self.assertEqual(self.refresher.pop_due(self.now), [])
+        due = self.refresher.pop_due(self.now + datetime.timedelta(minutes=1))
+        self.assertTrue(self.videos[0] in due)
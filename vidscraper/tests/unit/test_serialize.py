@@ -0,0 +1,135 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+from StringIO import StringIO
+import unittest
+
+from vidscraper.suites import Video, registry
+from vidscraper.suites.youtube import YouTubeSuite
+from vidscraper.utils import serialize
+
+
+class UTCOffset(datetime.tzinfo):
+    def __init__(self, hours):
+        self.offset = datetime.timedelta(hours=hours)
+
+    def utcoffset(self, dt):
+        return self.offset
+
+    def dst(self, dt):
+        return datetime.timedelta(0)
+
+
+class SerializeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = registry.suite_for_name('YouTubeSuite')
+        self.url = 'http://www.youtube.com/watch?v=J_DV9b0x7v4'
+
+    def make_video(self, fields=None):
+        video = Video(self.url, self.suite, fields=fields)
+        video.title = u'Title \u2603'
+        video.publish_datetime = datetime.datetime(2011, 10, 19, 16, 48, 31)
+        video.file_url_expires = datetime.datetime(2011, 10, 20, 0, 0, 0, 5)
+        video.tags = [u'one', u'two']
+        video.is_embeddable = True
+        video.index = 4
+        return video
+
+    def assertVideosEqual(self, video1, video2):
+        self.assertEqual(video1.url, video2.url)
+        self.assertTrue(video1.suite is video2.suite)
+        self.assertEqual(video1.fields, video2.fields)
+        for field in Video._all_fields:
+            self.assertEqual(getattr(video1, field), getattr(video2, field))
+
+    def test_suite_for_name(self):
+        self.assertTrue(isinstance(self.suite, YouTubeSuite))
+        self.assertRaises(ValueError, registry.suite_for_name, 'Bogus')
+
+    def test_to_dict(self):
+        data = self.make_video().to_dict()
+        self.assertEqual(data, {
+            'url': self.url,
+            'suite': 'YouTubeSuite',
+            'title': u'Title \u2603',
+            'publish_datetime': '2011-10-19T16:48:31',
+            'file_url_expires': '2011-10-20T00:00:00.000005',
+            'tags': [u'one', u'two'],
+            'is_embeddable': True,
+            'index': 4})
+        data = self.make_video(fields=['title', 'tags']).to_dict()
+        self.assertEqual(data['fields'], ['title', 'tags'])
+
+    def test_to_dict_timezone(self):
+        video = self.make_video()
+        video.publish_datetime = datetime.datetime(2011, 10, 19, 18, 48, 31,
+                                                   tzinfo=UTCOffset(2))
+        self.assertEqual(video.to_dict()['publish_datetime'],
+                         '2011-10-19T16:48:31')
+
+    def test_from_dict(self):
+        for fields in (None, ['title', 'user']):
+            video = self.make_video(fields)
+            unserialized = Video.from_dict(video.to_dict())
+            self.assertVideosEqual(unserialized, video)
+            self.assertEqual(unserialized.missing_fields,
+                             video.missing_fields)
+
+    def test_from_dict_suite(self):
+        suite = YouTubeSuite()
+        video = Video.from_dict({'url': self.url}, suite=suite)
+        self.assertTrue(video.suite is suite)
+        video = Video.from_dict({'url': self.url})
+        self.assertTrue(video.suite is self.suite)
+        video = Video.from_dict({'url': self.url, 'suite': 'BogusSuite'})
+        self.assertTrue(video.suite is self.suite)
+
+    def test_jsonl(self):
+        videos = [self.make_video(), self.make_video(['title']),
+                  Video(self.url, self.suite)]
+        output = StringIO()
+        self.assertEqual(serialize.dump_jsonl(videos, output), 3)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+        output.seek(0)
+        unserialized = list(serialize.iter_jsonl(output))
+        self.assertEqual(len(unserialized), 3)
+        for video1, video2 in zip(unserialized, videos):
+            self.assertVideosEqual(video1, video2)
+
+    @unittest.skipIf(serialize.msgpack is None, 'msgpack is not installed')
+    def test_msgpack(self):
+        videos = [self.make_video(), self.make_video(['title'])]
+        output = StringIO()
+        self.assertEqual(serialize.dump_msgpack(videos, output), 2)
+        output.seek(0)
+        unserialized = list(serialize.iter_msgpack(output))
+        self.assertEqual(len(unserialized), 2)
+        for video1, video2 in zip(unserialized, videos):
+            self.assertVideosEqual(video1, video2)
+
+    @unittest.skipIf(serialize.msgpack is not None, 'msgpack is installed')
+    def test_msgpack_missing(self):
+        self.assertRaises(ImportError, serialize.dump_msgpack, [], StringIO())
@@ -0,0 +1,108 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+import unittest
+
+from feedparser import _parse_date
+
+from vidscraper.utils import timestamps
+from vidscraper.utils.timestamps import parse_datetime, parse_isoformat, \
+                                        parse_rfc822, parse_w3dtf
+
+
+FEED_TIMESTAMPS = (
+    '2011-10-19T16:50:10.000Z',
+    '2011-10-19T16:50:10Z',
+    '2011-10-19T16:50:10+02:00',
+    '2011-10-19T16:50:10.5-05:30',
+    '2011-12-31T23:59:59-01:00',
+    'Wed, 19 Oct 2011 16:48:31 +0000',
+    'Wed, 19 Oct 2011 16:48:31 GMT',
+    '19 Oct 2011 16:48:31 -0700',
+    'Sat, 31 Dec 2011 23:30:00 -0100',
+)
+
+
+class ParseDatetimeTestCase(unittest.TestCase):
+    def setUp(self):
+        timestamps._parsed.clear()
+
+    def test_equivalent(self):
+        for text, format in (('2011-10-19 16:48:31', '%Y-%m-%d %H:%M:%S'),
+                             ('2011-10-19T16:48:31Z', '%Y-%m-%dT%H:%M:%SZ'),
+                             ('2011-10-19', '%Y-%m-%d'),
+                             ('2011-1-9 6:48:31', '%Y-%m-%d %H:%M:%S')):
+            self.assertEqual(parse_datetime(text, format),
+                             datetime.datetime.strptime(text, format))
+
+    def test_invalid(self):
+        for text in ('2011-13-19 16:48:31', '2011-02-30 16:48:31',
+                     '2011-10-19 16:48:61', '2011-10-19 16:48:31Z', ''):
+            self.assertRaises(ValueError, parse_datetime, text,
+                              '%Y-%m-%d %H:%M:%S')
+
+    def test_memo(self):
+        parsed = parse_datetime('2011-10-19 16:48:31', '%Y-%m-%d %H:%M:%S')
+        self.assertTrue(parse_datetime('2011-10-19 16:48:31',
+                                       '%Y-%m-%d %H:%M:%S') is parsed)
+        for i in xrange(timestamps._PARSED_MAX + 1):
+            parse_datetime('2011-10-19 %02d:%02d:%02d' % (
+                i // 3600 % 24, i // 60 % 60, i % 60), '%Y-%m-%d %H:%M:%S')
+        self.assertTrue(len(timestamps._parsed['%Y-%m-%d %H:%M:%S']) <=
+                        timestamps._PARSED_MAX)
+
+
+class ParseFeedTimestampTestCase(unittest.TestCase):
+    def setUp(self):
+        timestamps._parsed.clear()
+
+    def test_equivalent(self):
+        for text in FEED_TIMESTAMPS:
+            parsed = parse_w3dtf(text) or parse_rfc822(text)
+            self.assertEqual(parsed, _parse_date(text), text)
+
+    def test_not_handled(self):
+        # These are left to feedparser.
+        for text in ('2011-10-19', '2011-10-19T16:50:10',
+                     'Wed, 9 Oct 2011 16:48:31 +0000',
+                     'Wed, 19 Oct 2011 16:48:31 EST',
+                     'Wed, 19 Oct 0011 16:48:31 +0000',
+                     '2011-02-30T16:50:10Z'):
+            self.assertTrue(parse_w3dtf(text) is None, text)
+            self.assertTrue(parse_rfc822(text) is None, text)
+
+
+class ParseIsoformatTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        for value in (datetime.datetime(2011, 10, 19, 16, 48, 31),
+                      datetime.datetime(2011, 10, 19, 16, 48, 31, 5),
+                      datetime.datetime(1, 1, 1)):
+            self.assertEqual(parse_isoformat(value.isoformat()), value)
+
+    def test_invalid(self):
+        for text in ('2011-10-19', '2011-10-19 16:48:31',
+                     '2011-10-19T16:48:31+00:00', '2011-13-19T16:48:31'):
+            self.assertRaises(ValueError, parse_isoformat, text)
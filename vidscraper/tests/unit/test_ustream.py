@@ -50,6 +50,11 @@ class UstreamApiTestCase(UstreamTestCase):
         self.video = self.suite.get_video(self.base_url,
                                           api_keys={'ustream_key': 'TEST_KEY'})
 
+    def test_canonical_url(self):
+        url = "https://ustream.tv/recorded/16417223"
+        self.assertEqual(self.suite.get_video_id(url), '16417223')
+        self.assertEqual(self.suite.canonical_url(url), self.base_url)
+
     def test_get_oembed_url(self):
         url = self.suite.get_oembed_url(self.video)
         self.assertEqual(url, "http://www.ustream.tv/oembed/?url=http%3A%2F%2Fwww.ustream.tv%2Frecorded%2F16417223")
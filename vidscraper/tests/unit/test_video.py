@@ -0,0 +1,288 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import csv
+import datetime
+import os
+import pickle
+from StringIO import StringIO
+import unittest
+import weakref
+
+from vidscraper.compat import json
+from vidscraper.suites import (BaseSuite, Video, VideoBatch, VideoFeed,
+                               VideoSearch, registry)
+from vidscraper.suites import base
+from vidscraper.suites.base import _get_parse_kwargs
+from vidscraper.utils.cache import MemoryCache
+from vidscraper.utils.interning import StringPool
+
+
+class ExampleSuite(BaseSuite):
+    video_regex = r'^http://example.com/(?P<video_id>\d+)'
+
+
+class VideoTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = ExampleSuite()
+        self.url = 'http://example.com/1'
+
+    def test_fields(self):
+        video = Video(self.url, self.suite)
+        self.assertEqual(video.fields, list(Video._all_fields))
+        video = Video(self.url, self.suite, fields=['title', 'bogus', 'user'])
+        self.assertEqual(video.fields, ['title', 'user'])
+        self.assertEqual(tuple(video.fields), ('title', 'user'))
+
+    def test_fields_shared(self):
+        video1 = Video(self.url, self.suite, fields=['title', 'user'])
+        video2 = Video(self.url, self.suite, fields=('title', 'user'))
+        self.assertTrue(video1._fields is video2._fields)
+        self.assertTrue(Video(self.url, self.suite)._fields is
+                        Video(self.url, self.suite)._fields)
+
+    def test_fields_list(self):
+        video = Video(self.url, self.suite, fields=['title'])
+        self.assertTrue(isinstance(video.fields, list))
+        self.assertTrue(video.fields is video.fields)
+        video.user = u'someone'
+        video.fields.append('user')
+        video.fields.append('tags')
+        self.assertEqual(video.fields, ['title', 'user', 'tags'])
+        self.assertEqual(video.missing_fields, ['title', 'tags'])
+        video.fields.remove('tags')
+        self.suite.apply_video_data(video, {'title': u'Title',
+                                            'tags': [u'tag']})
+        self.assertEqual(video.tags, None)
+        self.assertEqual(video.missing_fields, [])
+
+    def test_field_sets_bounded(self):
+        for i in xrange(base._FIELD_SETS_MAX + 1):
+            Video(self.url, self.suite, fields=['title'] * (i + 1))
+        self.assertTrue(len(base._field_sets) <= base._FIELD_SETS_MAX)
+
+    def test_attributes(self):
+        video = Video(self.url, self.suite)
+        self.assertTrue(video.title is None)
+        video.extra = 1
+        self.assertEqual(video.extra, 1)
+        self.assertEqual(pickle.loads(pickle.dumps(video, 2)).extra, 1)
+        self.assertTrue(weakref.ref(video)() is video)
+
+    def test_missing_fields(self):
+        video = Video(self.url, self.suite, fields=['title', 'user', 'tags'])
+        self.assertEqual(video.missing_fields, ['title', 'user', 'tags'])
+        video.user = u'someone'
+        video.description = u'Not requested'
+        self.assertEqual(video.missing_fields, ['title', 'tags'])
+        video.title = u'Title'
+        video.tags = []
+        self.assertEqual(video.missing_fields, [])
+        video.title = None
+        self.assertEqual(video.missing_fields, ['title'])
+
+    def test_set_fields(self):
+        video = Video(self.url, self.suite, fields=['title'])
+        video.user = u'someone'
+        video.fields = ['title', 'user', 'tags']
+        self.assertEqual(video.missing_fields, ['title', 'tags'])
+
+    def test_pickle(self):
+        video = Video(self.url, self.suite, fields=['title', 'user'])
+        video.title = u'Title'
+        video.index = 3
+        for protocol in (0, 2):
+            unpickled = pickle.loads(pickle.dumps(video, protocol))
+            self.assertEqual(unpickled.url, self.url)
+            self.assertTrue(unpickled._fields is video._fields)
+            self.assertEqual(unpickled.title, u'Title')
+            self.assertEqual(unpickled.index, 3)
+            self.assertEqual(unpickled.missing_fields, ['user'])
+            self.assertFalse(unpickled.is_loaded())
+
+
+class PickleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = registry.suite_for_name('YouTubeSuite')
+        self.url = 'http://www.youtube.com/watch?v=J_DV9b0x7v4'
+        test_dir = os.path.dirname(os.path.dirname(os.path.abspath(
+            __file__)))
+        self.feed_url = 'file://%s' % os.path.join(test_dir, 'data', 'feed',
+                                                   'feed.rss')
+
+    def test_video_registered_suite(self):
+        video = Video(self.url, self.suite, cache=MemoryCache())
+        video.title = u'Title'
+        pickled = pickle.dumps(video, 2)
+        self.assertFalse('video_regex' in pickled)
+        unpickled = pickle.loads(pickled)
+        self.assertTrue(unpickled.suite is self.suite)
+        self.assertTrue(unpickled.cache is None)
+        self.assertEqual(unpickled.title, u'Title')
+        self.assertEqual(unpickled.api_keys, {})
+
+    def test_video_unregistered_suite(self):
+        suite = ExampleSuite()
+        video = Video('http://example.com/1', suite)
+        unpickled = pickle.loads(pickle.dumps(video, 2))
+        self.assertTrue(isinstance(unpickled.suite, ExampleSuite))
+        self.assertFalse(unpickled.suite is suite)
+
+    def test_feed(self):
+        feed = VideoFeed(self.feed_url, cache=MemoryCache())
+        feed.load()
+        self.assertTrue(feed._first_response is not None)
+        pickled = pickle.dumps(feed, 2)
+        self.assertFalse('SFGTV' in pickled)
+        unpickled = pickle.loads(pickled)
+        self.assertTrue(unpickled.suite is feed.suite)
+        self.assertTrue(unpickled._first_response is None)
+        self.assertTrue(unpickled.cache is None)
+        self.assertEqual(unpickled.title, feed.title)
+        self.assertEqual([video.link for video in unpickled],
+                         [video.link for video in feed])
+
+    def test_search(self):
+        search = VideoSearch('vidscraper -spam', self.suite,
+                             fields=['title'], order_by='latest')
+        unpickled = pickle.loads(pickle.dumps(search, 2))
+        self.assertTrue(unpickled.suite is self.suite)
+        self.assertEqual(unpickled.query, search.query)
+        self.assertEqual(unpickled.exclude_terms, search.exclude_terms)
+        self.assertEqual(unpickled.fields, ['title'])
+        self.assertEqual(unpickled.order_by, 'latest')
+
+
+class OldStyleSuite(ExampleSuite):
+    """A suite whose item parser predates the fields and pool arguments."""
+    def parse_feed_entry(self, entry):
+        return {'link': entry['link'], 'title': entry['title']}
+
+
+class ParseKeywordsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.pool = StringPool()
+        self.fields = frozenset(['link', 'title'])
+
+    def test_accepted(self):
+        method = registry.suite_for_name('BlipSuite').parse_feed_entry
+        self.assertEqual(_get_parse_kwargs(method, self.fields, self.pool),
+                         {'fields': self.fields, 'pool': self.pool})
+        self.assertEqual(_get_parse_kwargs(method, None, self.pool),
+                         {'pool': self.pool})
+
+    def test_old_style(self):
+        suite = OldStyleSuite()
+        self.assertEqual(_get_parse_kwargs(suite.parse_feed_entry,
+                                           self.fields, self.pool), {})
+        entry = {'link': u'http://example.com/1', 'title': u'Title'}
+        self.assertEqual(suite.parse_search_result(None, entry,
+                                                   fields=self.fields,
+                                                   pool=self.pool),
+                         entry)
+
+    def test_varkw(self):
+        def parse_feed_entry(entry, **kwargs):
+            return kwargs
+        self.assertEqual(_get_parse_kwargs(parse_feed_entry, self.fields,
+                                           self.pool),
+                         {'fields': self.fields, 'pool': self.pool})
+
+
+class VideoBatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.batch = VideoBatch(['title', 'publish_datetime', 'tags', 'user',
+                                 'index'])
+        for i, (day, user) in enumerate(((1, u'a'), (2, u'b'), (None, u'a'),
+                                         (3, None))):
+            self.batch.append({
+                'link': u'http://example.com/%i' % i,
+                'title': u'Video \u2603 %i' % i,
+                'publish_datetime': (datetime.datetime(2011, 10, day, 12)
+                                     if day is not None else None),
+                'tags': [u'one', u'two, three'],
+                'user': user,
+                'index': i + 1,
+                'description': u'Not stored',
+            })
+
+    def test_columns(self):
+        batch = self.batch
+        self.assertEqual(len(batch), 4)
+        self.assertEqual(batch.fields[0], 'link')
+        self.assertFalse('description' in batch.columns)
+        self.assertEqual(batch.columns['index'].typecode, 'l')
+        self.assertEqual(batch.column('index'), [1, 2, 3, 4])
+        self.assertEqual(batch.column('publish_datetime'), [
+            datetime.datetime(2011, 10, 1, 12),
+            datetime.datetime(2011, 10, 2, 12), None,
+            datetime.datetime(2011, 10, 3, 12)])
+        self.assertEqual(batch.column('user'), [u'a', u'b', u'a', None])
+
+    def test_interned(self):
+        users = self.batch.columns['user']
+        self.assertTrue(users[0] is users[2])
+        tags = self.batch.columns['tags']
+        self.assertTrue(tags[0][0] is tags[1][0])
+
+    def test_published_between(self):
+        batch = self.batch.published_between(
+            start=datetime.datetime(2011, 10, 2),
+            end=datetime.datetime(2011, 10, 3, 12))
+        self.assertEqual(batch.column('index'), [2])
+        self.assertEqual(batch.column('title'), [u'Video \u2603 1'])
+        batch = self.batch.published_between(
+            end=datetime.datetime(2011, 10, 3))
+        self.assertEqual(batch.column('index'), [1, 2])
+        self.assertEqual(len(self.batch.published_between()), 3)
+        self.assertRaises(ValueError,
+                          VideoBatch(['title']).published_between)
+
+    def test_to_csv(self):
+        output = StringIO()
+        self.batch.to_csv(output)
+        rows = list(csv.reader(StringIO(output.getvalue())))
+        self.assertEqual(rows[0], list(self.batch.fields))
+        self.assertEqual(len(rows), 5)
+        row = dict(zip(rows[0], rows[1]))
+        self.assertEqual(row['title'].decode('utf-8'), u'Video \u2603 0')
+        self.assertEqual(row['publish_datetime'], '2011-10-01T12:00:00')
+        self.assertEqual(json.loads(row['tags']), [u'one', u'two, three'])
+        self.assertEqual(dict(zip(rows[0], rows[3]))['publish_datetime'], '')
+
+    def test_to_jsonl(self):
+        output = StringIO()
+        self.batch.to_jsonl(output)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        row = json.loads(lines[0])
+        self.assertEqual(row, {
+            'link': u'http://example.com/0',
+            'title': u'Video \u2603 0',
+            'publish_datetime': u'2011-10-01T12:00:00',
+            'tags': [u'one', u'two, three'],
+            'user': u'a',
+            'index': 1})
+        self.assertTrue(json.loads(lines[2])['publish_datetime'] is None)
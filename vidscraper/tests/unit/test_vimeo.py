@@ -25,11 +25,16 @@
 
 import datetime
 import os
+from StringIO import StringIO
 import unittest
 import urlparse
 
 from vidscraper.compat import json
+from vidscraper.suites import vimeo
 from vidscraper.suites.vimeo import VimeoSuite
+from vidscraper.utils.cache import MemoryCache
+from vidscraper.utils.http import HttpResponse
+from vidscraper.utils.jsonstream import load_streaming
 
 
 class VimeoTestCase(unittest.TestCase):
@@ -55,6 +60,12 @@ class VimeoSuiteTestCase(VimeoTestCase):
                  'file_url', 'thumbnail_url', 'link',
                  'user', 'guid', 'tags', 'file_url_expires']))
 
+    def test_get_video_id(self):
+        for url in ('http://vimeo.com/2', 'https://www.vimeo.com/video/2',
+                    'http://player.vimeo.com/video/2?title=0&byline=0'):
+            self.assertEqual(self.suite.get_video_id(url), '2')
+            self.assertEqual(self.suite.canonical_url(url), self.base_url)
+
 class VimeoOembedTestCase(VimeoTestCase):
     def test_get_oembed_url(self):
         url = self.suite.get_oembed_url(self.video)
@@ -137,6 +148,16 @@ class VimeoScrapeTestCase(VimeoTestCase):
         for key in data:
             self.assertEqual(data[key], expected_data[key])
 
+    def test_parse_scrape_response_unicode(self):
+        scrape_file = open(os.path.join(self.data_file_dir, 'scrape.xml'))
+        response_text = scrape_file.read().replace(
+            '<caption>Good morning, universe</caption>',
+            u'<caption>Guten Morgen, \xfcniversum</caption>'.encode('utf8'),
+            1)
+        data = self.suite.parse_scrape_response(response_text)
+        self.assertEqual(data['title'], u'Guten Morgen, \xfcniversum')
+        self.assertEqual(data['link'], u'http://vimeo.com/2')
+
 class VimeoFeedTestCase(VimeoTestCase):
     def setUp(self):
         VimeoTestCase.setUp(self)
@@ -162,6 +183,52 @@ class VimeoFeedTestCase(VimeoTestCase):
             self.suite.get_feed_title(self.feed, self.info_response),
             "Jake Lodwick's videos on Vimeo")
 
+    def test_get_feed_info_response_cached(self):
+        requested = []
+        def get_feed_response(feed, feed_url):
+            requested.append(feed_url)
+            return self.info_response
+        self.suite.get_feed_response = get_feed_response
+        cache = MemoryCache()
+        for url in ('http://vimeo.com/jakob/videos/rss',
+                    'http://vimeo.com/jakob/likes'):
+            feed = self.suite.get_feed(url, cache=cache)
+            self.assertEqual(
+                self.suite.get_feed_info_response(feed, None),
+                self.info_response)
+        self.assertEqual(requested,
+                         ['http://vimeo.com/api/v2/jakob/info.json'])
+
+    def test_streaming_feed_response_closed(self):
+        bodies = []
+        def open_url(url):
+            bodies.append(StringIO('[{"id": 1}, {"id": 2}, oops'))
+            return HttpResponse(url, {}, bodies[-1])
+        old_open_url = vimeo.open_url
+        vimeo.open_url = open_url
+        try:
+            feed = self.suite.get_feed('http://vimeo.com/jakob/videos/rss',
+                                       stream=True)
+            videos = self.suite.get_feed_response(feed, feed.url)
+            self.assertEqual(videos.next(), {u'id': 1})
+            self.assertFalse(bodies[0].closed)
+            videos.close()
+            self.assertTrue(bodies[0].closed)
+            videos = self.suite.get_feed_response(feed, feed.url)
+            self.assertRaises(ValueError, list, videos)
+            self.assertTrue(bodies[1].closed)
+        finally:
+            vimeo.open_url = old_open_url
+
+    def test_entries_only(self):
+        def get_feed_info_response(feed, response):
+            self.fail("Info was fetched for an entries-only feed.")
+        self.suite.get_feed_info_response = get_feed_info_response
+        feed = self.suite.get_feed('http://vimeo.com/jakob/videos/rss',
+                                   entries_only=True)
+        feed.handle_first_response(self.feed._first_response)
+        self.assertEqual(feed.title, None)
+
     def test_get_feed_title_likes(self):
         self.feed.url = self.feed.url.replace('videos.json', 'likes.json')
         self.assertEqual(
@@ -326,6 +393,24 @@ allowFullScreen></iframe>"""
             'format=json&query=query+search&api_key=BLANK&'
             'method=vimeo.videos.search')
 
+    def test_streaming_search_response(self):
+        path = os.path.join(self.data_file_dir, 'search.json')
+        expected = json.load(open(path))
+        response = load_streaming(open(path, 'rb'), ('videos', 'video'))
+        self.assertEqual(
+            self.suite.get_search_total_results(self.search, response),
+            self.suite.get_search_total_results(self.search, expected))
+        self.assertEqual(
+            self.suite.get_next_search_page_url(self.search, response),
+            self.suite.get_next_search_page_url(self.search, expected))
+        results = self.suite.get_search_results(self.search, response)
+        self.assertFalse(isinstance(results, list))
+        self.assertEqual(
+            [self.suite.parse_search_result(self.search, result)
+             for result in results],
+            [self.suite.parse_search_result(self.search, result)
+             for result in self.results])
+
     def test_next_page_url(self):
         response = {'videos':
                         {'total': '10', 'page': '1', 'perpage': '50'}}
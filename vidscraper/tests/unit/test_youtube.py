@@ -29,9 +29,13 @@ import unittest
 import urllib
 import urlparse
 
+from BeautifulSoup import BeautifulSoup
 import feedparser
 
-from vidscraper.suites.youtube import YouTubeSuite
+from vidscraper.suites.youtube import (SCRAPE_INFO_KEYS, YouTubeSuite,
+                                       _get_span_description,
+                                       _parse_video_info)
+from vidscraper.utils.interning import StringPool
 
 
 CARAMELL_DANSEN_ATOM_DATA = {
@@ -93,6 +97,15 @@ class YouTubeSuiteTestCase(YouTubeTestCase):
                  'thumbnail_url', 'link', 'user', 'guid',
                  'publish_datetime', 'tags', 'file_url_expires']))
 
+    def test_get_video_id(self):
+        for url in ('http://youtu.be/J_DV9b0x7v4',
+                    'http://www.youtube.com/watch?v=J_DV9b0x7v4&feature=g',
+                    'http://www.youtube.com/watch?feature=g&v=J_DV9b0x7v4',
+                    'https://www.youtube.com/embed/J_DV9b0x7v4',
+                    'http://www.youtube.com/v/J_DV9b0x7v4&rel=0'):
+            self.assertEqual(self.suite.get_video_id(url), 'J_DV9b0x7v4')
+            self.assertEqual(self.suite.canonical_url(url), self.base_url)
+
 
 class YouTubeOembedTestCase(YouTubeTestCase):
     def test_short_url(self):
@@ -200,12 +213,52 @@ class YouTubeScrapeTestCase(YouTubeTestCase):
                      u'schweden', u'anime', u'musik', u'music', u'funny',
                      u'caramelldansen', u'U-U-U-Aua', u'Dance'],
             'file_url_expires': datetime.datetime(2011, 11, 30, 1, 0),
-            'file_url_mimetype': u'video/x-flv',
-            'file_url': 'http://o-o.preferred.comcast-lga1.v6.lscache7.c.youtube.com/videoplayback?sparams=id%2Cexpire%2Cip%2Cipbits%2Citag%2Csource%2Calgorithm%2Cburst%2Cfactor%2Ccp&fexp=914999%2C908425&algorithm=throttle-factor&itag=5&ip=71.0.0.0&burst=40&sver=3&signature=67657D04EC6665D74BD0B736A9C3C3305B41A72B.48096D7D9D9D1DB4BEDF185A14B15AA19DE2A9C6&source=youtube&expire=1322614800&key=yt1&ipbits=8&factor=1.25&cp=U0hRR1ZMUl9FSkNOMV9ORlZJOmNUdWlkbTNrcU4y&id=27f0d5f5bd31eefe&quality=small&fallback_host=tc.v6.cache7.c.youtube.com&type=video/x-flv&itag=5',
+            'file_url_mimetype': u'video/mp4',
+            'file_url': 'http://o-o.preferred.comcast-lga1.v8.lscache2.c.youtube.com/videoplayback?sparams=id%2Cexpire%2Cip%2Cipbits%2Citag%2Csource%2Cratebypass%2Ccp&fexp=914999%2C908425&itag=18&ip=71.0.0.0&signature=1CC7A83C7A8408F4EE2E5DD63342EEB09A6E3E57.609DC29367653DDED4BB2B81337BF0E8EB8DBF70&sver=3&ratebypass=yes&source=youtube&expire=1322614800&key=yt1&ipbits=8&cp=U0hRR1ZMUl9FSkNOMV9ORlZJOmNUdWlkbTNrcU4y&id=27f0d5f5bd31eefe&quality=medium&fallback_host=tc.v8.cache2.c.youtube.com&type=video/mp4',
             }
         for field in self.suite.scrape_fields:
             self.assertEqual(data[field], expected[field])
 
+    def test_parse_scrape_response_preferences(self):
+        response_text = open(os.path.join(self.data_file_dir,
+                                          'scrape.txt')).read()
+        suite = YouTubeSuite(max_quality=360,
+                             preferred_mimetypes=[u'video/x-flv'])
+        data = suite.parse_scrape_response(response_text)
+        self.assertEqual(data['file_url_mimetype'], u'video/x-flv')
+        self.assertTrue('&itag=34&' in data['file_url'])
+        data = suite.parse_scrape_response(response_text, max_quality=240)
+        self.assertTrue(data['file_url'].endswith('&itag=5'))
+        data = suite.parse_scrape_response(response_text, max_quality=144)
+        self.assertEqual(data['file_url'], None)
+        self.assertEqual(data['file_url_mimetype'], None)
+        self.assertEqual(data['title'],
+                         u'CaramellDansen (Full Version + Lyrics)')
+
+    def test_preferences_per_suite(self):
+        suite = YouTubeSuite(max_quality=360)
+        self.assertEqual(self.suite.max_quality, None)
+        self.assertEqual(YouTubeSuite.max_quality, None)
+        self.assertNotEqual(suite.get_cache_key(self.base_url),
+                            self.suite.get_cache_key(self.base_url))
+        video = suite.get_video(self.base_url)
+        self.assertTrue(video.suite is suite)
+
+    def test_parse_video_info(self):
+        for name in ('scrape.txt', 'scrape2.txt', 'scrape3.txt'):
+            response_text = open(os.path.join(self.data_file_dir,
+                                              name)).read()
+            expected = dict((key, value[0]) for key, value in
+                            urlparse.parse_qs(response_text).items()
+                            if key in SCRAPE_INFO_KEYS)
+            self.assertEqual(
+                _parse_video_info(response_text, SCRAPE_INFO_KEYS), expected)
+            quoted = _parse_video_info(response_text, SCRAPE_INFO_KEYS,
+                                       quoted=('title',))
+            if 'title' in expected:
+                self.assertEqual(urllib.unquote_plus(quoted['title']),
+                                 expected['title'])
+
     def test_parse_scrape_response2(self):
         """
         Protected file, doesn't have a real download URL.
@@ -295,6 +348,38 @@ class YouTubeFeedTestCase(YouTubeTestCase):
              'user_url': u'http://www.youtube.com/user/AssociatedPress'}
             )
 
+    def test_parse_feed_entry_pool(self):
+        response = self.suite.get_feed_response(self.feed, self.feed_data)
+        entries = self.suite.get_feed_entries(self.feed, response)
+        pool = StringPool()
+        first = self.suite.parse_feed_entry(entries[0], pool=pool)
+        second = self.suite.parse_feed_entry(entries[1], pool=pool)
+        self.assertEqual(second['user_url'],
+                         u'http://www.youtube.com/user/AssociatedPress')
+        self.assertTrue(first['user'] is second['user'])
+        self.assertTrue(first['user_url'] is second['user_url'])
+
+    def test_span_description(self):
+        response = self.suite.get_feed_response(self.feed, self.feed_data)
+        entries = self.suite.get_feed_entries(self.feed, response)
+        for entry in entries:
+            soup = BeautifulSoup(entry['summary']).findAll('span')[0]
+            self.assertEqual(_get_span_description(entry['summary']),
+                             unicode(soup.string))
+
+    def test_span_description_markup(self):
+        for summary in (u'<div><span></span></div>',
+                        u'<span class="x">a &amp; b</span><span>c</span>',
+                        u'<span><b>bold</b></span>',
+                        u'<span>a <b>bold</b> word</span>',
+                        u'<span>fish & chips</span>',
+                        u'<span>a > b</span>',
+                        u'<span> \n\t </span>',
+                        u'<span>\n  text  \n</span>'):
+            soup = BeautifulSoup(summary).findAll('span')[0]
+            self.assertEqual(_get_span_description(summary),
+                             unicode(soup.string))
+
 class YouTubeSearchTestCase(YouTubeTestCase):
     def setUp(self):
         YouTubeTestCase.setUp(self)
@@ -0,0 +1,471 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from collections import OrderedDict
+import cPickle as pickle
+import datetime
+import os
+import random
+import sqlite3
+import threading
+import time
+import zlib
+
+from vidscraper.compat import json, json_loads
+from vidscraper.utils.timestamps import parse_isoformat
+
+
+#: The default number of seconds for which cached values are considered fresh.
+DEFAULT_TIMEOUT = 60 * 60
+
+#: The keys of cached video data whose values are datetimes. As in
+#: :meth:`.Video.to_dict`, :class:`SqliteCache` stores them as ISO 8601
+#: strings.
+DATETIME_KEYS = frozenset(['publish_datetime', 'file_url_expires'])
+
+_JSON_SCALARS = (basestring, int, long, float, type(None))
+_json_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+# The first byte of each value stored by SqliteCache says how it was
+# encoded. Values stored before there was a choice are bare zlib streams,
+# which start with 'x'.
+_JSON = 'j'
+_PICKLE = 'p'
+
+
+def _to_json_data(value):
+    """
+    Returns ``value`` in the form :meth:`.Video.to_dict` uses, if it is a
+    dictionary of video data like the suites cache, and ``None`` if it has
+    to be pickled instead.
+
+    """
+    if type(value) is not dict:
+        return None
+    data = {}
+    for key, item in value.iteritems():
+        if not isinstance(key, basestring):
+            return None
+        if key in DATETIME_KEYS and item is not None:
+            if (not isinstance(item, datetime.datetime) or
+                    item.tzinfo is not None):
+                return None
+            item = item.isoformat()
+        elif isinstance(item, list):
+            for element in item:
+                if not isinstance(element, _JSON_SCALARS):
+                    return None
+        elif not isinstance(item, _JSON_SCALARS):
+            return None
+        data[key] = item
+    return data
+
+
+def _encode_value(value):
+    """Returns the bytes which :class:`SqliteCache` stores for ``value``."""
+    data = _to_json_data(value)
+    if data is not None:
+        try:
+            return _JSON + zlib.compress(_json_encode(data))
+        except (TypeError, ValueError):
+            # Bytestrings which aren't utf-8, for example.
+            pass
+    return _PICKLE + zlib.compress(pickle.dumps(value,
+                                                pickle.HIGHEST_PROTOCOL))
+
+
+def _decode_value(stored):
+    """Reverses :func:`_encode_value`."""
+    stored = str(stored)
+    kind = stored[:1]
+    if kind == _JSON:
+        data = json_loads(zlib.decompress(stored[1:]))
+        for key in DATETIME_KEYS:
+            if data.get(key) is not None:
+                data[key] = parse_isoformat(data[key])
+        return data
+    if kind == _PICKLE:
+        return pickle.loads(zlib.decompress(stored[1:]))
+    return pickle.loads(zlib.decompress(stored))
+
+
+class CacheEntry(object):
+    """
+    A cached ``value`` along with the time (in seconds since the epoch) when
+    it was ``created`` and the number of seconds for which it stays fresh.
+
+    """
+    def __init__(self, value, created=None, timeout=DEFAULT_TIMEOUT):
+        self.value = value
+        self.created = created if created is not None else time.time()
+        self.timeout = timeout
+
+    @property
+    def age(self):
+        """The number of seconds since the entry was stored."""
+        return max(time.time() - self.created, 0)
+
+    @property
+    def expires(self):
+        """The time at which the entry stops being fresh."""
+        return self.created + self.timeout
+
+    def is_expired(self):
+        return time.time() >= self.expires
+
+
+class BaseCache(object):
+    """
+    Base class for caches which can be used to store data fetched by suites.
+    Subclasses need to implement :meth:`get_entry`, :meth:`set_entry` and
+    :meth:`delete`.
+
+    :param timeout: The number of seconds for which cached values are fresh.
+    :param stale_while_revalidate: The number of seconds after expiry during
+                                   which an entry may still be served while it
+                                   is refreshed in the background. Default:
+                                   ``0`` (expired entries are never served
+                                   while revalidating).
+    :param stale_if_error: The number of seconds after expiry during which an
+                           entry may still be served if fetching fresh data
+                           fails. Default: ``0``.
+
+    """
+    def __init__(self, timeout=DEFAULT_TIMEOUT, stale_while_revalidate=0,
+                 stale_if_error=0):
+        self.timeout = timeout
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_if_error = stale_if_error
+        self.hits = 0
+        self.misses = 0
+        self._refreshing = set()
+        self._refresh_lock = threading.Lock()
+
+    def _record(self, entry, record=True):
+        """
+        Counts a lookup which returned ``entry`` as a hit or a miss, unless
+        ``record`` is ``False``.
+
+        """
+        if not record:
+            return entry
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def stats(self):
+        """
+        Returns a dictionary containing the number of ``hits`` and ``misses``
+        for lookups in this cache, along with the ``hit_ratio``.
+
+        """
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': float(self.hits) / lookups if lookups else 0.0,
+        }
+
+    def get_entry(self, key, record=True):
+        """
+        Returns the :class:`CacheEntry` stored for ``key`` - whether or not it
+        has expired - or ``None`` if there is no such entry. The lookup is
+        counted in the :meth:`stats` unless ``record`` is ``False``, as it
+        is for lookups which the cache's users make for their own
+        bookkeeping.
+
+        """
+        raise NotImplementedError
+
+    def set_entry(self, key, entry):
+        """Stores a :class:`CacheEntry` for ``key``."""
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Removes any entry for ``key`` from the cache."""
+        raise NotImplementedError
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for ``key`` if it is still fresh, and
+        ``default`` otherwise.
+
+        """
+        entry = self.get_entry(key)
+        if entry is None or entry.is_expired():
+            return default
+        return entry.value
+
+    def set(self, key, value, timeout=None):
+        """
+        Stores ``value`` for ``key``. If ``timeout`` is ``None``, the cache's
+        default :attr:`timeout` is used.
+
+        """
+        if timeout is None:
+            timeout = self.timeout
+        self.set_entry(key, CacheEntry(value, timeout=timeout))
+
+    def can_serve_stale(self, entry, error=False):
+        """
+        Returns ``True`` if the expired ``entry`` may still be served, either
+        while it is revalidated or - if ``error`` is ``True`` - because
+        fetching fresh data failed.
+
+        """
+        window = self.stale_if_error if error else self.stale_while_revalidate
+        return time.time() < entry.expires + window
+
+    def revalidate(self, key, refresh):
+        """
+        Calls ``refresh`` in a background thread, unless a refresh for
+        ``key`` is already running. Returns ``True`` if a refresh was
+        started and ``False`` otherwise. Exceptions raised by ``refresh`` are
+        swallowed; the stale entry simply stays in place.
+
+        """
+        with self._refresh_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def run():
+            try:
+                refresh()
+            except Exception:
+                pass
+            finally:
+                with self._refresh_lock:
+                    self._refreshing.discard(key)
+
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def is_refreshing(self, key):
+        """Returns ``True`` if a background refresh is running for ``key``."""
+        with self._refresh_lock:
+            return key in self._refreshing
+
+
+class MemoryCache(BaseCache):
+    """
+    A thread-safe cache which keeps its entries in memory.
+
+    :param max_entries: If given, the least recently used entries are evicted
+                        once the cache holds more than this many entries.
+
+    Other arguments are passed on to :class:`BaseCache`.
+
+    """
+    def __init__(self, timeout=DEFAULT_TIMEOUT, stale_while_revalidate=0,
+                 stale_if_error=0, max_entries=None):
+        super(MemoryCache, self).__init__(timeout, stale_while_revalidate,
+                                          stale_if_error)
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_entry(self, key, record=True):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # Re-insert the entry to mark it as the most recently used.
+                self._entries[key] = entry
+            return self._record(entry, record)
+
+    def set_entry(self, key, entry):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class SqliteCache(BaseCache):
+    """
+    A cache which stores zlib-compressed entries in an sqlite database
+    running in WAL mode, so that any number of processes may read and write
+    the same cache file concurrently. Video data is stored as json, in the
+    form :meth:`.Video.to_dict` uses, and other values are pickled.
+
+    :param path: The path to the database file. It will be created if it
+                 doesn't exist.
+    :param max_size: If given, the oldest entries are evicted once the total
+                     size of the stored (compressed) values exceeds this many
+                     bytes. The size is checked on roughly one in every
+                     ``cull_frequency`` writes.
+    :param cull_frequency: See ``max_size``. Default: ``100``.
+
+    Other arguments are passed on to :class:`BaseCache`.
+
+    """
+    def __init__(self, path, timeout=DEFAULT_TIMEOUT, stale_while_revalidate=0,
+                 stale_if_error=0, max_size=None, cull_frequency=100):
+        super(SqliteCache, self).__init__(timeout, stale_while_revalidate,
+                                          stale_if_error)
+        self.path = path
+        self.max_size = max_size
+        self.cull_frequency = cull_frequency
+        self._local = threading.local()
+        connection = self._get_connection()
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'key TEXT PRIMARY KEY, value BLOB, created REAL, '
+                'timeout REAL, size INTEGER)')
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS entries_created '
+                'ON entries (created)')
+
+    def _get_connection(self):
+        """
+        Returns an sqlite connection for the current thread. Connections are
+        never shared between threads or across a fork.
+
+        """
+        pid = os.getpid()
+        if getattr(self._local, 'pid', None) != pid:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = pid
+        return self._local.connection
+
+    def get_entry(self, key, record=True):
+        row = self._get_connection().execute(
+            'SELECT value, created, timeout FROM entries WHERE key = ?',
+            (key,)).fetchone()
+        if row is None:
+            return self._record(None, record)
+        return self._record(CacheEntry(_decode_value(row[0]), row[1],
+                                       row[2]), record)
+
+    def set_entry(self, key, entry):
+        value = _encode_value(entry.value)
+        connection = self._get_connection()
+        with connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, value, created, timeout, size) VALUES (?, ?, ?, ?, ?)',
+                (key, sqlite3.Binary(value), entry.created, entry.timeout,
+                 len(value)))
+        if (self.max_size is not None and
+                random.randint(1, self.cull_frequency) == 1):
+            self.cull()
+
+    def delete(self, key):
+        connection = self._get_connection()
+        with connection:
+            connection.execute('DELETE FROM entries WHERE key = ?', (key,))
+
+    def size(self):
+        """Returns the total size in bytes of the stored values."""
+        return self._get_connection().execute(
+            'SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    def cull(self):
+        """
+        Evicts the oldest entries until the total size of the stored values is
+        no more than :attr:`max_size`.
+
+        """
+        excess = self.size() - self.max_size
+        if excess <= 0:
+            return
+        connection = self._get_connection()
+        with connection:
+            rows = connection.execute(
+                'SELECT key, size FROM entries ORDER BY created')
+            keys = []
+            for key, size in rows:
+                if excess <= 0:
+                    break
+                keys.append((key,))
+                excess -= size
+            connection.executemany('DELETE FROM entries WHERE key = ?', keys)
+
+
+class TwoTierCache(BaseCache):
+    """
+    A cache with a small, fast ``memory`` tier (typically a
+    :class:`MemoryCache` with ``max_entries`` set) in front of a larger,
+    shared ``disk`` tier (typically a :class:`SqliteCache`). Lookups which
+    miss the memory tier - or find only expired data there - fall through to
+    the disk tier, and entries found there are promoted to the memory tier.
+    Writes go to both tiers.
+
+    Other arguments are passed on to :class:`BaseCache`; the tiers' own
+    timeouts are not used.
+
+    """
+    def __init__(self, memory, disk, timeout=DEFAULT_TIMEOUT,
+                 stale_while_revalidate=0, stale_if_error=0):
+        super(TwoTierCache, self).__init__(timeout, stale_while_revalidate,
+                                           stale_if_error)
+        self.memory = memory
+        self.disk = disk
+
+    def get_entry(self, key, record=True):
+        entry = self.memory.get_entry(key, record)
+        if entry is None or entry.is_expired():
+            # Another process may have stored fresher data in the disk tier.
+            disk_entry = self.disk.get_entry(key, record)
+            if disk_entry is not None and (entry is None or
+                                           disk_entry.created > entry.created):
+                self.memory.set_entry(key, disk_entry)
+                entry = disk_entry
+        return self._record(entry, record)
+
+    def set_entry(self, key, entry):
+        self.memory.set_entry(key, entry)
+        self.disk.set_entry(key, entry)
+
+    def delete(self, key):
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def stats(self):
+        """
+        Returns the overall stats for the cache (see :meth:`BaseCache.stats`)
+        with the stats for each tier under the ``memory`` and ``disk`` keys.
+
+        """
+        stats = super(TwoTierCache, self).stats()
+        stats['memory'] = self.memory.stats()
+        stats['disk'] = self.disk.stats()
+        return stats
@@ -0,0 +1,607 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Fast parsers for the feeds of providers whose feeds have a known shape.
+
+:func:`feedparser.parse` handles any feed, but it normalizes every element of
+a document into dictionaries, and most of that work is thrown away by the
+suites' ``parse_feed_entry`` methods. The parsers in this module read
+youtube's gdata feeds and blip's rss feeds with :mod:`lxml` and build
+:mod:`feedparser`-compatible structures which contain only the keys that the
+suites read. :func:`parse` falls back to :mod:`feedparser` whenever a
+document doesn't have the expected shape.
+
+"""
+
+from __future__ import absolute_import
+
+import copy
+import re
+
+import feedparser
+from feedparser import FeedParserDict
+from lxml import etree
+
+from vidscraper.utils.timestamps import parse_rfc822, parse_w3dtf
+
+
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+MEDIA_NS = 'http://search.yahoo.com/mrss/'
+BLIP_NS = 'http://blip.tv/dtd/blip/1.0'
+ITUNES_NS = 'http://www.itunes.com/dtds/podcast-1.0.dtd'
+OPENSEARCH_NS = ('http://a9.com/-/spec/opensearchrss/1.0/',
+                 'http://a9.com/-/spec/opensearch/1.1/')
+
+GDATA_IDS = ('http://gdata.youtube.com/', 'tag:youtube.com,')
+
+MEDIA_CATEGORY_SCHEME = u'http://search.yahoo.com/mrss/category_schema'
+ITUNES_SCHEME = u'http://www.itunes.com/'
+
+# Roughly feedparser's test for text which should be treated as html.
+_LOOKS_LIKE_HTML_RE = re.compile(r'</\w+>|&#?\w+;')
+_LINK_ENTITY_RE = re.compile(r'&([A-Za-z0-9_]+);')
+
+_CONTENT_TYPES = {
+    'text': u'text/plain',
+    'html': u'text/html',
+    'xhtml': u'application/xhtml+xml',
+}
+
+_parse_date = getattr(feedparser, '_parse_date', None)
+_sanitize_html = getattr(feedparser, '_sanitizeHTML', None)
+_resolve_relative_uris = getattr(feedparser, '_resolveRelativeURIs', None)
+
+
+class UnexpectedFeedError(Exception):
+    """
+    Raised by the fast parsers when a document doesn't have the shape they
+    expect; :func:`parse` catches it and falls back to :mod:`feedparser`.
+
+    """
+
+
+def _atom(name):
+    return '{%s}%s' % (ATOM_NS, name)
+
+
+def _split_tag(tag):
+    """
+    Returns a ``(namespace, local name)`` tuple for an element's tag, or
+    ``(None, None)`` for comments and processing instructions.
+
+    """
+    if not isinstance(tag, basestring):
+        return None, None
+    if tag[:1] == '{':
+        return tuple(tag[1:].split('}', 1))
+    return None, tag
+
+
+def _text(elt):
+    return unicode(elt.text or u'').strip()
+
+
+def _plain_text(elt):
+    """
+    Returns the text of an element which feedparser would treat as plain
+    text. Text which feedparser would sniff as html (and sanitize) raises an
+    :exc:`UnexpectedFeedError`.
+
+    """
+    text = _text(elt)
+    if '<' in text or _LOOKS_LIKE_HTML_RE.search(text):
+        raise UnexpectedFeedError('html in %s' % elt.tag)
+    return text
+
+
+def _html(text):
+    """Cleans html text the way feedparser does."""
+    text = _resolve_relative_uris(text, u'', 'utf-8', u'text/html')
+    return _sanitize_html(text, 'utf-8', u'text/html')
+
+
+def _date(context, key, elt):
+    value = _text(elt)
+    parsed = parse_w3dtf(value) or parse_rfc822(value) or _parse_date(value)
+    if parsed is None:
+        raise UnexpectedFeedError('unparseable date: %r' % value)
+    context[key] = value
+    context[key + '_parsed'] = parsed
+
+
+def _add_tag(tags, term, scheme, label):
+    # Mirrors feedparser's _addTag, including its de-duplication.
+    if not (term or scheme or label):
+        return
+    value = FeedParserDict(term=term, scheme=scheme, label=label)
+    if value not in tags:
+        tags.append(value)
+
+
+def _add_category(tags, elt, default_scheme=None):
+    # Mirrors feedparser's _start_category and _end_category: a category's
+    # text fills in the term of the last tag if that tag has none.
+    _add_tag(tags, elt.get('term'),
+             elt.get('scheme', elt.get('domain', default_scheme)),
+             elt.get('label'))
+    value = _text(elt)
+    if value:
+        if tags and not tags[-1]['term']:
+            tags[-1]['term'] = value
+        else:
+            _add_tag(tags, value, None, None)
+
+
+def _add_keywords(tags, elt, scheme=None):
+    for term in _text(elt).split(','):
+        if term.strip():
+            _add_tag(tags, term.strip(), scheme, None)
+
+
+def _attributes(elt):
+    """
+    Returns an element's attributes keyed by their lowercased local names,
+    as feedparser stores them.
+
+    """
+    return FeedParserDict((_split_tag(name)[1].lower(), unicode(value))
+                          for name, value in elt.attrib.iteritems())
+
+
+def _parse_media(entry, tags, elt, local_name):
+    if local_name == 'group':
+        for child in elt:
+            namespace, name = _split_tag(child.tag)
+            if namespace == MEDIA_NS:
+                _parse_media(entry, tags, child, name)
+    elif local_name == 'content':
+        entry.setdefault('media_content', []).append(_attributes(elt))
+    elif local_name == 'thumbnail':
+        thumbnail = _attributes(elt)
+        if 'url' not in thumbnail:
+            raise UnexpectedFeedError('media:thumbnail without url')
+        entry.setdefault('media_thumbnail', []).append(thumbnail)
+    elif local_name == 'player':
+        player = _attributes(elt)
+        player['content'] = _text(elt)
+        entry['media_player'] = player
+    elif local_name == 'category':
+        _add_category(tags, elt, MEDIA_CATEGORY_SCHEME)
+    elif local_name == 'keywords':
+        _add_keywords(tags, elt)
+
+
+def _parse_opensearch(feed, elt, local_name):
+    feed['opensearch_' + local_name.lower()] = _text(elt)
+
+
+def _parse_atom_entry(elt):
+    entry = FeedParserDict()
+    tags = entry['tags'] = []
+    links = entry['links'] = []
+    for child in elt:
+        namespace, name = _split_tag(child.tag)
+        if namespace == MEDIA_NS:
+            _parse_media(entry, tags, child, name)
+        elif namespace != ATOM_NS:
+            continue
+        elif name == 'id':
+            entry['id'] = _text(child)
+        elif name == 'title':
+            if child.get('type', 'text') != 'text':
+                raise UnexpectedFeedError('non-text title')
+            entry['title'] = _text(child)
+        elif name in ('published', 'updated'):
+            _date(entry, name, child)
+        elif name == 'category':
+            _add_category(tags, child)
+        elif name == 'link':
+            link = _attributes(child)
+            link.setdefault('rel', u'alternate')
+            links.append(link)
+            if link['rel'] == u'alternate' and 'link' not in entry:
+                entry['link'] = link.get('href', u'')
+        elif name == 'author':
+            author = child.find(_atom('name'))
+            if author is not None:
+                entry['author'] = _text(author)
+        elif name == 'content':
+            content_type = child.get('type', 'text')
+            if _CONTENT_TYPES.get(content_type, content_type) != u'text/plain':
+                raise UnexpectedFeedError('non-text content')
+            entry.setdefault('summary', _text(child))
+    if 'id' not in entry or not entry['id'].startswith(GDATA_IDS):
+        raise UnexpectedFeedError('not a gdata entry')
+    return entry
+
+
+def _parse_atom_feed_child(feed, child):
+    namespace, name = _split_tag(child.tag)
+    if namespace in OPENSEARCH_NS:
+        _parse_opensearch(feed, child, name)
+    elif namespace != ATOM_NS:
+        return
+    elif name in ('id', 'logo'):
+        feed[name] = _text(child)
+    elif name in ('title', 'subtitle'):
+        if child.get('type', 'text') != 'text':
+            raise UnexpectedFeedError('non-text %s' % name)
+        feed[name] = _text(child)
+    elif name == 'updated':
+        _date(feed, name, child)
+    elif name == 'link':
+        link = _attributes(child)
+        link.setdefault('rel', u'alternate')
+        feed.setdefault('links', []).append(link)
+        if link['rel'] == u'alternate' and 'link' not in feed:
+            feed['link'] = link.get('href', u'')
+
+
+def _parse_rss_item(elt, with_summary):
+    entry = FeedParserDict()
+    tags = entry['tags'] = []
+    links = entry['links'] = []
+    for child in elt:
+        namespace, name = _split_tag(child.tag)
+        if namespace == MEDIA_NS:
+            _parse_media(entry, tags, child, name)
+        elif namespace == BLIP_NS:
+            if not child.attrib:
+                entry['blip_' + name.lower()] = _text(child)
+        elif namespace == ITUNES_NS:
+            if name == 'keywords':
+                _add_keywords(tags, child, ITUNES_SCHEME)
+            elif name == 'image':
+                href = child.get('href', child.get('url'))
+                if href:
+                    entry['image'] = FeedParserDict(href=unicode(href))
+        elif namespace == ATOM_NS:
+            if name == 'updated':
+                _date(entry, name, child)
+        elif namespace is not None:
+            continue
+        elif name == 'guid':
+            entry['id'] = _text(child)
+        elif name == 'title':
+            entry['title'] = _plain_text(child)
+        elif name == 'pubDate':
+            _date(entry, 'published', child)
+        elif name == 'category':
+            _add_category(tags, child)
+        elif name == 'link':
+            # feedparser's fix for urls with improperly escaped queries.
+            href = _LINK_ENTITY_RE.sub(r'&\1',
+                                       _text(child).replace('&amp;', '&'))
+            entry['link'] = href
+            links.append(FeedParserDict(rel=u'alternate', type=u'text/html',
+                                        href=href))
+        elif name == 'enclosure':
+            link = _attributes(child)
+            if 'url' in link:
+                link['href'] = link.pop('url')
+            link['rel'] = u'enclosure'
+            links.append(link)
+        elif name == 'author':
+            author = _text(child)
+            if '@' in author or '(' in author:
+                raise UnexpectedFeedError('email address in author')
+            entry['author'] = author
+        elif name == 'description' and with_summary:
+            summary = _html(_text(child))
+            entry['summary'] = summary
+            entry['summary_detail'] = FeedParserDict(
+                type=u'text/html', value=summary, language=None, base=u'')
+    return entry
+
+
+def _parse_rss_channel_child(feed, child):
+    namespace, name = _split_tag(child.tag)
+    if namespace in OPENSEARCH_NS:
+        _parse_opensearch(feed, child, name)
+    elif namespace == ATOM_NS:
+        if name == 'id':
+            feed['id'] = _text(child)
+    elif namespace == ITUNES_NS:
+        if name == 'image':
+            href = child.get('href', child.get('url'))
+            if href:
+                feed['image'] = FeedParserDict(href=unicode(href))
+    elif namespace is not None:
+        return
+    elif name in ('title', 'link'):
+        feed[name] = _plain_text(child)
+    elif name == 'description':
+        feed['subtitle'] = _html(_text(child))
+    elif name == 'lastBuildDate':
+        _date(feed, 'updated', child)
+    elif name == 'pubDate':
+        _date(feed, 'published', child)
+    elif name == 'image':
+        url = child.find('url')
+        if url is not None:
+            feed['image'] = FeedParserDict(href=_text(url))
+
+
+def _check_gdata_feed(root, feed):
+    if not feed.get('id', u'').startswith(GDATA_IDS):
+        raise UnexpectedFeedError('not a gdata feed')
+
+
+def _check_blip_feed(root, feed):
+    if root.tag != 'rss' or BLIP_NS not in root.nsmap.values():
+        raise UnexpectedFeedError('not a blip feed')
+
+
+def _get_root(text):
+    if isinstance(text, unicode):
+        text = text.encode('utf8')
+    return etree.fromstring(text)
+
+
+def _parse_document(root, check, with_summary):
+    """
+    Parses an atom feed or rss document whose root element is ``root``, and
+    checks its shape with ``check``. Returns a ``(version, feed, entries)``
+    tuple.
+
+    """
+    feed = FeedParserDict()
+    entries = []
+    if root.tag == _atom('feed'):
+        version = u'atom10'
+        for child in root:
+            if child.tag == _atom('entry'):
+                entries.append(_parse_atom_entry(child))
+            else:
+                _parse_atom_feed_child(feed, child)
+    else:
+        channel = root.find('channel')
+        if root.tag != 'rss' or channel is None:
+            raise UnexpectedFeedError('not an rss or atom feed')
+        version = u'rss20'
+        for child in channel:
+            if child.tag == 'item':
+                entries.append(_parse_rss_item(child, with_summary))
+            else:
+                _parse_rss_channel_child(feed, child)
+    check(root, feed)
+    return version, feed, entries
+
+
+def parse_gdata_feed(text):
+    """
+    Parses youtube's gdata feeds: atom feeds, single atom entries and the
+    rss feeds returned for ``alt=rss``. Returns a ``(version, feed,
+    entries)`` tuple.
+
+    """
+    root = _get_root(text)
+    if root.tag == _atom('entry'):
+        return u'atom10', FeedParserDict(), [_parse_atom_entry(root)]
+    return _parse_document(root, _check_gdata_feed, with_summary=True)
+
+
+def parse_blip_feed(text):
+    """
+    Parses blip's rss feeds. The html descriptions of items are skipped,
+    since the suite reads ``blip:puredescription`` instead. Returns a
+    ``(version, feed, entries)`` tuple.
+
+    """
+    return _parse_document(_get_root(text), _check_blip_feed,
+                           with_summary=False)
+
+
+#: Maps each fast parser to the shape check and summary handling which
+#: :func:`iterparse` uses to stream the same documents.
+_STREAMING = {
+    parse_gdata_feed: (_check_gdata_feed, True),
+    parse_blip_feed: (_check_blip_feed, False),
+}
+
+
+def _helpers_available():
+    return None not in (_parse_date, _sanitize_html, _resolve_relative_uris)
+
+
+def _make_response(version, feed, entries, response_headers):
+    headers = dict((key.lower(), value) for key, value in
+                   (response_headers or {}).iteritems())
+    response = FeedParserDict(feed=feed, entries=entries, bozo=0,
+                              encoding=u'utf-8', version=version,
+                              namespaces={}, headers=headers, href=u'')
+    if 'etag' in headers:
+        response['etag'] = headers['etag']
+    if 'last-modified' in headers:
+        response['modified'] = headers['last-modified']
+    return response
+
+
+def parse(text, parser, response_headers=None):
+    """
+    Parses the feed document ``text`` with one of the fast ``parser``
+    functions in this module and returns a structure which can be used in
+    place of the result of :func:`feedparser.parse`. If ``text`` doesn't have
+    the shape the ``parser`` expects, or can't be parsed as xml, it is parsed
+    with :func:`feedparser.parse` instead.
+
+    """
+    if not _helpers_available():
+        # This version of feedparser doesn't provide the helpers we need.
+        return feedparser.parse(text, response_headers=response_headers)
+    try:
+        version, feed, entries = parser(text)
+    except (UnexpectedFeedError, etree.LxmlError, ValueError):
+        return feedparser.parse(text, response_headers=response_headers)
+    return _make_response(version, feed, entries, response_headers)
+
+
+class _RecordingFile(object):
+    """
+    Wraps a file and keeps everything read from it until :meth:`stop` is
+    called, so that a document can still be handed to another parser in
+    full after part of it has been streamed.
+
+    """
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.chunks = []
+
+    def read(self, size=-1):
+        data = self.fileobj.read(size)
+        if self.chunks is not None:
+            self.chunks.append(data)
+        return data
+
+    def stop(self):
+        self.chunks = None
+
+    def read_all(self):
+        return ''.join(self.chunks) + self.fileobj.read()
+
+
+def _read_feed_header(events, check):
+    """
+    Consumes ``events`` up to the start of the first entry, and returns a
+    ``(version, feed, container)`` tuple, where ``container`` is the element
+    whose children are the entries.
+
+    """
+    feed = FeedParserDict()
+    root = container = version = None
+    for event, elt in events:
+        if event == 'start':
+            if root is None:
+                root = elt
+                if elt.tag == _atom('feed'):
+                    container, version = elt, u'atom10'
+                elif elt.tag != 'rss':
+                    raise UnexpectedFeedError('not an rss or atom feed')
+            elif container is None:
+                if elt.tag != 'channel' or elt.getparent() is not root:
+                    raise UnexpectedFeedError('not an rss feed')
+                container, version = elt, u'rss20'
+            elif (elt.getparent() is container and
+                  elt.tag in ('item', _atom('entry'))):
+                break
+        elif container is not None and elt.getparent() is container:
+            _parse_feed_child(version, feed, elt)
+            elt.clear()
+    if container is None:
+        raise UnexpectedFeedError('not an rss or atom feed')
+    check(root, feed)
+    return version, feed, container
+
+
+def _parse_feed_child(version, feed, elt):
+    if version == u'atom10':
+        _parse_atom_feed_child(feed, elt)
+    else:
+        _parse_rss_channel_child(feed, elt)
+
+
+def _feedparser_parse_child(container, elt):
+    """
+    Parses a document holding only ``elt`` - a child of the feed's
+    ``container`` - with :func:`feedparser.parse`. This is what a streamed
+    element which the fast parsers can't handle falls back to, since the
+    rest of the document is no longer at hand.
+
+    """
+    root = container.getroottree().getroot()
+    document = etree.Element(root.tag, dict(root.attrib), nsmap=root.nsmap)
+    parent = document
+    if container is not root:
+        parent = etree.SubElement(document, container.tag)
+    parent.append(copy.deepcopy(elt))
+    return feedparser.parse(etree.tostring(document, encoding='utf-8',
+                                           xml_declaration=True))
+
+
+def _iter_entries(events, version, feed, container, with_summary):
+    """
+    Yields the entries of a streamed feed as each one is closed, clearing
+    its element (and dropping the cleared elements before it) as it goes.
+    Elements which the fast parsers can't handle are parsed with
+    :mod:`feedparser` instead. Errors in the xml itself are raised, since
+    nothing after them can be read.
+
+    """
+    for event, elt in events:
+        if event != 'end' or elt.getparent() is not container:
+            continue
+        is_entry = elt.tag in ('item', _atom('entry'))
+        try:
+            if elt.tag == 'item':
+                entry = _parse_rss_item(elt, with_summary)
+            elif is_entry:
+                entry = _parse_atom_entry(elt)
+            else:
+                _parse_feed_child(version, feed, elt)
+        except (UnexpectedFeedError, ValueError):
+            parsed = _feedparser_parse_child(container, elt)
+            if not is_entry:
+                feed.update(parsed.feed)
+            elif parsed.entries:
+                entry = parsed.entries[0]
+            else:
+                is_entry = False
+        elt.clear()
+        while elt.getprevious() is not None:
+            del container[0]
+        if is_entry:
+            yield entry
+
+
+def iterparse(fileobj, parser, response_headers=None):
+    """
+    Like :func:`parse`, but reads the feed document from ``fileobj`` as it
+    goes. The feed's own data is read when this is called, but the returned
+    response's ``entries`` are a generator which parses each entry only when
+    it is reached and then discards it, so memory use stays flat however
+    large the feed is. The entries can only be iterated over once.
+
+    Documents which don't have the shape the ``parser`` expects are read
+    completely and passed to :func:`parse` instead. Entries which the
+    ``parser`` can't handle are parsed with :mod:`feedparser` one by one,
+    and xml errors after the start of the entries are raised when they are
+    reached.
+
+    """
+    if parser not in _STREAMING or not _helpers_available():
+        return parse(fileobj.read(), parser, response_headers)
+    check, with_summary = _STREAMING[parser]
+    recorder = _RecordingFile(fileobj)
+    events = etree.iterparse(recorder, events=('start', 'end'))
+    try:
+        version, feed, container = _read_feed_header(events, check)
+    except (UnexpectedFeedError, etree.LxmlError, ValueError):
+        return parse(recorder.read_all(), parser, response_headers)
+    recorder.stop()
+    response = _make_response(version, feed, None, response_headers)
+    response['entries'] = _iter_entries(events, version, feed, container,
+                                        with_summary)
+    return response
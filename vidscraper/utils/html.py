@@ -23,16 +23,142 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from htmlentitydefs import name2codepoint
+import re
+
 from BeautifulSoup import BeautifulStoneSoup
+from lxml import etree
+
+from vidscraper.utils.memo import BoundedMemo
+
+
+# Matches the void elements which lxml's html serializer writes as ``<br>``.
+_VOID_TAG_RE = re.compile(r'<(area|base|br|col|embed|hr|img|input|link|meta|'
+                          r'param)((?:\s[^>]*)?)>')
+
+#: The number of characters of a page which :func:`iterparse_html` feeds to
+#: the parser at a time.
+CHUNK_SIZE = 16 * 1024
+
+# Character and entity references as sgmllib reads them: a reference has to be
+# followed by some other character, and only a semicolon is consumed.
+_ENTITY_RE = re.compile(r'&(?:#([0-9]+)(?:;|(?=[^0-9]))|'
+                        r'([a-zA-Z][-.a-zA-Z0-9]*)(?:;|(?=[^a-zA-Z0-9])))')
+# A reference which runs to the end of the text is dropped, along with the
+# rest of the text, by :mod:`BeautifulSoup`.
+_INCOMPLETE_ENTITY_RE = re.compile(r'&(?:[a-zA-Z][a-zA-Z0-9]*|#[0-9]*)?\Z')
+# The characters which :mod:`BeautifulSoup` escapes again on output.
+_BARE_AMPERSAND_OR_BRACKET_RE = re.compile(
+    r'([<>]|&(?!#\d+;|#x[0-9a-fA-F]+;|\w+;))')
+_ESCAPES = {u'<': u'&lt;', u'>': u'&gt;', u'&': u'&amp;'}
+_ASCII_SPACES = {9: None, 10: None, 12: None, 13: None, 32: None}
+
+# Recently converted strings; titles and embed codes repeat a lot in feeds.
+_CONVERTED_MAX = 512
+_converted = BoundedMemo(_CONVERTED_MAX)
+
+
+def _entity_sub(match):
+    if match.group(1) is not None:
+        return unichr(int(match.group(1)))
+    name = match.group(2)
+    if name in name2codepoint:
+        return unichr(name2codepoint[name])
+    if name == 'apos':
+        return u'&apos;'
+    # Unknown entities are treated as misplaced ampersands.
+    return u'&amp;' + name
+
+def _convert_entities(text):
+    """
+    Converts the entities in ``text``, which must not contain any markup,
+    exactly as :mod:`BeautifulSoup` would. Raises :exc:`ValueError` for
+    character references which aren't valid code points.
+
+    """
+    if '&' in text:
+        match = _INCOMPLETE_ENTITY_RE.search(text)
+        text = _ENTITY_RE.sub(_entity_sub, text)
+        if match is not None:
+            # The incomplete reference is left alone by the substitution, but
+            # may have ended the one before it.
+            text = text[:len(text) - (match.end() - match.start())]
+    if not text.translate(_ASCII_SPACES):
+        if not text:
+            return u''
+        return u'\n' if u'\n' in text else u' '
+    return _BARE_AMPERSAND_OR_BRACKET_RE.sub(
+        lambda match: _ESCAPES[match.group(1)[0]], text)
 
 def convert_entities(text):
     """
-    Uses :mod:`BeautifulSoup` to convert the HTML entities in some text into
-    the appropriate characters.
+    Converts the HTML entities in some text into the appropriate characters,
+    with the same results as :mod:`BeautifulSoup`. Text without markup is
+    converted directly; anything else is run through
+    :class:`BeautifulStoneSoup`.
+    """
+    converted = _converted.get(text)
+    if converted is not None:
+        return converted
+
+    unicode_text = text
+    if isinstance(text, str):
+        try:
+            unicode_text = text.decode('ascii')
+        except UnicodeDecodeError:
+            # Leave the guessing of encodings to BeautifulSoup.
+            unicode_text = None
+    if unicode_text is not None and u'<' not in unicode_text:
+        try:
+            converted = _convert_entities(unicode_text)
+        except ValueError:
+            pass
+    if converted is None:
+        converted = unicode(
+            BeautifulStoneSoup(text,
+                               convertEntities=BeautifulStoneSoup.HTML_ENTITIES))
+
+    return _converted.remember(text, converted)
+
+def iterparse_html(text, chunk_size=CHUNK_SIZE):
+    """
+    Feeds ``text`` to :mod:`lxml`'s html pull parser a chunk at a time and
+    yields each element once it has been closed. Parsing stops as soon as the
+    caller stops iterating, so scrapers can skip the rest of a page once they
+    have what they need.
+
+    """
+    parser = etree.HTMLPullParser(events=('end',))
+    for start in xrange(0, len(text), chunk_size):
+        parser.feed(text[start:start + chunk_size])
+        for event, elt in parser.read_events():
+            yield elt
+    parser.close()
+    for event, elt in parser.read_events():
+        yield elt
+
+def element_string(elt):
+    """
+    Returns the text of an :mod:`lxml` element which contains no other
+    elements, or ``u'None'`` otherwise, as ``unicode(tag.string)`` would for
+    a :mod:`BeautifulSoup` tag.
+
+    """
+    if len(elt) or not elt.text:
+        return u'None'
+    return unicode(elt.text)
+
+def inner_html(elt):
+    """
+    Returns the html contents of an :mod:`lxml` element as unicode, without
+    the element's own tag. Void elements are written in the ``<br />`` style
+    used by :mod:`BeautifulSoup`.
+
     """
-    return unicode(
-        BeautifulStoneSoup(text,
-                           convertEntities=BeautifulStoneSoup.HTML_ENTITIES))
+    html = (elt.text or u'') + u''.join(
+        etree.tostring(child, encoding=unicode, method='html')
+        for child in elt)
+    return _VOID_TAG_RE.sub(r'<\1\2 />', html)
 
 def make_embed_code(video_url, flash_qs, width=400, height=264):
     """Generates embed code from a flash enclosure."""
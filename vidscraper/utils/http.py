@@ -24,16 +24,158 @@
 # (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
 # THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+from collections import namedtuple
+from email.utils import mktime_tz, parsedate_tz
 import random
+import re
 import time
 import urllib
+import urllib2
+import zlib
 
 from lxml import etree
 from lxml.html import clean
 
+from vidscraper.utils.memo import BoundedMemo
+
 DESCRIPTION_CLEANER = clean.Cleaner(
     remove_tags=['img', 'table', 'tr', 'td', 'th'])
 
+#: The response headers which are kept when a response is cached.
+CACHED_HEADERS = ('content-type', 'etag', 'last-modified')
+
+#: A response returned by :func:`fetch_url`: the final ``url`` after any
+#: redirects, a dictionary of lowercased ``headers``, and the ``body`` text.
+HttpResponse = namedtuple('HttpResponse', 'url headers body')
+
+# Characters which make a description need the full parse and clean: markup,
+# entities, and the characters which libxml2 drops.
+_NEEDS_CLEANING_RE = re.compile(u'[<&\x00-\x08\x0b\x0c\x0e-\x1f'
+                                u'\ud800-\udfff\ufeff\ufffe\uffff]')
+
+# Recently cleaned descriptions, keyed by their text.
+_CLEANED_MAX = 1024
+_cleaned = BoundedMemo(_CLEANED_MAX)
+
+_response_cache = None
+
+
+def set_response_cache(cache):
+    """
+    Sets a :class:`~vidscraper.utils.cache.BaseCache` to be used by
+    :func:`fetch_url` for caching raw HTTP responses, or disables response
+    caching if ``cache`` is ``None``.
+
+    """
+    global _response_cache
+    _response_cache = cache
+
+
+def get_response_cache():
+    """Returns the cache set by :func:`set_response_cache`, if any."""
+    return _response_cache
+
+
+def get_freshness_lifetime(headers):
+    """
+    Returns the number of seconds for which a response with the given
+    (lowercased) ``headers`` may be served without revalidation, based on its
+    ``Cache-Control`` and ``Expires`` headers, or ``None`` if the response
+    must not be stored at all.
+
+    """
+    directives = {}
+    for directive in headers.get('cache-control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return 0
+    if 'max-age' in directives:
+        try:
+            return max(int(directives['max-age']), 0)
+        except ValueError:
+            return 0
+    expires = parsedate_tz(headers.get('expires', ''))
+    if expires is not None:
+        date = parsedate_tz(headers.get('date', ''))
+        now = mktime_tz(date) if date is not None else time.time()
+        return max(mktime_tz(expires) - now, 0)
+    return 0
+
+
+def fetch_url(url, timeout=5):
+    """
+    Fetches ``url`` and returns an :class:`HttpResponse`. If a response cache
+    has been set with :func:`set_response_cache`, responses are cached for as
+    long as their ``Cache-Control`` or ``Expires`` headers allow. Once a
+    cached response is stale, it is revalidated with a conditional request
+    if it had an ``ETag`` or ``Last-Modified`` header.
+
+    """
+    cache = _response_cache
+    if cache is None:
+        response = urllib2.urlopen(url, timeout=timeout)
+        return HttpResponse(response.geturl(), _get_headers(response),
+                            response.read())
+
+    key = u'http:%s' % url
+    entry = cache.get_entry(key)
+    if entry is not None and not entry.is_expired():
+        return _response_from_cache(entry.value)
+
+    request = urllib2.Request(url)
+    if entry is not None:
+        cached_headers = entry.value[1]
+        if 'etag' in cached_headers:
+            request.add_header('If-None-Match', cached_headers['etag'])
+        if 'last-modified' in cached_headers:
+            request.add_header('If-Modified-Since',
+                               cached_headers['last-modified'])
+    try:
+        response = urllib2.urlopen(request, timeout=timeout)
+    except urllib2.HTTPError, e:
+        if e.code != 304 or entry is None:
+            raise
+        # Not modified: the cached body is good for another lifetime.
+        lifetime = get_freshness_lifetime(_get_headers(e))
+        if lifetime is not None:
+            cache.set(key, entry.value, timeout=lifetime)
+        return _response_from_cache(entry.value)
+
+    headers = _get_headers(response)
+    body = response.read()
+    lifetime = get_freshness_lifetime(headers)
+    if lifetime is not None and (lifetime > 0 or 'etag' in headers or
+                                 'last-modified' in headers):
+        kept_headers = dict((name, headers[name]) for name in CACHED_HEADERS
+                            if name in headers)
+        cache.set(key, (response.geturl(), kept_headers, zlib.compress(body)),
+                  timeout=lifetime)
+    return HttpResponse(response.geturl(), headers, body)
+
+
+def open_url(url, timeout=5):
+    """
+    Opens ``url`` without reading it and returns an :class:`HttpResponse`
+    whose ``body`` is the open file-like response, so that it can be parsed
+    as it arrives. This bypasses the response cache.
+
+    """
+    response = urllib2.urlopen(url, timeout=timeout)
+    return HttpResponse(response.geturl(), _get_headers(response), response)
+
+
+def _get_headers(response):
+    return dict((name.lower(), value)
+                for name, value in response.info().items())
+
+
+def _response_from_cache(value):
+    url, headers, body = value
+    return HttpResponse(url, headers, zlib.decompress(body))
+
 
 def lxml_inner_html(elt):
     try:
@@ -43,11 +185,43 @@ def lxml_inner_html(elt):
         return u''
 
 
+def _clean_plain_text(html):
+    """
+    Returns what :data:`DESCRIPTION_CLEANER` would make of ``html`` if it is
+    plain text, or ``None`` if it has to be cleaned properly.
+
+    """
+    if isinstance(html, str):
+        try:
+            html.decode('ascii')
+        except UnicodeDecodeError:
+            return None
+    if _NEEDS_CLEANING_RE.search(html) is not None:
+        return None
+    text = html.lstrip(' \t\n\r')
+    if not text:
+        # Let lxml complain about the empty document.
+        return None
+    return '<p>' + text.replace('>', '&gt;') + '</p>'
+
+
 # TODO: Rename this to sanitize? Should this really be done with an xml cleaner?
 def clean_description_html(html):
+    """
+    Sanitizes the html of a description with :data:`DESCRIPTION_CLEANER`.
+    Plain text is wrapped in a paragraph without being parsed, and recently
+    cleaned descriptions are returned from a cache.
+
+    """
     if not html:
         return html
-    return DESCRIPTION_CLEANER.clean_html(html)
+    cleaned = _cleaned.get(html)
+    if cleaned is None:
+        cleaned = _clean_plain_text(html)
+        if cleaned is None:
+            cleaned = DESCRIPTION_CLEANER.clean_html(html)
+        _cleaned.remember(html, cleaned)
+    return cleaned
 
 
 # TODO: Is this still required?
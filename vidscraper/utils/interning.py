@@ -0,0 +1,81 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Interning of the values which repeat from entry to entry of a feed - the
+user, their url, tags, mimetypes - so that the videos made from the entries
+share one copy of each instead of holding a copy apiece.
+
+"""
+
+
+class StringPool(object):
+    """
+    A pool of strings, in which equal strings are stored once. Unlike
+    :func:`intern`, it takes unicode as well as bytestrings, and the strings
+    are freed along with the pool, so a pool is kept for as long as a feed
+    or search is being iterated over rather than for the life of the
+    process.
+
+    """
+    def __init__(self):
+        self._strings = {}
+        self._formatted = {}
+
+    def __len__(self):
+        return len(self._strings)
+
+    def intern(self, value):
+        """
+        Returns the string in the pool which is equal to ``value``, adding
+        ``value`` if there isn't one. ``None`` is returned unchanged.
+
+        """
+        if value is None:
+            return None
+        interned = self._strings.setdefault(value, value)
+        # An ascii bytestring is equal to the same text in unicode; don't
+        # hand back the other type.
+        if type(interned) is not type(value):
+            return value
+        return interned
+
+    def intern_list(self, values):
+        """Returns a list of the interned ``values``."""
+        intern = self.intern
+        return [intern(value) for value in values]
+
+    def format(self, template, value):
+        """
+        Returns the interned ``template % value``. The result is remembered,
+        so that the string is only built once for each ``value``.
+
+        """
+        key = (template, value)
+        try:
+            return self._formatted[key]
+        except KeyError:
+            formatted = self._formatted[key] = self.intern(template % value)
+            return formatted
@@ -0,0 +1,170 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Incremental decoding of large json documents. :func:`load_streaming` reads a
+document from a file-like object a chunk at a time and yields the items of
+one of its arrays as soon as each has been read, so that they can be used
+before the rest of the document has arrived, and without holding all of them
+in memory at once.
+
+"""
+
+import codecs
+import re
+
+from vidscraper.compat import json
+
+
+#: The number of bytes which are read from the file at a time.
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE_RE = re.compile(r'[ \t\n\r]*')
+# Text after a decoded value which doesn't show whether the value was
+# complete: a number could carry on into the next chunk.
+_UNCERTAIN_TAIL_RE = re.compile(r'[ \t\n\r0-9.eE+-]*')
+
+_decoder = json.JSONDecoder()
+
+
+class _Reader(object):
+    def __init__(self, fileobj, chunk_size):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = u''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """
+        Drops the consumed part of the buffer and reads another chunk onto
+        the end of it. Returns ``False`` if the file was already exhausted.
+
+        """
+        if self.eof:
+            return False
+        data = self.fileobj.read(self.chunk_size)
+        if data:
+            text = self.decoder.decode(data)
+        else:
+            self.eof = True
+            text = self.decoder.decode('', True)
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Skips whitespace and returns the next character, without consuming
+        it.
+
+        """
+        while True:
+            self.pos = _WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of json document")
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError("Expected %r at position %d, found %r" % (
+                             char, self.pos, found))
+        self.pos += 1
+
+    def value(self):
+        """Decodes and returns the next complete json value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except ValueError:
+                if not self.fill():
+                    raise
+                continue
+            if (not self.eof and _UNCERTAIN_TAIL_RE.match(
+                    self.buffer, end).end() == len(self.buffer)):
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_array(reader):
+    if reader.peek() == u']':
+        reader.pos += 1
+        return
+    while True:
+        yield reader.value()
+        char = reader.peek()
+        reader.pos += 1
+        if char == u']':
+            return
+        if char != u',':
+            raise ValueError("Expected ',' or ']' at position %d, found %r" %
+                             (reader.pos - 1, char))
+
+
+def _load_path(reader, path):
+    if not path:
+        reader.expect(u'[')
+        return _iter_array(reader)
+    reader.expect(u'{')
+    obj = {}
+    if reader.peek() == u'}':
+        return obj
+    while True:
+        key = reader.value()
+        reader.expect(u':')
+        if key == path[0]:
+            obj[key] = _load_path(reader, path[1:])
+            return obj
+        obj[key] = reader.value()
+        if reader.peek() == u'}':
+            return obj
+        reader.expect(u',')
+
+
+def load_streaming(fileobj, path=(), chunk_size=CHUNK_SIZE):
+    """
+    Decodes the utf-8 json document in ``fileobj`` up to the array found by
+    following the object keys in ``path`` and returns it, with that array
+    replaced by a generator which decodes its items one at a time. With an
+    empty ``path`` the document itself must be an array, and the generator
+    is returned. Members which come after the array in the document are
+    never read.
+
+    For example, ``load_streaming(f, ('videos', 'video'))`` returns
+    ``{'videos': {'total': ..., 'video': <generator>}}`` for a document like
+    ``{"videos": {"total": 2, "video": [{...}, {...}]}}``.
+
+    :raises ValueError: if the document isn't json of the expected shape.
+                        Errors in the array's items are raised by the
+                        generator once it reaches them.
+
+    """
+    return _load_path(_Reader(fileobj, chunk_size), tuple(path))
@@ -0,0 +1,55 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Memos of recently computed values - parsed timestamps, cleaned descriptions
+and the like - which are kept for the life of the process and so have to be
+kept from growing without bound.
+
+"""
+
+
+class BoundedMemo(dict):
+    """
+    A dict of recently computed values which is emptied when it is full,
+    rather than evicting entries one at a time: looking values up stays as
+    cheap as for a plain dict, and a memo which keeps filling up is holding
+    values which don't repeat anyway.
+
+    """
+    def __init__(self, max_size):
+        dict.__init__(self)
+        self.max_size = max_size
+
+    def remember(self, key, value):
+        """
+        Stores ``value`` for ``key``, emptying the memo first if it is full,
+        and returns ``value``.
+
+        """
+        if len(self) >= self.max_size:
+            self.clear()
+        self[key] = value
+        return value
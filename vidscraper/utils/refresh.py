@@ -0,0 +1,189 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+import datetime
+import heapq
+import itertools
+import Queue
+import threading
+
+
+class FileUrlRefresher(object):
+    """
+    Keeps the signed :attr:`~.Video.file_url` of a set of videos valid by
+    re-running their suite's ``scrape`` method shortly before each video's
+    :attr:`~.Video.file_url_expires`. Videos are kept in a heap ordered by
+    the time at which they are due, so only the videos which are about to
+    expire are ever scraped.
+
+    :param videos: An iterable of :class:`.Video` instances to track.
+    :param lead_time: A :class:`datetime.timedelta` indicating how long before
+                      expiry a video's file url should be refreshed. Default:
+                      ten minutes.
+    :param max_concurrent: The maximum number of scrapes to run at once.
+                           Default: ``4``.
+    :param retry_delay: A :class:`datetime.timedelta` to wait before retrying a
+                        failed refresh. Default: one minute.
+
+    """
+    def __init__(self, videos=(), lead_time=datetime.timedelta(minutes=10),
+                 max_concurrent=4, retry_delay=datetime.timedelta(minutes=1)):
+        self.lead_time = lead_time
+        self.max_concurrent = max_concurrent
+        self.retry_delay = retry_delay
+        #: The videos which are no longer tracked because their suite turned
+        #: out not to be able to refresh them.
+        self.dropped = []
+        self._heap = []
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        for video in videos:
+            self.add(video)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def _push(self, due, video):
+        with self._lock:
+            heapq.heappush(self._heap, (due, next(self._counter), video))
+
+    def add(self, video):
+        """
+        Starts tracking ``video``. Returns ``False`` (and ignores the video)
+        if it has no :attr:`~.Video.file_url_expires` or if its suite can't
+        supply one through a scrape, and ``True`` otherwise.
+
+        """
+        if (video.file_url_expires is None or
+                'file_url_expires' not in video.suite.scrape_fields):
+            return False
+        self._push(video.file_url_expires - self.lead_time, video)
+        return True
+
+    def next_refresh(self):
+        """
+        Returns the (UTC) datetime at which the next refresh is due, or
+        ``None`` if no videos are being tracked.
+
+        """
+        with self._lock:
+            if not self._heap:
+                return None
+            return self._heap[0][0]
+
+    def pop_due(self, now=None):
+        """
+        Removes and returns a list of the videos whose refresh is due at
+        ``now``, which defaults to the current UTC time.
+
+        """
+        if now is None:
+            now = datetime.datetime.utcnow()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                due.append(heapq.heappop(self._heap)[2])
+        return due
+
+    def refresh(self, video):
+        """Re-runs only the ``scrape`` method for the ``video``."""
+        video.suite._run_methods(video, ['scrape'])
+
+    def run_pending(self, now=None):
+        """
+        Refreshes every video which is due, running at most
+        :attr:`max_concurrent` scrapes at once, and puts them back in the
+        heap according to their new expiry. Videos whose refresh failed, or
+        whose refresh didn't push their expiry past the refresh time, are
+        retried after :attr:`retry_delay`. Videos which can't be refreshed at
+        all are added to :attr:`dropped` and no longer tracked. Returns a
+        list of the videos which were refreshed.
+
+        """
+        if now is None:
+            now = datetime.datetime.utcnow()
+        due = self.pop_due(now)
+        if not due:
+            return []
+
+        queue = Queue.Queue()
+        for video in due:
+            queue.put(video)
+        refreshed = []
+
+        def work():
+            while True:
+                try:
+                    video = queue.get_nowait()
+                except Queue.Empty:
+                    return
+                try:
+                    self.refresh(video)
+                except NotImplementedError:
+                    # The suite can't scrape this video after all; stop
+                    # tracking it.
+                    self.dropped.append(video)
+                    continue
+                except Exception:
+                    self._push(now + self.retry_delay, video)
+                    continue
+                expires = video.file_url_expires
+                if expires is None:
+                    self.dropped.append(video)
+                    continue
+                refreshed.append(video)
+                due_at = expires - self.lead_time
+                if due_at <= now:
+                    # The expiry hasn't moved on far enough; don't let the
+                    # video be due again straight away.
+                    due_at = now + self.retry_delay
+                self._push(due_at, video)
+
+        threads = [threading.Thread(target=work)
+                   for i in xrange(min(self.max_concurrent, len(due)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return [video for video in due if video in refreshed]
+
+    def run(self, stop_event=None, max_sleep=60):
+        """
+        Runs pending refreshes until ``stop_event`` (a
+        :class:`threading.Event`) is set, sleeping - for at most
+        ``max_sleep`` seconds at a time - until the next refresh is due.
+
+        """
+        if stop_event is None:
+            stop_event = threading.Event()
+        while not stop_event.is_set():
+            self.run_pending()
+            next_refresh = self.next_refresh()
+            if next_refresh is None:
+                sleep = max_sleep
+            else:
+                delta = next_refresh - datetime.datetime.utcnow()
+                sleep = min(max(delta.total_seconds(), 0), max_sleep)
+            stop_event.wait(sleep)
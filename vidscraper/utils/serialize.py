@@ -0,0 +1,111 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Streaming serialization of :class:`~vidscraper.suites.base.Video`
+instances, for sending them between processes or storing them. Each video is
+encoded as its :meth:`~vidscraper.suites.base.Video.to_dict`, either as a
+line of json (`JSON Lines <http://jsonlines.org/>`_) or, if :mod:`msgpack`
+is installed, as a msgpack map. The readers yield videos one at a time as
+they are decoded.
+
+"""
+
+from vidscraper.compat import json, json_loads
+from vidscraper.suites.base import Video
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+_encode = json.JSONEncoder(separators=(',', ':')).encode
+
+
+def dump_jsonl(videos, fileobj):
+    """
+    Writes each of the ``videos`` to ``fileobj`` as a line of json, and
+    returns the number written.
+
+    """
+    write = fileobj.write
+    count = 0
+    for video in videos:
+        write(_encode(video.to_dict()))
+        write('\n')
+        count += 1
+    return count
+
+
+def iter_jsonl(fileobj, suite=None, api_keys=None, cache=None):
+    """
+    Yields a :class:`~vidscraper.suites.base.Video` for each line of json
+    in ``fileobj``, as written by :func:`dump_jsonl`. Blank lines are
+    skipped. ``suite``, ``api_keys`` and ``cache`` are passed on to
+    :meth:`~vidscraper.suites.base.Video.from_dict`.
+
+    """
+    for line in fileobj:
+        if line.strip():
+            yield Video.from_dict(json_loads(line), suite, api_keys, cache)
+
+
+def _require_msgpack():
+    if msgpack is None:
+        raise ImportError("msgpack must be installed.")
+
+
+def dump_msgpack(videos, fileobj):
+    """
+    Writes each of the ``videos`` to ``fileobj`` as a msgpack map, and
+    returns the number written.
+
+    :raises ImportError: if :mod:`msgpack` isn't installed.
+
+    """
+    _require_msgpack()
+    pack = msgpack.Packer(use_bin_type=True).pack
+    write = fileobj.write
+    count = 0
+    for video in videos:
+        write(pack(video.to_dict()))
+        count += 1
+    return count
+
+
+def iter_msgpack(fileobj, suite=None, api_keys=None, cache=None):
+    """
+    Yields a :class:`~vidscraper.suites.base.Video` for each msgpack map in
+    ``fileobj``, as written by :func:`dump_msgpack`. ``suite``,
+    ``api_keys`` and ``cache`` are passed on to
+    :meth:`~vidscraper.suites.base.Video.from_dict`.
+
+    :raises ImportError: if :mod:`msgpack` isn't installed.
+
+    """
+    _require_msgpack()
+    for data in msgpack.Unpacker(fileobj, raw=False):
+        yield Video.from_dict(data, suite, api_keys, cache)
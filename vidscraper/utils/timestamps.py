@@ -0,0 +1,197 @@
+# Copyright 2009 - Participatory Culture Foundation
+# 
+# This file is part of vidscraper.
+# 
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions
+# are met:
+# 
+# 1. Redistributions of source code must retain the above copyright
+#    notice, this list of conditions and the following disclaimer.
+# 2. Redistributions in binary form must reproduce the above copyright
+#    notice, this list of conditions and the following disclaimer in the
+#    documentation and/or other materials provided with the distribution.
+# 
+# THIS SOFTWARE IS PROVIDED BY THE AUTHOR ``AS IS'' AND ANY EXPRESS OR
+# IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES
+# OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE AUTHOR BE LIABLE FOR ANY DIRECT, INDIRECT,
+# INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT
+# NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE,
+# DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY
+# THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT
+# (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF
+# THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""
+Fast parsing of the fixed-format timestamps which video providers use.
+Timestamps in the common formats are picked apart directly instead of going
+through :func:`datetime.datetime.strptime` or :mod:`feedparser`'s date
+handlers, and recently parsed timestamps are remembered, since the same ones
+turn up again each time a feed is refreshed. Anything which doesn't fit the
+expected format exactly is handed to the slow parser, so the results are
+always the same.
+
+"""
+
+import datetime
+import re
+
+from vidscraper.utils.memo import BoundedMemo
+
+
+_DATETIME_RES = {
+    '%Y-%m-%d %H:%M:%S': re.compile(
+        r'(\d{4})-(\d\d)-(\d\d) (\d\d):(\d\d):(\d\d)\Z'),
+    '%Y-%m-%dT%H:%M:%SZ': re.compile(
+        r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)Z\Z'),
+}
+_ISOFORMAT_RE = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)'
+                           r'(?:\.(\d{6}))?\Z')
+_W3DTF_RE = re.compile(r'(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.\d+)?'
+                       r'(?:Z|([+-])(\d\d):(\d\d))\Z')
+_RFC822_RE = re.compile(r'(?:(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun), )?'
+                        r'(\d\d) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|'
+                        r'Nov|Dec) (\d{4}) (\d\d):(\d\d):(\d\d) '
+                        r'(?:GMT|([+-])(\d\d)(\d\d))\Z')
+_MONTHS = dict((name, number) for number, name in enumerate(
+    ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct',
+     'Nov', 'Dec'], 1))
+
+# int() is the slowest part of picking a timestamp apart, so the two-digit
+# fields and likely years are looked up instead.
+_NUMBERS = dict(('%02d' % number, number) for number in xrange(100))
+_NUMBERS.update((str(year), year) for year in xrange(1900, 2100))
+
+# Memos of recently parsed timestamps, by format (or parser), each keyed by
+# the text.
+_parsed = {}
+_PARSED_MAX = 4096
+
+
+def _year(text):
+    try:
+        return _NUMBERS[text]
+    except KeyError:
+        return int(text)
+
+
+def _remember(kind, text, value):
+    try:
+        parsed = _parsed[kind]
+    except KeyError:
+        parsed = _parsed[kind] = BoundedMemo(_PARSED_MAX)
+    return parsed.remember(text, value)
+
+
+def parse_datetime(text, format):
+    """
+    Returns ``datetime.datetime.strptime(text, format)``. Timestamps in the
+    ``'%Y-%m-%d %H:%M:%S'`` and ``'%Y-%m-%dT%H:%M:%SZ'`` formats are parsed
+    without :func:`strptime`.
+
+    """
+    try:
+        return _parsed[format][text]
+    except KeyError:
+        pass
+    regex = _DATETIME_RES.get(format)
+    match = regex.match(text) if regex is not None else None
+    if match is not None:
+        year, month, day, hour, minute, second = match.groups()
+        try:
+            value = datetime.datetime(_year(year), _NUMBERS[month],
+                                      _NUMBERS[day], _NUMBERS[hour],
+                                      _NUMBERS[minute], _NUMBERS[second])
+        except ValueError:
+            # Let strptime produce the error.
+            value = None
+        if value is not None:
+            return _remember(format, text, value)
+    return _remember(format, text, datetime.datetime.strptime(text, format))
+
+
+def parse_isoformat(text):
+    """
+    Parses the output of :meth:`datetime.datetime.isoformat` for a naive
+    datetime, like ``2011-10-19T16:48:31``, back into a datetime.
+
+    :raises ValueError: if ``text`` isn't in that format.
+
+    """
+    try:
+        return _parsed['isoformat'][text]
+    except KeyError:
+        pass
+    match = _ISOFORMAT_RE.match(text)
+    if match is None:
+        raise ValueError('Not an ISO 8601 datetime: %r' % (text,))
+    (year, month, day, hour, minute, second,
+     microsecond) = match.groups()
+    return _remember('isoformat', text, datetime.datetime(
+        _year(year), _NUMBERS[month], _NUMBERS[day], _NUMBERS[hour],
+        _NUMBERS[minute], _NUMBERS[second],
+        int(microsecond) if microsecond is not None else 0))
+
+
+def _utc_struct_time(year, month, day, hour, minute, second, sign, tzhour,
+                     tzmin):
+    # As feedparser does it: apply the offset, then build the UTC 9-tuple.
+    # feedparser's other handlers can claim timestamps with odd years, so
+    # those are left to it.
+    if year < 1900:
+        return None
+    try:
+        stamp = datetime.datetime(year, month, day, hour, minute, second)
+        if sign is not None:
+            delta = datetime.timedelta(hours=_NUMBERS[tzhour],
+                                       minutes=_NUMBERS[tzmin])
+            if sign == '-':
+                stamp += delta
+            else:
+                stamp -= delta
+        return stamp.utctimetuple()
+    except (OverflowError, ValueError):
+        return None
+
+
+def parse_w3dtf(text):
+    """
+    Parses a complete W3C-DTF timestamp like ``2011-10-19T16:50:10.000Z``
+    into a UTC :class:`time.struct_time`, as :mod:`feedparser` would, or
+    returns ``None`` if ``text`` isn't one.
+
+    """
+    try:
+        return _parsed['w3dtf'][text]
+    except KeyError:
+        pass
+    match = _W3DTF_RE.match(text)
+    if match is None:
+        return None
+    (year, month, day, hour, minute, second, sign, tzhour,
+     tzmin) = match.groups()
+    return _remember('w3dtf', text, _utc_struct_time(
+        _year(year), _NUMBERS[month], _NUMBERS[day], _NUMBERS[hour],
+        _NUMBERS[minute], _NUMBERS[second], sign, tzhour, tzmin))
+
+
+def parse_rfc822(text):
+    """
+    Parses an RFC 822 timestamp like ``Wed, 19 Oct 2011 16:48:31 +0000``
+    into a UTC :class:`time.struct_time`, as :mod:`feedparser` would, or
+    returns ``None`` if ``text`` isn't one.
+
+    """
+    try:
+        return _parsed['rfc822'][text]
+    except KeyError:
+        pass
+    match = _RFC822_RE.match(text)
+    if match is None:
+        return None
+    (day, month, year, hour, minute, second, sign, tzhour,
+     tzmin) = match.groups()
+    return _remember('rfc822', text, _utc_struct_time(
+        _year(year), _MONTHS[month], _NUMBERS[day], _NUMBERS[hour],
+        _NUMBERS[minute], _NUMBERS[second], sign, tzhour, tzmin))